@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+#
+
+"""Regenerate swajime/_color_data.py from dat/color_data.json
+
+The package imports the generated module instead of parsing JSON, so run this
+whenever color_data.json changes:
+    python dat/build_color_data.py
+"""
+
+from __future__ import print_function
+
+import json
+import os
+
+here = os.path.dirname(os.path.abspath(__file__))
+json_path = os.path.join(here, 'color_data.json')
+module_path = os.path.join(here, os.pardir, 'swajime', '_color_data.py')
+
+HEADER = '''"""Bundled 256 color table
+
+Generated from dat/color_data.json by dat/build_color_data.py.  Do not edit.
+
+Each entry is (colorId, name, hexString, (r, g, b), (h, s, l)).
+"""
+
+COLOR_DATA = (
+'''
+
+
+def main():
+    with open(json_path, 'r') as color_file:
+        color_data = json.load(color_file)
+
+    with open(module_path, 'w') as module_file:
+        module_file.write(HEADER)
+        for color in color_data:
+            module_file.write('    ({!r}, {!r}, {!r}, ({}, {}, {}), '
+                              '({}, {}, {})),\n'.format(
+                                  color['colorId'], str(color['name']),
+                                  str(color['hexString']),
+                                  color['rgb']['r'], color['rgb']['g'],
+                                  color['rgb']['b'], color['hsl']['h'],
+                                  color['hsl']['s'], color['hsl']['l']))
+        module_file.write(')\n')
+    print('Wrote {} colors to {}'.format(len(color_data),
+                                         os.path.normpath(module_path)))
+
+
+if __name__ == '__main__':
+    main()
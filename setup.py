@@ -15,6 +15,9 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/swajime/ansi",
     packages=setuptools.find_packages(),
+    entry_points={
+        "console_scripts": ["swajime=swajime.cli:main"],
+    },
     classifiers=[
         "Programming Language :: Python",
         "License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)",
@@ -47,35 +47,67 @@ Or you can create different objects with different attributes:
     print(yellowWarning.wrap('This is a yellow warning'))
     print(redError.wrap('This is a red error'))
 
+The 256 color table is bundled with the package.  To use a newer copy,
+download it once with SwaANSI.refreshColors() (this requires requests).  It is
+saved as $HOME/dat/color_data.json and preferred from then on.
+
+Colors can also be given as '#rrggbb', '#rgb' or (r, g, b).  They are exact
+on truecolor terminals and mapped to the nearest of the 256 (or 16) colors
+elsewhere, see setStream and setColorDepth:
+    from swajime import SwaANSI
+    print(SwaANSI.wrap('Heat', '#ff8000', (32, 0, 64)))
+
+Class level defaults are shared by every thread.  Immutable Style objects can
+be shared without locking, and style.using overrides the class level defaults
+for the current thread or asyncio task only:
+    from swajime import SwaANSI, Style
+    from swajime.style import using
+    error = Style('Red', None, 'Bold')
+    print(SwaANSI.wrap('This is a red error', error))
+    with using(error):
+        print(SwaANSI.wrap('So is this'))
+
 Please report any bugs or issues to john@swajime.com
 """
 
 # from __future__ imports must occur at the beginning of the file
 from __future__ import print_function
 
-from platform import system
+from collections import OrderedDict
 
-import json
+import marshal
 import os
-import requests
 import six
 import sys
+import warnings
+
+from . import terminal
+from .colorindex import ColorIndex
+from .quantize import Quantizer, parseHex
+from .style import Style, _current
 
 VERSION = "0.1.1"  # 07/22/2020
 # color_file_dir is a subdirectory in $HOME
 color_file_dir = 'dat'
 color_file_name = 'color_data.json'
+# the lookup tables built from color_file_name, saved next to it
+color_cache_name = 'color_data.cache'
+color_url = 'https://jonasjacek.github.io/colors/data.json'
 
 # My version of windows insists on putting a '<-' character on the screen
 # instead of processing the escape characters
 # Still have not found a fix.  This fix isn't working.
-if 'win' in system().lower():
+if sys.platform.startswith('win'):
     from ctypes import windll
     k = windll.kernel32
     k.SetConsoleMode(k.GetStdHandle(-11), 7)
     # os.system("") # This fix doesn't work either
 
 
+class InvalidNameWarning(UserWarning):
+    """Warns about a color or style name that is not available."""
+
+
 class _classOrInstancemethod(classmethod):
     """Private decorator allowing methods to be class methods or instance
     methods."""
@@ -86,69 +118,213 @@ class _classOrInstancemethod(classmethod):
         return descr_get(instance, type_)
 
 
+def _home_color_path():
+    """Returns the path of $HOME/dat/color_data.json, or None if neither HOME
+    nor HOMEDRIVE and HOMEPATH are set."""
+
+    if 'HOME' in os.environ:
+        home = os.getenv('HOME')
+    elif 'HOMEDRIVE' in os.environ and 'HOMEPATH' in os.environ:
+        home = os.getenv('HOMEDRIVE') + os.getenv('HOMEPATH')
+    else:
+        return None
+    return os.path.join(home, color_file_dir, color_file_name)
+
+
+def _json_to_color_data(color_data):
+    """Converts the downloaded JSON list into the bundled tuple layout."""
+
+    return tuple((color['colorId'], color['name'], color['hexString'],
+                  (color['rgb']['r'], color['rgb']['g'], color['rgb']['b']),
+                  (color['hsl']['h'], color['hsl']['s'], color['hsl']['l']))
+                 for color in color_data)
+
+
+def _build_color_tables(color_data):
+    """Returns the lookup tables of a color table: (color_data, name and
+    lowercase name -> colorId, names, colorId -> names, colorId -> rgb).
+
+    A name given to several colors, exactly or ignoring case, means the first
+    of them.
+    """
+
+    color_table = {}
+    color_names = []
+    id_names = {}
+    id_rgbs = {}
+    for color_id, name, _, rgb, _ in color_data:
+        id_rgbs[color_id] = tuple(rgb)
+        if name in color_table:
+            continue
+        color_table[name] = color_id
+        color_names.append(name)
+        id_names[color_id] = id_names.get(color_id, ()) + (name,)
+
+    # enable case insensitive lookups
+    for name in color_names:
+        color_table.setdefault(name.lower(), color_table[name])
+    return tuple(color_data), color_table, tuple(color_names), id_names, \
+        id_rgbs
+
+
+def _load_color_tables():
+    """Returns the lookup tables of _build_color_tables for the color table.
+
+    A color_data.json saved in $HOME/dat by SwaANSI.refreshColors takes
+    precedence over the table bundled with the package.
+    """
+
+    color_path = _home_color_path()
+    if color_path is not None and os.path.exists(color_path):
+        return _cached_color_tables(color_path)
+
+    from ._color_data import COLOR_DATA
+    return _build_color_tables(COLOR_DATA)
+
+
+def _cached_color_tables(color_path):
+    """Returns the lookup tables for the JSON file `color_path`, from the
+    cache file next to it when it was built from the same JSON.
+
+    The cache is trusted when the modification time and size of the JSON
+    match, and otherwise when its SHA-1 does.  A missing, stale or unreadable
+    cache is rebuilt.
+    """
+
+    cache_path = os.path.join(os.path.dirname(color_path), color_cache_name)
+    stat = os.stat(color_path)
+    # the layout of the cache, then the JSON it was built from
+    header = (1, marshal.version,
+              getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size)
+    cached = None
+    try:
+        # loads on the whole file is much faster than load on the file
+        with open(cache_path, 'rb') as cache_file:
+            cached_header, cached_digest, tables = marshal.loads(
+                cache_file.read())
+        cached = cached_header[:2] == header[:2]
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        pass
+    if cached and cached_header == header:
+        return tables
+
+    import hashlib
+    with open(color_path, 'rb') as color_file:
+        source = color_file.read()
+    digest = hashlib.sha1(source).hexdigest()
+    if not cached or cached_digest != digest:
+        import json
+        tables = _build_color_tables(
+            _json_to_color_data(json.loads(source.decode('utf-8'))))
+    _write_color_cache(cache_path, (header, digest, tables))
+    return tables
+
+
+def _write_color_cache(cache_path, content):
+    """Replaces the cache file atomically, leaving it as it is if the
+    directory is not writable."""
+
+    temporary = '{}.{}'.format(cache_path, os.getpid())
+    try:
+        with open(temporary, 'wb') as cache_file:
+            cache_file.write(marshal.dumps(content))
+        if hasattr(os, 'replace'):
+            os.replace(temporary, cache_path)
+        else:  # pragma: no cover
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            os.rename(temporary, cache_path)
+    except (IOError, OSError):
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def _spec_arguments(spec):
+    """Returns the (foreground, background, style_list) arguments of wrap that
+    match a spec other than a SwaANSI instance."""
+
+    if spec is None:
+        return None, None, ()
+    if isinstance(spec, Style):
+        return spec.foreground, spec.background, spec.styles
+    if isinstance(spec, six.string_types) or _rgb(spec) is not None:
+        return spec, None, ()
+    spec = tuple(spec)
+    return (spec[0] if spec else None, spec[1] if len(spec) > 1 else None,
+            spec[2:])
+
+
+def _override(style, background, style_list):
+    """Returns `style` with the background and style list given with it to
+    wrap, which override its own."""
+
+    if background is None and len(style_list) == 0:
+        return style
+    return Style(style.foreground,
+                 style.background if background is None else background,
+                 *(style_list if len(style_list) else style.styles))
+
+
+def _nameKey(name):
+    """Returns a color or style name in the case used by cache keys, and
+    other values unchanged."""
+
+    return name.lower() if isinstance(name, six.string_types) else name
+
+
+def _rgb(color):
+    """Returns the (r, g, b) tuple of '#rrggbb', '#rgb' or a sequence of
+    three integers from 0 to 255, or None for anything else."""
+
+    if isinstance(color, six.string_types):
+        return parseHex(color)
+    try:
+        r, g, b = color
+    except (TypeError, ValueError):
+        return None
+    if all(isinstance(value, six.integer_types) and 0 <= value <= 255
+           for value in (r, g, b)):
+        return r, g, b
+    return None
+
+
+# escape prefix -> the same prefix as bytes
+_prefix_bytes = {}
+
+
+def _asciiBytes(prefix):
+    """Returns an escape prefix encoded as bytes, encoding each one once."""
+
+    try:
+        return _prefix_bytes[prefix]
+    except KeyError:
+        if len(_prefix_bytes) >= 4096:
+            _prefix_bytes.clear()
+        encoded = _prefix_bytes[prefix] = prefix.encode('ascii')
+        return encoded
+
+
+def _bytes(data):
+    """Returns bytes-like `data` as bytes.  Python 2 only joins str, and
+        str() of a memoryview there is its repr, not its contents."""
+
+    if isinstance(data, memoryview):
+        return data.tobytes()
+    return bytes(data)
+
+
 class MetaANSI(type):
     """Meta class used to initialize SwaANSI class before instantiating any
     objects.
 
     The SwaANSI class does not require object instantiation.
+
+    The color table is not loaded until SwaANSI.colors or SwaANSI._colors is
+    first accessed, so importing the module stays cheap.
     """
 
     def __init__(cls, name, bases, d):
-        """Sets up SwaANSI.colors and SwaANSI.styles tuples."""
-
-        if 'HOME' not in os.environ:
-            if 'HOMEDRIVE' not in os.environ or 'HOMEPATH' not in os.environ:
-                raise EnvironmentError(
-                    'The color library requires HOME or HOMEDRIVE and ' +
-                    'HOMEPATH to be set in your environment.  JSON for ' +
-                    'available colors will be stored in {}.'.format(
-                       os.path.join('$HOME', color_file_dir, color_file_name)))
-            HOME = os.getenv('HOMEDRIVE') + os.getenv('HOMEPATH')
-        else:
-            HOME = os.getenv('HOME')
-
-        color_dir = os.path.join(HOME, color_file_dir)
-        color_path = os.path.join(color_dir, color_file_name)
-
-        if os.path.exists(color_path):
-            with open(color_path, 'r') as color_file:
-                color_data = json.load(color_file)
-        else:
-            print('Retrieving color data.  This is only necessary for the ' +
-                  'first run.')
-            print('WARNING: There seem to be duplicate color names in the ' +
-                  'list, and there are clashes between web and X11 colors ' +
-                  'in the CSS color scheme. Beware.')
-            print('Please see https://jonasjacek.github.io/colors/ for more ' +
-                  'information.')
-            url = 'https://jonasjacek.github.io/colors/data.json'
-
-            try:
-                json_color_data = requests.get(url).text
-                color_data = json.loads(json_color_data)
-            except Exception as e:
-                print()
-                print(str(e))
-                print()
-                print(('Could not download data.json.  Please download {} ' +
-                       'to the {} directory as {}.').format(
-                            url, color_dir, color_file_name))
-                return
-
-            if not os.path.isdir(color_dir):
-                os.mkdir(color_dir)
-            with open(color_path, 'w') as color_file:
-                json.dump(color_data, color_file, indent=4)
-
-        for color in color_data:
-            cls._colors[color['name']] = color['colorId']
-
-        # Make colors available as class tuple
-        cls.colors = tuple(cls._colors.keys())
-
-        # enable case insensitive lookups
-        for color in cls.colors:
-            cls._colors[color.lower()] = cls._colors[color]
+        """Sets up the SwaANSI.styles tuple."""
 
         proper_style = []
         for style in cls._styles.keys():
@@ -161,6 +337,43 @@ class MetaANSI(type):
         for style in cls._styles:
             cls._styles[style.lower()] = cls._styles[style]
 
+        # prefixes built from a previous color table are no longer valid
+        cls._invalidateCache()
+        cls._compile()
+
+    @property
+    def colors(cls):
+        """Tuple of the available color names."""
+
+        if cls._color_table is None:
+            cls._loadColors()
+        return cls._color_names
+
+    @property
+    def _colors(cls):
+        """Dict of color name, and lowercase color name, to colorId."""
+
+        if cls._color_table is None:
+            cls._loadColors()
+        return cls._color_table
+
+    def _loadColors(cls, color_data=None):
+        """Builds the color lookup tables from `color_data`, or loads them
+        with _load_color_tables() if it is not given."""
+
+        if color_data is None:
+            tables = _load_color_tables()
+        else:
+            tables = _build_color_tables(color_data)
+
+        cls._color_data, cls._color_table, cls._color_names, \
+            cls._color_id_names, cls._color_rgbs = tables
+        cls._quantizer = None
+        cls._color_index = None
+
+        # prefixes built from a previous color table are no longer valid
+        cls._invalidateCache()
+
 
 class SwaANSI(six.with_metaclass(MetaANSI, object)):
     """Allows adding color and other attributes to text strings.
@@ -176,6 +389,10 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
     -------
     setWHEN('always'|'auto'|'never')
         Enable or disable the wrap of colors and attributes
+    setStream(stream=None)
+        Set the stream whose capabilities decide WHEN 'auto'
+    setColorDepth(depth=None)
+        Set the color depth used for RGB colors
     setForeground(color=None)
         Set the foreground for class or instance for future wrap
     setBackground(color=None)
@@ -184,16 +401,76 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
         Set the styles for class or instance for future wrap
     setDefaults(foreground=None, background=None, *style_list)
         Set all colors and attributes for class or instance for future wrap
+    refreshColors(url=color_url)
+        Download the color table to $HOME/dat/color_data.json and reload it
+    setErrorPolicy('warn'|'raise'|'ignore')
+        Choose how color and style names that are not available are reported
+    invalidLookups()
+        Return how many times each unavailable name was looked up
+    setCacheSize(size)
+        Set the maximum number of escape prefixes kept by the prefix cache
+    quantizer()
+        Return the lookup tables mapping RGB values to color indexes
+    colorIndex()
+        Return the indexes of the color table by id, hex, RGB and HSL
+    cacheInfo()
+        Return hit, miss, and eviction counts of the prefix cache
+    clearCache()
+        Empty the prefix cache and reset its counters
     wrap(text=None, foreground=None, background=None, *style_list)
         Wrap the text with escape codes for the given (or previously set)
             attributes
+    wrapBytes(data, foreground=None, background=None, *style_list)
+        Wrap bytes with escape codes, returning bytes
+    wrapMany(texts, foreground=None, background=None, *style_list)
+        Wrap every text in a batch with the same attributes
+    wrapEach(texts, specs)
+        Wrap each text in a batch with its own attributes
+    wrapColumns(rows, specs)
+        Wrap the cells of table rows with per column attributes
+    template(field='{}')
+        Return a str.format template wrapping field with the default
+            attributes
     """
 
     _when = 'always'
-    _colors = {}
+    # stream whose capabilities decide 'auto', None for sys.stdout
+    _stream = None
+    # color lookup tables, built on first use by MetaANSI._loadColors
+    _color_table = None
+    _color_names = ()
+    _color_data = ()
+    _color_id_names = {}
+    _color_rgbs = {}
+    # RGB to color index lookup tables, built on first use by quantizer()
+    _quantizer = None
+    # id, hex, RGB and HSL indexes, built on first use by colorIndex()
+    _color_index = None
+    # color depth used for RGB colors, None to detect it from the stream
+    _depth = None
+    # instances see the lazily loaded tables of their class
+    colors = property(lambda self: type(self).colors)
+    _colors = property(lambda self: type(self)._colors)
     _default_foreground = None
     _default_background = None
     _default_styles = []
+    # escape sequences compiled from the defaults by the set methods
+    _compiled_prefix = ''
+    _compiled_suffix = ''
+    _compiled_prefix_bytes = b''
+    # the defaults as a hashable key of the arguments of wrap
+    _defaults_key = (None, None, ())
+    # LRU cache of escape prefixes keyed on (foreground, background, styles)
+    _cache_size = 256
+    _prefix_cache = OrderedDict()
+    # (foreground, background, style_list, defaults) as given to wrap -> key
+    # of _prefix_cache, for prefixes that do not depend on the color depth
+    _cache_keys = {}
+    _cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+    # how unavailable names are reported, see setErrorPolicy
+    _error_policy = 'warn'
+    _invalid_counts = {}
+    _warned = set()
     _styles = {'default': '0',
                'reset': '0',
                'normal': '0',
@@ -243,7 +520,7 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
 
     # always: enables color
     # never: disables color
-    # auto: enables color only if output is a tty or console
+    # auto: enables color only if the stream supports it
     @classmethod
     def setWHEN(cls, when):
         """Enables or disables SwaANSI.
@@ -254,7 +531,9 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
             Preset to 'always'.
             'always': Always add color and attributes.
             'never': Never add color and attributes.
-            'auto': Add color and attributes if output is a tty.
+            'auto': Add color and attributes if the stream set by setStream,
+                sys.stdout by default, supports color.  See
+                swajime.terminal.probe.
         """
 
         if when.lower() in ('never', 'always', 'auto'):
@@ -263,6 +542,370 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
             print("Invalid WHEN.  Valid values are 'never', 'always', or " +
                   "'auto'.", file=sys.stderr)
             cls._when = 'never'
+        cls._invalidateCache()
+
+    @_classOrInstancemethod
+    def setStream(self_or_cls, stream=None):  # NOSONAR
+        """Sets the stream whose capabilities decide WHEN 'auto' for a class
+            or an instance.
+
+        The capabilities of each stream are detected once and cached, see
+            swajime.terminal.probe and swajime.terminal.invalidate.
+
+        Parameters
+        ----------
+        stream : file, optional
+            The stream wrapped text will be written to.  If not passed in,
+            sys.stdout at the time of the wrap is used.
+        """
+
+        self_or_cls._stream = stream
+        self_or_cls._compile()
+
+    @_classOrInstancemethod
+    def setColorDepth(self_or_cls, depth=None):  # NOSONAR
+        """Sets the color depth used for RGB colors for a class or an
+            instance.
+
+        Parameters
+        ----------
+        depth : int, optional
+            16, 256 or swajime.terminal.TRUECOLOR.  If not passed in, the depth
+            of the stream set by setStream is detected.  RGB colors are mapped
+            to the nearest indexed color below TRUECOLOR.
+        """
+
+        self_or_cls._depth = depth
+        self_or_cls._compile()
+
+    @classmethod
+    def refreshColors(cls, url=color_url):
+        """Downloads the color table and saves it in $HOME/dat.
+
+        The saved color_data.json takes precedence over the table bundled with
+            the package.  This is the only method that requires `requests`.
+
+        Parameters
+        ----------
+        url : str, optional
+            Where to download the JSON color data from.
+        """
+
+        import json
+        import requests
+
+        color_path = _home_color_path()
+        if color_path is None:
+            raise EnvironmentError(
+                'Refreshing colors requires HOME or HOMEDRIVE and HOMEPATH ' +
+                'to be set in your environment.  JSON for available colors ' +
+                'will be stored in {}.'.format(
+                    os.path.join('$HOME', color_file_dir, color_file_name)))
+
+        print('WARNING: There seem to be duplicate color names in the ' +
+              'list, and there are clashes between web and X11 colors ' +
+              'in the CSS color scheme. Beware.')
+        print('Please see https://jonasjacek.github.io/colors/ for more ' +
+              'information.')
+
+        color_data = json.loads(requests.get(url).text)
+
+        color_dir = os.path.dirname(color_path)
+        if not os.path.isdir(color_dir):
+            os.mkdir(color_dir)
+        with open(color_path, 'w') as color_file:
+            json.dump(color_data, color_file, indent=4)
+
+        # rebuilds the cache of the lookup tables as well
+        cls._loadColors()
+        cls._compile()
+
+    @classmethod
+    def setErrorPolicy(cls, policy):
+        """Chooses how color and style names that are not available are
+            reported.
+
+        Names are checked when attributes are first resolved: by the set
+            methods, when a Style is built, and when wrap first sees a
+            combination of overrides.  The resolved prefix is cached either
+            way, so a bad name costs nothing more on later wraps.
+
+        Parameters
+        ----------
+        policy : str, mandatory
+            Preset to 'warn'.
+            'warn': Issue an InvalidNameWarning once per distinct name.
+            'raise': Raise ValueError.
+            'ignore': Leave the name out silently.
+        """
+
+        if policy.lower() not in ('warn', 'raise', 'ignore'):
+            raise ValueError("Invalid error policy.  Valid values are " +
+                             "'warn', 'raise', or 'ignore'.")
+        cls._error_policy = policy.lower()
+        cls._warned.clear()
+        cls._invalidateCache()
+
+    @classmethod
+    def invalidLookups(cls):
+        """Returns a dict of how many times each name that is not available
+            was looked up, including by cached wraps.  clearCache resets it.
+        """
+
+        return dict(cls._invalid_counts)
+
+    @classmethod
+    def _reportInvalid(cls, kind, name):
+        """Counts a lookup of an unavailable name and reports it as set by
+            setErrorPolicy."""
+
+        try:
+            hash(name)
+        except TypeError:
+            name = repr(name)
+        counts = cls._invalid_counts
+        counts[name] = counts.get(name, 0) + 1
+        if cls._error_policy == 'ignore':
+            return
+        message = '{} {} is not available.'.format(kind, name)
+        if cls._error_policy == 'raise':
+            raise ValueError(message)
+        if name not in cls._warned:
+            cls._warned.add(name)
+            # point the warning at the first caller outside the package
+            package = os.path.dirname(os.path.abspath(__file__))
+            frame = sys._getframe(1)
+            level = 2
+            while frame.f_back is not None and os.path.dirname(
+                    os.path.abspath(frame.f_code.co_filename)) == package:
+                frame = frame.f_back
+                level += 1
+            warnings.warn(message, InvalidNameWarning, stacklevel=level)
+
+    @classmethod
+    def setCacheSize(cls, size):
+        """Sets the maximum number of escape prefixes kept by the cache.
+
+        Least recently used prefixes are evicted first.  A size of 0 disables
+            caching.
+
+        Parameters
+        ----------
+        size : int, mandatory
+            Maximum number of (foreground, background, styles) combinations
+            to remember.
+        """
+
+        cls._cache_size = max(0, int(size))
+        cache = cls._prefix_cache
+        while len(cache) > cls._cache_size:
+            cache.popitem(last=False)
+            cls._cache_stats['evictions'] += 1
+
+    @classmethod
+    def cacheInfo(cls):
+        """Returns a dict with the prefix cache statistics.
+
+        Keys are 'hits', 'misses', 'evictions', 'size' and 'maxsize'.
+        """
+
+        info = dict(cls._cache_stats)
+        info['size'] = len(cls._prefix_cache)
+        info['maxsize'] = cls._cache_size
+        return info
+
+    @classmethod
+    def clearCache(cls):
+        """Empties the prefix cache and resets its statistics and the counts
+            of invalidLookups."""
+
+        cls._invalidateCache()
+        for key in cls._cache_stats:
+            cls._cache_stats[key] = 0
+        cls._invalid_counts.clear()
+
+    @classmethod
+    def _invalidateCache(cls):
+        """Drops every cached prefix but keeps the statistics."""
+
+        cls._prefix_cache.clear()
+        cls._cache_keys.clear()
+
+    @classmethod
+    def _countInvalid(cls, names):
+        """Counts lookups of unavailable names served from the cache."""
+
+        counts = cls._invalid_counts
+        for name in names:
+            counts[name] = counts.get(name, 0) + 1
+
+    @classmethod
+    def _getPrefix(cls, foreground, background, style_list, depth,
+                   arguments=None):
+        """Returns the escape prefix for the given attributes, from the cache
+            when possible, and remembers the cache key of the `arguments` of
+            wrap they were resolved from."""
+
+        # names are looked up in any case, so 'Red' and 'RED' share an entry
+        key = (depth, _nameKey(foreground), _nameKey(background),
+               tuple([_nameKey(style) for style in style_list]))
+        cache = cls._prefix_cache
+        stats = cls._cache_stats
+        try:
+            entry = cache.pop(key)
+        except KeyError:
+            stats['misses'] += 1
+            entry = cls._buildPrefix(foreground, background, style_list,
+                                     depth)
+            # invalid names are cached with the prefix, so they are reported
+            # once and only counted afterwards
+            if cls._cache_size <= 0:
+                return entry[0]
+            cache[key] = entry
+            while len(cache) > cls._cache_size:
+                cache.popitem(last=False)
+                stats['evictions'] += 1
+        except TypeError:
+            # colors given as lists cannot be cached
+            return cls._buildPrefix(foreground, background, style_list,
+                                    depth)[0]
+        else:
+            # re-insert to mark the entry as most recently used
+            cache[key] = entry
+            stats['hits'] += 1
+            if entry[1]:
+                cls._countInvalid(entry[1])
+
+        if arguments is not None:
+            keys = cls._cache_keys
+            if len(keys) >= 4 * cls._cache_size:
+                keys.clear()
+            keys[arguments] = key
+        return entry[0]
+
+    @classmethod
+    def _buildPrefix(cls, foreground, background, style_list,
+                     depth=terminal.COLORS_256):
+        """Returns a tuple of the escape prefix for the given attributes and
+            the tuple of the names that were not available."""
+
+        fg_string, bg_string, style_codes, invalid = cls._buildAttributes(
+            foreground, background, style_list, depth)
+        styles_string = ';'.join(style_codes)
+
+        if fg_string or bg_string or styles_string:
+            return '\033[{}m'.format(
+                ';'.join(filter(len, [fg_string, bg_string, styles_string]))), \
+                invalid
+        return '', invalid
+
+    @classmethod
+    def _buildAttributes(cls, foreground, background, style_list,
+                         depth=terminal.COLORS_256):
+        """Returns a tuple of the foreground and background SGR parameters,
+            the tuple of style codes, and the tuple of the names that were not
+            available.
+        """
+
+        invalid = []
+        if foreground:
+            fg_string = cls._colorParameter(foreground, 38, depth)
+            if fg_string is None:
+                cls._reportInvalid('Foreground color', foreground)
+                invalid.append(foreground)
+                fg_string = ''
+        else:
+            fg_string = ''
+
+        if background:
+            bg_string = cls._colorParameter(background, 48, depth)
+            if bg_string is None:
+                cls._reportInvalid('Background color', background)
+                invalid.append(background)
+                bg_string = ''
+        else:
+            bg_string = ''
+
+        style_codes = []
+        for style in style_list:
+            if style is None:
+                pass  # NOSONAR
+            elif style.lower() not in cls._styles:
+                cls._reportInvalid('Style', style)
+                invalid.append(style)
+            else:
+                style_codes.append(cls._styles[style.lower()])
+
+        return fg_string, bg_string, tuple(style_codes), tuple(invalid)
+
+    @classmethod
+    def _colorParameter(cls, color, base, depth):
+        """Returns the SGR parameter selecting `color`, or None if `color` is
+            not available.
+
+        Named colors always use the 256 color table.  RGB colors are exact on
+            truecolor terminals and mapped to the nearest color of the table
+            otherwise.
+
+        Parameters
+        ----------
+        color : str or (int, int, int), mandatory
+            A color name, '#rrggbb', '#rgb' or (r, g, b)
+        base : int, mandatory
+            38 for foreground or 48 for background
+        depth : int, mandatory
+            The color depth of the terminal, see swajime.terminal
+        """
+
+        if isinstance(color, six.string_types) and not color.startswith('#'):
+            color_id = cls._colors.get(color.lower())
+            if color_id is None:
+                return None
+            return '{};5;{}'.format(base, color_id)
+
+        rgb = _rgb(color)
+        if rgb is None:
+            return None
+        if depth >= terminal.TRUECOLOR:
+            return '{};2;{};{};{}'.format(base, *rgb)
+        if depth <= terminal.COLORS_16:
+            color_id = cls.quantizer().nearest16(*rgb)
+            # 30-37 and 90-97 for foreground, 40-47 and 100-107 background
+            return str(base - 8 + color_id if color_id < 8
+                       else base + 44 + color_id)
+        return '{};5;{}'.format(base, cls.quantizer().nearest256(*rgb))
+
+    @classmethod
+    def _validColor(cls, color):
+        """Returns whether `color` is a color name, '#rrggbb', '#rgb' or
+            (r, g, b)."""
+
+        if isinstance(color, six.string_types) and not color.startswith('#'):
+            return color.lower() in cls._colors
+        return _rgb(color) is not None
+
+    @classmethod
+    def quantizer(cls):
+        """Returns the swajime.quantize.Quantizer of the color table, which
+            maps RGB values to the nearest color index."""
+
+        if cls._quantizer is None:
+            if cls._color_table is None:
+                cls._loadColors()
+            cls._quantizer = Quantizer(cls._color_data)
+        return cls._quantizer
+
+    @classmethod
+    def colorIndex(cls):
+        """Returns the swajime.colorindex.ColorIndex of the color table, which
+            finds colors by id, hex string, nearest RGB and HSL ranges."""
+
+        if cls._color_index is None:
+            if cls._color_table is None:
+                cls._loadColors()
+            cls._color_index = ColorIndex(cls._color_data,
+                                          cls._color_id_names)
+        return cls._color_index
 
     @_classOrInstancemethod
     def setForeground(self_or_cls, color=None):  # NOSONAR
@@ -280,12 +923,13 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
         if color is None:
             self_or_cls._default_foreground = None
         else:
-            if color.lower() not in self_or_cls._colors:
-                print('Foreground color {} is not available.'.format(color),
-                      file=sys.stderr)
+            if not self_or_cls._validColor(color):
+                self_or_cls._reportInvalid('Foreground color', color)
             else:
                 self_or_cls._default_foreground = color
 
+        self_or_cls._compile()
+
     @_classOrInstancemethod
     def setBackground(self_or_cls, color=None):  # NOSONAR
         """Sets the background color to be used for a class or an instance.
@@ -302,12 +946,13 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
         if color is None:
             self_or_cls._default_background = None
         else:
-            if color.lower() not in self_or_cls._colors:
-                print('Background color {} is not available.'.format(color),
-                      file=sys.stderr)
+            if not self_or_cls._validColor(color):
+                self_or_cls._reportInvalid('Background color', color)
             else:
                 self_or_cls._default_background = color
 
+        self_or_cls._compile()
+
     @_classOrInstancemethod
     def setStyles(self_or_cls, *style_list):  # NOSONAR
         """Sets the style list to be used for a class or an instance.
@@ -326,11 +971,12 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
             if style is None:
                 pass  # NOSONAR
             elif style.lower() not in self_or_cls._styles:
-                print('Style {} is not available.'.format(style),
-                      file=sys.stderr)
+                self_or_cls._reportInvalid('Style', style)
             elif style is not None:
                 self_or_cls._default_styles.append(style)
 
+        self_or_cls._compile()
+
     @_classOrInstancemethod
     def setDefaults(self_or_cls, foreground=None, background=None,  # NOSONAR
                     *style_list):
@@ -353,6 +999,46 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
         self_or_cls.setBackground(background)
         self_or_cls.setStyles(*style_list)
 
+    @_classOrInstancemethod
+    def _compile(self_or_cls):  # NOSONAR
+        """Builds the escape prefix and suffix for the current defaults."""
+
+        foreground = self_or_cls._default_foreground
+        background = self_or_cls._default_background
+        # only RGB colors depend on the color depth of the stream
+        depth = self_or_cls._colorDepth() if _rgb(foreground) or \
+            _rgb(background) else terminal.COLORS_256
+        prefix = self_or_cls._buildPrefix(foreground, background,
+                                          self_or_cls._default_styles,
+                                          depth)[0]
+        self_or_cls._defaults_key = (foreground, background,
+                                     tuple(self_or_cls._default_styles))
+        self_or_cls._compiled_prefix = prefix
+        self_or_cls._compiled_suffix = '\033[0m' if prefix else ''
+        self_or_cls._compiled_prefix_bytes = _asciiBytes(prefix)
+
+    @_classOrInstancemethod
+    def template(self_or_cls, field='{}'):  # NOSONAR
+        """Returns a str.format template that wraps `field` with the default
+            color and attributes.
+
+        The template honors setWHEN at the time it is created, so build it
+            again after changing WHEN.
+
+        Parameters
+        ----------
+        field : str, optional
+            The replacement field to be wrapped, '{}' by default.
+        """
+
+        if not self_or_cls._colorEnabled():
+            return field
+        style = self_or_cls._contextStyle()
+        if style is not None:
+            return style.template(field)
+        return self_or_cls._compiled_prefix + field + \
+            self_or_cls._compiled_suffix
+
     @_classOrInstancemethod
     def wrap(self_or_cls, text=None, foreground=None,  # NOSONAR
              background=None, *style_list):
@@ -364,63 +1050,309 @@ class SwaANSI(six.with_metaclass(MetaANSI, object)):
         text : str, optional
             The text that will be wrapped
         foreground:
-            If set, overrides the default foreground color
+            If set, overrides the default foreground color.  A Style
+            overrides every default, and background and style_list given
+            with it override its own.
         background:
             If set, overrides the default background color
         style_list:
             If set, overrides the default style list
         """
 
-        # only add ansi if _when is 'always' or output is a tty
+        # only add ansi if _when is 'always' or the stream supports color
         if text is None or text == '' or self_or_cls._when == 'never' or (
-                self_or_cls._when == 'auto' and not sys.stdout.isatty()):
+                self_or_cls._when == 'auto' and
+                not terminal.probe(self_or_cls._stream).color):
             return text
 
-        if foreground is None:
-            foreground = self_or_cls._default_foreground
-        if foreground:
-            if foreground.lower() not in self_or_cls._colors:
-                print('Foreground color {} is not available.'.
-                      format(foreground), file=sys.stderr)
-                fg_string = ''
-            else:
-                fg_string = '38;5;{}'.format(self_or_cls._colors[foreground.
-                                                                 lower()])
+        # fast path: nothing overridden, use the compiled defaults
+        if foreground is None and background is None and \
+                len(style_list) == 0:
+            style = self_or_cls._contextStyle()
+            if style is None:
+                return self_or_cls._compiled_prefix + text + \
+                    self_or_cls._compiled_suffix
+            prefix = style.prefix(self_or_cls._colorDepth())
+        elif isinstance(foreground, Style):
+            prefix = _override(foreground, background, style_list).prefix(
+                self_or_cls._colorDepth())
         else:
-            fg_string = ''
+            prefix = self_or_cls._resolvePrefix(foreground, background,
+                                                style_list)
+        if prefix:
+            return prefix + text + '\033[0m'
+        else:
+            return text
 
-        if background is None:
-            background = self_or_cls._default_background
-        if background:
-            if background.lower() not in self_or_cls._colors:
-                print('Background color {} is not available.'.
-                      format(background), file=sys.stderr)
-                bg_string = ''
-            else:
-                bg_string = '48;5;{}'.format(self_or_cls._colors[background.
-                                                                 lower()])
+    @_classOrInstancemethod
+    def wrapBytes(self_or_cls, data, foreground=None,  # NOSONAR
+                  background=None, *style_list):
+        """Wraps bytes with ansi escape codes for color and attributes.
+
+        Takes the same attributes as wrap, and bytes, bytearray or memoryview
+            data that is never decoded.  Returns bytes, or `data` unchanged
+            when it is empty or color is disabled.
+
+        Parameters
+        ----------
+        data : bytes-like, mandatory
+            The bytes that will be wrapped
+        foreground : str, optional
+            If set, overrides the default foreground color.  A Style
+            overrides every default, and background and style_list given
+            with it override its own.
+        background : str, optional
+            If set, overrides the default background color
+        style_list : list(str), optional
+            If set, overrides the default style list
+        """
+
+        if not len(data) or not self_or_cls._colorEnabled():
+            return data
+
+        if foreground is None and background is None and \
+                len(style_list) == 0 and self_or_cls._contextStyle() is None:
+            prefix = self_or_cls._compiled_prefix_bytes
+        elif isinstance(foreground, Style):
+            prefix = _asciiBytes(self_or_cls._specPrefix(
+                _override(foreground, background, style_list)))
         else:
-            bg_string = ''
+            prefix = _asciiBytes(self_or_cls._resolvePrefix(
+                foreground, background, style_list))
+        if not prefix:
+            return data
+        if six.PY2 and not isinstance(data, bytes):
+            data = _bytes(data)
+        return b''.join((prefix, data, b'\033[0m'))
 
-        if len(style_list) == 0:
-            style_list = self_or_cls._default_styles
-        style_string_list = []
-        for style in style_list:
-            if style is None:
-                pass  # NOSONAR
-            elif style.lower() not in self_or_cls._styles:
-                print('Style {} is not available.'.
-                      format(style), file=sys.stderr)
-            elif style is not None:
-                style_string_list.append(self_or_cls._styles[style.lower()])
-        styles_string = ';'.join(style_string_list)
+    @_classOrInstancemethod
+    def wrapMany(self_or_cls, texts, foreground=None,  # NOSONAR
+                 background=None, *style_list):
+        """Wraps every text string in `texts` with the same color and
+            attributes.
 
-        if fg_string or bg_string or styles_string:
-            return '\033[{}m{}\033[0m'.format(
-                ';'.join(filter(len, [fg_string, bg_string, styles_string])),
-                text)
+        The attributes are resolved once for the whole batch.  None and empty
+            strings are returned unchanged, as with wrap.
+
+        Parameters
+        ----------
+        texts : iterable(str), mandatory
+            The text strings that will be wrapped
+        foreground : str, optional
+            If set, overrides the default foreground color
+        background : str, optional
+            If set, overrides the default background color
+        style_list : list(str), optional
+            If set, overrides the default style list
+
+        Returns
+        -------
+        list(str)
+            The wrapped strings, in the order of `texts`
+        """
+
+        if not self_or_cls._colorEnabled():
+            return list(texts)
+
+        prefix = self_or_cls._resolvePrefix(foreground, background,
+                                            style_list)
+        if not prefix:
+            return list(texts)
+        suffix = '\033[0m'
+        return [prefix + text + suffix if text else text for text in texts]
+
+    @_classOrInstancemethod
+    def wrapEach(self_or_cls, texts, specs):  # NOSONAR
+        """Wraps each text string in `texts` with the matching spec in
+            `specs`.
+
+        A spec is None for the defaults, a color name, a tuple of
+            (foreground, background, *style_list), a SwaANSI instance, or a
+            Style.  Each distinct spec is resolved only once.
+
+        Parameters
+        ----------
+        texts : iterable(str), mandatory
+            The text strings that will be wrapped
+        specs : iterable, mandatory
+            One spec per text string
+
+        Returns
+        -------
+        list(str)
+            The wrapped strings, in the order of `texts`
+        """
+
+        if not self_or_cls._colorEnabled():
+            return list(texts)
+
+        prefixes = {}
+        wrapped = []
+        for text, spec in zip(texts, specs):
+            if not text:
+                wrapped.append(text)
+                continue
+            key = tuple(spec) if isinstance(spec, list) else spec
+            try:
+                prefix = prefixes[key]
+            except KeyError:
+                prefix = prefixes[key] = self_or_cls._specPrefix(spec)
+            wrapped.append(prefix + text + '\033[0m' if prefix else text)
+        return wrapped
+
+    @_classOrInstancemethod
+    def wrapColumns(self_or_cls, rows, specs):  # NOSONAR
+        """Wraps the cells of table rows, one spec per column.
+
+        Specs take the same forms as in wrapEach and are resolved once.
+            Cells in columns beyond the last spec are not wrapped.
+
+        Parameters
+        ----------
+        rows : iterable(sequence(str)), mandatory
+            The rows of cells that will be wrapped
+        specs : sequence, mandatory
+            One spec per column
+
+        Returns
+        -------
+        generator(list(str))
+            The wrapped rows, generated as `rows` is consumed
+        """
+
+        if not self_or_cls._colorEnabled():
+            for row in rows:
+                yield list(row)
+            return
+
+        columns = [(prefix, '\033[0m' if prefix else '') for prefix in
+                   [self_or_cls._specPrefix(spec) for spec in specs]]
+        for row in rows:
+            wrapped = [prefix + cell + suffix if cell else cell
+                       for cell, (prefix, suffix) in zip(row, columns)]
+            if len(row) > len(columns):
+                wrapped.extend(row[len(columns):])
+            yield wrapped
+
+    @_classOrInstancemethod
+    def _colorEnabled(self_or_cls, stream=None):  # NOSONAR
+        """Returns whether setWHEN currently allows escape codes, judging
+            'auto' by `stream` if given, or else by the stream of setStream."""
+
+        return self_or_cls._when == 'always' or (
+            self_or_cls._when == 'auto' and terminal.probe(
+                self_or_cls._stream if stream is None else stream).color)
+
+    @_classOrInstancemethod
+    def _resolvePrefix(self_or_cls, foreground, background,  # NOSONAR
+                       style_list):
+        """Returns the escape prefix for the arguments of wrap, falling back
+            to the defaults for those not given."""
+
+        # the defaults, or the Style set with using() on the class, only
+        # matter for the arguments not given
+        if foreground is None or background is None or len(style_list) == 0:
+            style = _current.get() if isinstance(self_or_cls, type) else None
+            if foreground is None and background is None and \
+                    len(style_list) == 0:
+                if style is not None:
+                    return style.prefix(self_or_cls._colorDepth())
+                return self_or_cls._compiled_prefix
+            defaults = style if style is not None else \
+                self_or_cls._defaults_key
         else:
-            return text
+            style = defaults = None
+
+        # arguments seen before lead straight to their cache entry
+        arguments = (foreground, background, style_list, defaults)
+        cache = self_or_cls._prefix_cache
+        try:
+            key = self_or_cls._cache_keys[arguments]
+            entry = cache.pop(key)
+        except (KeyError, TypeError):
+            pass
+        else:
+            cache[key] = entry
+            self_or_cls._cache_stats['hits'] += 1
+            if entry[1]:
+                self_or_cls._countInvalid(entry[1])
+            return entry[0]
+
+        if defaults is not None:
+            defaults = self_or_cls._defaults(style)
+            if foreground is None:
+                foreground = defaults[0]
+            if background is None:
+                background = defaults[1]
+            if len(style_list) == 0:
+                style_list = defaults[2]
+
+        # only RGB colors depend on the color depth of the stream
+        if _rgb(foreground) or _rgb(background):
+            return self_or_cls._getPrefix(foreground, background, style_list,
+                                          self_or_cls._colorDepth())
+        return self_or_cls._getPrefix(foreground, background, style_list,
+                                      terminal.COLORS_256, arguments)
+
+    @_classOrInstancemethod
+    def _contextStyle(self_or_cls):  # NOSONAR
+        """Returns the Style set with style.using in the current context when
+            called on the class, or None.  Instances keep their own defaults.
+        """
+
+        return _current.get() if isinstance(self_or_cls, type) else None
+
+    @_classOrInstancemethod
+    def _defaults(self_or_cls, style=None):  # NOSONAR
+        """Returns the default (foreground, background, style_list), taken
+            from `style` when one is given."""
+
+        if style is not None:
+            return style.foreground, style.background, style.styles
+        return self_or_cls._default_foreground, \
+            self_or_cls._default_background, self_or_cls._default_styles
+
+    @_classOrInstancemethod
+    def _colorDepth(self_or_cls, stream=None):  # NOSONAR
+        """Returns the color depth set by setColorDepth, or else the depth of
+            `stream` or of the stream of setStream.  Streams that are not
+            terminals count as 256 colors."""
+
+        if self_or_cls._depth is not None:
+            return self_or_cls._depth
+        return terminal.probe(self_or_cls._stream if stream is None
+                              else stream).depth or terminal.COLORS_256
+
+    @_classOrInstancemethod
+    def _specPrefix(self_or_cls, spec):  # NOSONAR
+        """Returns the escape prefix for a wrapEach or wrapColumns spec."""
+
+        if isinstance(spec, SwaANSI):
+            return spec._compiled_prefix
+        if isinstance(spec, Style):
+            return spec.prefix(self_or_cls._colorDepth())
+        return self_or_cls._resolvePrefix(*_spec_arguments(spec))
+
+    @_classOrInstancemethod
+    def _specAttributes(self_or_cls, spec, depth=None):  # NOSONAR
+        """Returns the foreground and background SGR parameters and the tuple
+            of style codes for a spec, falling back to the defaults."""
+
+        if isinstance(spec, SwaANSI):
+            return spec._specAttributes(None, depth)
+        if depth is None:
+            depth = self_or_cls._colorDepth()
+
+        foreground, background, style_list = _spec_arguments(spec)
+        defaults = self_or_cls._defaults(self_or_cls._contextStyle())
+        if foreground is None:
+            foreground = defaults[0]
+        if background is None:
+            background = defaults[1]
+        if len(style_list) == 0:
+            style_list = defaults[2]
+        return self_or_cls._buildAttributes(foreground, background,
+                                            style_list, depth)[:3]
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
-"""Exports SwaANSI"""
+"""Exports SwaANSI and Style"""
 
 from .SwaANSI import SwaANSI
+from .style import Style
@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Runs the command line colorizer: python -m swajime"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,265 @@
+"""Bundled 256 color table
+
+Generated from dat/color_data.json by dat/build_color_data.py.  Do not edit.
+
+Each entry is (colorId, name, hexString, (r, g, b), (h, s, l)).
+"""
+
+COLOR_DATA = (
+    (0, 'Black', '#000000', (0, 0, 0), (0, 0, 0)),
+    (1, 'Maroon', '#800000', (128, 0, 0), (0, 100, 25)),
+    (2, 'Green', '#008000', (0, 128, 0), (120, 100, 25)),
+    (3, 'Olive', '#808000', (128, 128, 0), (60, 100, 25)),
+    (4, 'Navy', '#000080', (0, 0, 128), (240, 100, 25)),
+    (5, 'Purple', '#800080', (128, 0, 128), (300, 100, 25)),
+    (6, 'Teal', '#008080', (0, 128, 128), (180, 100, 25)),
+    (7, 'Silver', '#c0c0c0', (192, 192, 192), (0, 0, 75)),
+    (8, 'Grey', '#808080', (128, 128, 128), (0, 0, 50)),
+    (9, 'Red', '#ff0000', (255, 0, 0), (0, 100, 50)),
+    (10, 'Lime', '#00ff00', (0, 255, 0), (120, 100, 50)),
+    (11, 'Yellow', '#ffff00', (255, 255, 0), (60, 100, 50)),
+    (12, 'Blue', '#0000ff', (0, 0, 255), (240, 100, 50)),
+    (13, 'Fuchsia', '#ff00ff', (255, 0, 255), (300, 100, 50)),
+    (14, 'Aqua', '#00ffff', (0, 255, 255), (180, 100, 50)),
+    (15, 'White', '#ffffff', (255, 255, 255), (0, 0, 100)),
+    (16, 'Grey0', '#000000', (0, 0, 0), (0, 0, 0)),
+    (17, 'NavyBlue', '#00005f', (0, 0, 95), (240, 100, 18)),
+    (18, 'DarkBlue', '#000087', (0, 0, 135), (240, 100, 26)),
+    (19, 'Blue3', '#0000af', (0, 0, 175), (240, 100, 34)),
+    (20, 'Blue2', '#0000d7', (0, 0, 215), (240, 100, 42)),
+    (21, 'Blue1', '#0000ff', (0, 0, 255), (240, 100, 50)),
+    (22, 'DarkGreen', '#005f00', (0, 95, 0), (120, 100, 18)),
+    (23, 'DeepSkyBlue6', '#005f5f', (0, 95, 95), (180, 100, 18)),
+    (24, 'DeepSkyBlue5', '#005f87', (0, 95, 135), (197.777777777778, 100, 26)),
+    (25, 'DeepSkyBlue4', '#005faf', (0, 95, 175), (207.428571428571, 100, 34)),
+    (26, 'DodgerBlue3', '#005fd7', (0, 95, 215), (213.488372093023, 100, 42)),
+    (27, 'DodgerBlue2', '#005fff', (0, 95, 255), (217.647058823529, 100, 50)),
+    (28, 'Green4', '#008700', (0, 135, 0), (120, 100, 26)),
+    (29, 'SpringGreen6', '#00875f', (0, 135, 95), (162.222222222222, 100, 26)),
+    (30, 'Turquoise1', '#008787', (0, 135, 135), (180, 100, 26)),
+    (31, 'DeepSkyBlue3', '#0087af', (0, 135, 175), (193.714285714286, 100, 34)),
+    (32, 'DeepSkyBlue2', '#0087d7', (0, 135, 215), (202.325581395349, 100, 42)),
+    (33, 'DodgerBlue1', '#0087ff', (0, 135, 255), (208.235294117647, 100, 50)),
+    (34, 'Green3', '#00af00', (0, 175, 0), (120, 100, 34)),
+    (35, 'SpringGreen5', '#00af5f', (0, 175, 95), (152.571428571429, 100, 34)),
+    (36, 'DarkCyan', '#00af87', (0, 175, 135), (166.285714285714, 100, 34)),
+    (37, 'LightSeaGreen', '#00afaf', (0, 175, 175), (180, 100, 34)),
+    (38, 'DeepSkyBlue1', '#00afd7', (0, 175, 215), (191.162790697674, 100, 42)),
+    (39, 'DeepSkyBlue', '#00afff', (0, 175, 255), (198.823529411765, 100, 50)),
+    (40, 'Green2', '#00d700', (0, 215, 0), (120, 100, 42)),
+    (41, 'SpringGreen4', '#00d75f', (0, 215, 95), (146.511627906977, 100, 42)),
+    (42, 'SpringGreen3', '#00d787', (0, 215, 135), (157.674418604651, 100, 42)),
+    (43, 'Cyan2', '#00d7af', (0, 215, 175), (168.837209302326, 100, 42)),
+    (44, 'DarkTurquoise', '#00d7d7', (0, 215, 215), (180, 100, 42)),
+    (45, 'Turquoise', '#00d7ff', (0, 215, 255), (189.411764705882, 100, 50)),
+    (46, 'Green1', '#00ff00', (0, 255, 0), (120, 100, 50)),
+    (47, 'SpringGreen2', '#00ff5f', (0, 255, 95), (142.352941176471, 100, 50)),
+    (48, 'SpringGreen1', '#00ff87', (0, 255, 135), (151.764705882353, 100, 50)),
+    (49, 'MediumSpringGreen', '#00ffaf', (0, 255, 175), (161.176470588235, 100, 50)),
+    (50, 'Cyan1', '#00ffd7', (0, 255, 215), (170.588235294118, 100, 50)),
+    (51, 'Cyan', '#00ffff', (0, 255, 255), (180, 100, 50)),
+    (52, 'DarkRed1', '#5f0000', (95, 0, 0), (0, 100, 18)),
+    (53, 'DeepPink7', '#5f005f', (95, 0, 95), (300, 100, 18)),
+    (54, 'Purple5', '#5f0087', (95, 0, 135), (282.222222222222, 100, 26)),
+    (55, 'Purple4', '#5f00af', (95, 0, 175), (272.571428571429, 100, 34)),
+    (56, 'Purple3', '#5f00d7', (95, 0, 215), (266.511627906977, 100, 42)),
+    (57, 'BlueViolet', '#5f00ff', (95, 0, 255), (262.352941176471, 100, 50)),
+    (58, 'Orange3', '#5f5f00', (95, 95, 0), (60, 100, 18)),
+    (59, 'Grey37', '#5f5f5f', (95, 95, 95), (0, 0, 37)),
+    (60, 'MediumPurple6', '#5f5f87', (95, 95, 135), (240, 17, 45)),
+    (61, 'SlateBlue2', '#5f5faf', (95, 95, 175), (240, 33, 52)),
+    (62, 'SlateBlue1', '#5f5fd7', (95, 95, 215), (240, 60, 60)),
+    (63, 'RoyalBlue', '#5f5fff', (95, 95, 255), (240, 100, 68)),
+    (64, 'Chartreuse5', '#5f8700', (95, 135, 0), (77.7777777777778, 100, 26)),
+    (65, 'DarkSeaGreen8', '#5f875f', (95, 135, 95), (120, 17, 45)),
+    (66, 'PaleTurquoise1', '#5f8787', (95, 135, 135), (180, 17, 45)),
+    (67, 'SteelBlue3', '#5f87af', (95, 135, 175), (210, 33, 52)),
+    (68, 'SteelBlue2', '#5f87d7', (95, 135, 215), (220, 60, 60)),
+    (69, 'CornflowerBlue', '#5f87ff', (95, 135, 255), (225, 100, 68)),
+    (70, 'Chartreuse4', '#5faf00', (95, 175, 0), (87.4285714285714, 100, 34)),
+    (71, 'DarkSeaGreen7', '#5faf5f', (95, 175, 95), (120, 33, 52)),
+    (72, 'CadetBlue1', '#5faf87', (95, 175, 135), (150, 33, 52)),
+    (73, 'CadetBlue', '#5fafaf', (95, 175, 175), (180, 33, 52)),
+    (74, 'SkyBlue2', '#5fafd7', (95, 175, 215), (200, 60, 60)),
+    (75, 'SteelBlue1', '#5fafff', (95, 175, 255), (210, 100, 68)),
+    (76, 'Chartreuse3', '#5fd700', (95, 215, 0), (93.4883720930233, 100, 42)),
+    (77, 'PaleGreen3', '#5fd75f', (95, 215, 95), (120, 60, 60)),
+    (78, 'SeaGreen3', '#5fd787', (95, 215, 135), (140, 60, 60)),
+    (79, 'Aquamarine2', '#5fd7af', (95, 215, 175), (160, 60, 60)),
+    (80, 'MediumTurquoise', '#5fd7d7', (95, 215, 215), (180, 60, 60)),
+    (81, 'SteelBlue', '#5fd7ff', (95, 215, 255), (195, 100, 68)),
+    (82, 'Chartreuse2', '#5fff00', (95, 255, 0), (97.6470588235294, 100, 50)),
+    (83, 'SeaGreen2', '#5fff5f', (95, 255, 95), (120, 100, 68)),
+    (84, 'SeaGreen1', '#5fff87', (95, 255, 135), (135, 100, 68)),
+    (85, 'SeaGreen', '#5fffaf', (95, 255, 175), (150, 100, 68)),
+    (86, 'Aquamarine1', '#5fffd7', (95, 255, 215), (165, 100, 68)),
+    (87, 'DarkSlateGray2', '#5fffff', (95, 255, 255), (180, 100, 68)),
+    (88, 'DarkRed', '#870000', (135, 0, 0), (0, 100, 26)),
+    (89, 'DeepPink6', '#87005f', (135, 0, 95), (317.777777777778, 100, 26)),
+    (90, 'DarkMagenta1', '#870087', (135, 0, 135), (300, 100, 26)),
+    (91, 'DarkMagenta', '#8700af', (135, 0, 175), (286.285714285714, 100, 34)),
+    (92, 'DarkViolet1', '#8700d7', (135, 0, 215), (277.674418604651, 100, 42)),
+    (93, 'Purple2', '#8700ff', (135, 0, 255), (271.764705882353, 100, 50)),
+    (94, 'Orange2', '#875f00', (135, 95, 0), (42.2222222222222, 100, 26)),
+    (95, 'LightPink2', '#875f5f', (135, 95, 95), (0, 17, 45)),
+    (96, 'Plum3', '#875f87', (135, 95, 135), (300, 17, 45)),
+    (97, 'MediumPurple5', '#875faf', (135, 95, 175), (270, 33, 52)),
+    (98, 'MediumPurple4', '#875fd7', (135, 95, 215), (260, 60, 60)),
+    (99, 'SlateBlue', '#875fff', (135, 95, 255), (255, 100, 68)),
+    (100, 'Yellow6', '#878700', (135, 135, 0), (60, 100, 26)),
+    (101, 'Wheat1', '#87875f', (135, 135, 95), (60, 17, 45)),
+    (102, 'Grey53', '#878787', (135, 135, 135), (0, 0, 52)),
+    (103, 'LightSlateGrey', '#8787af', (135, 135, 175), (240, 20, 60)),
+    (104, 'MediumPurple3', '#8787d7', (135, 135, 215), (240, 50, 68)),
+    (105, 'LightSlateBlue', '#8787ff', (135, 135, 255), (240, 100, 76)),
+    (106, 'Yellow5', '#87af00', (135, 175, 0), (73.7142857142857, 100, 34)),
+    (107, 'DarkOliveGreen5', '#87af5f', (135, 175, 95), (90, 33, 52)),
+    (108, 'DarkSeaGreen6', '#87af87', (135, 175, 135), (120, 20, 60)),
+    (109, 'LightSkyBlue2', '#87afaf', (135, 175, 175), (180, 20, 60)),
+    (110, 'LightSkyBlue1', '#87afd7', (135, 175, 215), (210, 50, 68)),
+    (111, 'SkyBlue1', '#87afff', (135, 175, 255), (220, 100, 76)),
+    (112, 'Chartreuse1', '#87d700', (135, 215, 0), (82.3255813953488, 100, 42)),
+    (113, 'DarkOliveGreen4', '#87d75f', (135, 215, 95), (100, 60, 60)),
+    (114, 'PaleGreen2', '#87d787', (135, 215, 135), (120, 50, 68)),
+    (115, 'DarkSeaGreen5', '#87d7af', (135, 215, 175), (150, 50, 68)),
+    (116, 'DarkSlateGray1', '#87d7d7', (135, 215, 215), (180, 50, 68)),
+    (117, 'SkyBlue', '#87d7ff', (135, 215, 255), (200, 100, 76)),
+    (118, 'Chartreuse', '#87ff00', (135, 255, 0), (88.2352941176471, 100, 50)),
+    (119, 'LightGreen1', '#87ff5f', (135, 255, 95), (105, 100, 68)),
+    (120, 'LightGreen', '#87ff87', (135, 255, 135), (120, 100, 76)),
+    (121, 'PaleGreen1', '#87ffaf', (135, 255, 175), (140, 100, 76)),
+    (122, 'Aquamarine', '#87ffd7', (135, 255, 215), (160, 100, 76)),
+    (123, 'DarkSlateGray', '#87ffff', (135, 255, 255), (180, 100, 76)),
+    (124, 'Red3', '#af0000', (175, 0, 0), (0, 100, 34)),
+    (125, 'DeepPink5', '#af005f', (175, 0, 95), (327.428571428571, 100, 34)),
+    (126, 'MediumVioletRed', '#af0087', (175, 0, 135), (313.714285714286, 100, 34)),
+    (127, 'Magenta5', '#af00af', (175, 0, 175), (300, 100, 34)),
+    (128, 'DarkViolet', '#af00d7', (175, 0, 215), (288.837209302326, 100, 42)),
+    (129, 'Purple1', '#af00ff', (175, 0, 255), (281.176470588235, 100, 50)),
+    (130, 'DarkOrange2', '#af5f00', (175, 95, 0), (32.5714285714286, 100, 34)),
+    (131, 'IndianRed3', '#af5f5f', (175, 95, 95), (0, 33, 52)),
+    (132, 'HotPink4', '#af5f87', (175, 95, 135), (330, 33, 52)),
+    (133, 'MediumOrchid3', '#af5faf', (175, 95, 175), (300, 33, 52)),
+    (134, 'MediumOrchid2', '#af5fd7', (175, 95, 215), (280, 60, 60)),
+    (135, 'MediumPurple2', '#af5fff', (175, 95, 255), (270, 100, 68)),
+    (136, 'DarkGoldenrod', '#af8700', (175, 135, 0), (46.2857142857143, 100, 34)),
+    (137, 'LightSalmon2', '#af875f', (175, 135, 95), (30, 33, 52)),
+    (138, 'RosyBrown', '#af8787', (175, 135, 135), (0, 20, 60)),
+    (139, 'Grey63', '#af87af', (175, 135, 175), (300, 20, 60)),
+    (140, 'MediumPurple1', '#af87d7', (175, 135, 215), (270, 50, 68)),
+    (141, 'MediumPurple', '#af87ff', (175, 135, 255), (260, 100, 76)),
+    (142, 'Gold2', '#afaf00', (175, 175, 0), (60, 100, 34)),
+    (143, 'DarkKhaki', '#afaf5f', (175, 175, 95), (60, 33, 52)),
+    (144, 'NavajoWhite1', '#afaf87', (175, 175, 135), (60, 20, 60)),
+    (145, 'Grey69', '#afafaf', (175, 175, 175), (0, 0, 68)),
+    (146, 'LightSteelBlue2', '#afafd7', (175, 175, 215), (240, 33, 76)),
+    (147, 'LightSteelBlue1', '#afafff', (175, 175, 255), (240, 100, 84)),
+    (148, 'Yellow4', '#afd700', (175, 215, 0), (71.1627906976744, 100, 42)),
+    (149, 'DarkOliveGreen3', '#afd75f', (175, 215, 95), (80, 60, 60)),
+    (150, 'DarkSeaGreen4', '#afd787', (175, 215, 135), (90, 50, 68)),
+    (151, 'DarkSeaGreen3', '#afd7af', (175, 215, 175), (120, 33, 76)),
+    (152, 'LightCyan1', '#afd7d7', (175, 215, 215), (180, 33, 76)),
+    (153, 'LightSkyBlue', '#afd7ff', (175, 215, 255), (210, 100, 84)),
+    (154, 'GreenYellow', '#afff00', (175, 255, 0), (78.8235294117647, 100, 50)),
+    (155, 'DarkOliveGreen2', '#afff5f', (175, 255, 95), (90, 100, 68)),
+    (156, 'PaleGreen', '#afff87', (175, 255, 135), (100, 100, 76)),
+    (157, 'DarkSeaGreen2', '#afffaf', (175, 255, 175), (120, 100, 84)),
+    (158, 'DarkSeaGreen1', '#afffd7', (175, 255, 215), (150, 100, 84)),
+    (159, 'PaleTurquoise', '#afffff', (175, 255, 255), (180, 100, 84)),
+    (160, 'Red2', '#d70000', (215, 0, 0), (0, 100, 42)),
+    (161, 'DeepPink4', '#d7005f', (215, 0, 95), (333.488372093023, 100, 42)),
+    (162, 'DeepPink3', '#d70087', (215, 0, 135), (322.325581395349, 100, 42)),
+    (163, 'Magenta4', '#d700af', (215, 0, 175), (311.162790697674, 100, 42)),
+    (164, 'Magenta3', '#d700d7', (215, 0, 215), (300, 100, 42)),
+    (165, 'Magenta2', '#d700ff', (215, 0, 255), (290.588235294118, 100, 50)),
+    (166, 'DarkOrange1', '#d75f00', (215, 95, 0), (26.5116279069767, 100, 42)),
+    (167, 'IndianRed2', '#d75f5f', (215, 95, 95), (0, 60, 60)),
+    (168, 'HotPink3', '#d75f87', (215, 95, 135), (340, 60, 60)),
+    (169, 'HotPink2', '#d75faf', (215, 95, 175), (320, 60, 60)),
+    (170, 'Orchid', '#d75fd7', (215, 95, 215), (300, 60, 60)),
+    (171, 'MediumOrchid1', '#d75fff', (215, 95, 255), (285, 100, 68)),
+    (172, 'Orange1', '#d78700', (215, 135, 0), (37.6744186046512, 100, 42)),
+    (173, 'LightSalmon1', '#d7875f', (215, 135, 95), (20, 60, 60)),
+    (174, 'LightPink1', '#d78787', (215, 135, 135), (0, 50, 68)),
+    (175, 'Pink1', '#d787af', (215, 135, 175), (330, 50, 68)),
+    (176, 'Plum2', '#d787d7', (215, 135, 215), (300, 50, 68)),
+    (177, 'Violet', '#d787ff', (215, 135, 255), (280, 100, 76)),
+    (178, 'Gold1', '#d7af00', (215, 175, 0), (48.8372093023256, 100, 42)),
+    (179, 'LightGoldenrod4', '#d7af5f', (215, 175, 95), (40, 60, 60)),
+    (180, 'Tan', '#d7af87', (215, 175, 135), (30, 50, 68)),
+    (181, 'MistyRose1', '#d7afaf', (215, 175, 175), (0, 33, 76)),
+    (182, 'Thistle1', '#d7afd7', (215, 175, 215), (300, 33, 76)),
+    (183, 'Plum1', '#d7afff', (215, 175, 255), (270, 100, 84)),
+    (184, 'Yellow3', '#d7d700', (215, 215, 0), (60, 100, 42)),
+    (185, 'Khaki1', '#d7d75f', (215, 215, 95), (60, 60, 60)),
+    (186, 'LightGoldenrod3', '#d7d787', (215, 215, 135), (60, 50, 68)),
+    (187, 'LightYellow', '#d7d7af', (215, 215, 175), (60, 33, 76)),
+    (188, 'Grey84', '#d7d7d7', (215, 215, 215), (0, 0, 84)),
+    (189, 'LightSteelBlue', '#d7d7ff', (215, 215, 255), (240, 100, 92)),
+    (190, 'Yellow2', '#d7ff00', (215, 255, 0), (69.4117647058823, 100, 50)),
+    (191, 'DarkOliveGreen1', '#d7ff5f', (215, 255, 95), (75, 100, 68)),
+    (192, 'DarkOliveGreen', '#d7ff87', (215, 255, 135), (80, 100, 76)),
+    (193, 'DarkSeaGreen', '#d7ffaf', (215, 255, 175), (90, 100, 84)),
+    (194, 'Honeydew', '#d7ffd7', (215, 255, 215), (120, 100, 92)),
+    (195, 'LightCyan', '#d7ffff', (215, 255, 255), (180, 100, 92)),
+    (196, 'Red1', '#ff0000', (255, 0, 0), (0, 100, 50)),
+    (197, 'DeepPink2', '#ff005f', (255, 0, 95), (337.647058823529, 100, 50)),
+    (198, 'DeepPink1', '#ff0087', (255, 0, 135), (328.235294117647, 100, 50)),
+    (199, 'DeepPink', '#ff00af', (255, 0, 175), (318.823529411765, 100, 50)),
+    (200, 'Magenta1', '#ff00d7', (255, 0, 215), (309.411764705882, 100, 50)),
+    (201, 'Magenta', '#ff00ff', (255, 0, 255), (300, 100, 50)),
+    (202, 'OrangeRed', '#ff5f00', (255, 95, 0), (22.3529411764706, 100, 50)),
+    (203, 'IndianRed1', '#ff5f5f', (255, 95, 95), (0, 100, 68)),
+    (204, 'IndianRed', '#ff5f87', (255, 95, 135), (345, 100, 68)),
+    (205, 'HotPink1', '#ff5faf', (255, 95, 175), (330, 100, 68)),
+    (206, 'HotPink', '#ff5fd7', (255, 95, 215), (315, 100, 68)),
+    (207, 'MediumOrchid', '#ff5fff', (255, 95, 255), (300, 100, 68)),
+    (208, 'DarkOrange', '#ff8700', (255, 135, 0), (31.7647058823529, 100, 50)),
+    (209, 'Salmon', '#ff875f', (255, 135, 95), (15, 100, 68)),
+    (210, 'LightCoral', '#ff8787', (255, 135, 135), (0, 100, 76)),
+    (211, 'PaleVioletRed', '#ff87af', (255, 135, 175), (340, 100, 76)),
+    (212, 'Orchid2', '#ff87d7', (255, 135, 215), (320, 100, 76)),
+    (213, 'Orchid1', '#ff87ff', (255, 135, 255), (300, 100, 76)),
+    (214, 'Orange', '#ffaf00', (255, 175, 0), (41.1764705882353, 100, 50)),
+    (215, 'SandyBrown', '#ffaf5f', (255, 175, 95), (30, 100, 68)),
+    (216, 'LightSalmon', '#ffaf87', (255, 175, 135), (20, 100, 76)),
+    (217, 'LightPink', '#ffafaf', (255, 175, 175), (0, 100, 84)),
+    (218, 'Pink', '#ffafd7', (255, 175, 215), (330, 100, 84)),
+    (219, 'Plum', '#ffafff', (255, 175, 255), (300, 100, 84)),
+    (220, 'Gold', '#ffd700', (255, 215, 0), (50.5882352941176, 100, 50)),
+    (221, 'LightGoldenrod2', '#ffd75f', (255, 215, 95), (45, 100, 68)),
+    (222, 'LightGoldenrod1', '#ffd787', (255, 215, 135), (40, 100, 76)),
+    (223, 'NavajoWhite', '#ffd7af', (255, 215, 175), (30, 100, 84)),
+    (224, 'MistyRose', '#ffd7d7', (255, 215, 215), (0, 100, 92)),
+    (225, 'Thistle', '#ffd7ff', (255, 215, 255), (300, 100, 92)),
+    (226, 'Yellow1', '#ffff00', (255, 255, 0), (60, 100, 50)),
+    (227, 'LightGoldenrod', '#ffff5f', (255, 255, 95), (60, 100, 68)),
+    (228, 'Khaki', '#ffff87', (255, 255, 135), (60, 100, 76)),
+    (229, 'Wheat', '#ffffaf', (255, 255, 175), (60, 100, 84)),
+    (230, 'Cornsilk', '#ffffd7', (255, 255, 215), (60, 100, 92)),
+    (231, 'Grey100', '#ffffff', (255, 255, 255), (0, 0, 100)),
+    (232, 'Grey3', '#080808', (8, 8, 8), (0, 0, 3)),
+    (233, 'Grey7', '#121212', (18, 18, 18), (0, 0, 7)),
+    (234, 'Grey11', '#1c1c1c', (28, 28, 28), (0, 0, 10)),
+    (235, 'Grey15', '#262626', (38, 38, 38), (0, 0, 14)),
+    (236, 'Grey19', '#303030', (48, 48, 48), (0, 0, 18)),
+    (237, 'Grey23', '#3a3a3a', (58, 58, 58), (0, 0, 22)),
+    (238, 'Grey27', '#444444', (68, 68, 68), (0, 0, 26)),
+    (239, 'Grey30', '#4e4e4e', (78, 78, 78), (0, 0, 30)),
+    (240, 'Grey35', '#585858', (88, 88, 88), (0, 0, 34)),
+    (241, 'Grey39', '#626262', (98, 98, 98), (0, 0, 37)),
+    (242, 'Grey42', '#6c6c6c', (108, 108, 108), (0, 0, 40)),
+    (243, 'Grey46', '#767676', (118, 118, 118), (0, 0, 46)),
+    (244, 'Grey50', '#808080', (128, 128, 128), (0, 0, 50)),
+    (245, 'Grey54', '#8a8a8a', (138, 138, 138), (0, 0, 54)),
+    (246, 'Grey58', '#949494', (148, 148, 148), (0, 0, 58)),
+    (247, 'Grey62', '#9e9e9e', (158, 158, 158), (0, 0, 61)),
+    (248, 'Grey66', '#a8a8a8', (168, 168, 168), (0, 0, 65)),
+    (249, 'Grey70', '#b2b2b2', (178, 178, 178), (0, 0, 69)),
+    (250, 'Grey74', '#bcbcbc', (188, 188, 188), (0, 0, 73)),
+    (251, 'Grey78', '#c6c6c6', (198, 198, 198), (0, 0, 77)),
+    (252, 'Grey82', '#d0d0d0', (208, 208, 208), (0, 0, 81)),
+    (253, 'Grey85', '#dadada', (218, 218, 218), (0, 0, 85)),
+    (254, 'Grey89', '#e4e4e4', (228, 228, 228), (0, 0, 89)),
+    (255, 'Grey93', '#eeeeee', (238, 238, 238), (0, 0, 93)),
+)
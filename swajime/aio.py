@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+#
+# Requires Python 3.5 or later
+#
+
+"""Styled output to asyncio streams
+
+An AsyncWriter colors text segments and hands them to a task that joins
+everything queued so far into one write, then awaits drain().  The queue is
+bounded, so a slow connection makes write() wait instead of buffering without
+limit, while fast ones coalesce many segments per system call.
+
+    from swajime.aio import AsyncWriter
+
+    async def console(reader, writer):
+        async with AsyncWriter(writer, environ={'TERM': 'xterm-256color'}) \\
+                as out:
+            await out.write('connected\\n', 'Green')
+            async for line in reader:
+                await out.writeSegments([('> ', ('Grey50',)),
+                                         (line.decode(), None)])
+
+Whether to color is decided per connection, from `when`, the environment
+the client reported, or the transport's pipe, rather than from the state of
+the SwaANSI class.  Escape prefixes are compiled once per spec and color depth
+and shared by every writer, however many connections there are.
+"""
+
+import asyncio
+
+from . import terminal
+from .SwaANSI import SwaANSI
+
+# Number of writes queued before write() waits for the connection
+QUEUE_SIZE = 1024
+# Number of characters joined into a single write at most
+BATCH_SIZE = 1 << 16
+# Number of compiled prefixes kept before the cache is emptied
+CACHE_SIZE = 4096
+
+# (ansi, spec, depth, defaults) -> escape prefix, shared by every AsyncWriter
+_prefixes = {}
+
+
+class _Terminal(object):
+    """Stands for the terminal of a client that reported its environment."""
+
+    def isatty(self):
+        return True
+
+
+def _prefix(ansi, spec, depth):
+    """Returns the escape prefix of `spec` at `depth`, compiled once for all
+        writers."""
+
+    # unset attributes come from the defaults, which using() may change in
+    # the current context
+    foreground, background, style_list = ansi._defaults(ansi._contextStyle())
+    key = (ansi, tuple(spec) if isinstance(spec, list) else spec, depth,
+           foreground, background, tuple(style_list))
+    try:
+        return _prefixes[key]
+    except KeyError:
+        pass
+    fg_string, bg_string, style_codes = ansi._specAttributes(spec, depth)
+    codes = [code for code in (fg_string, bg_string) if code] + \
+        list(style_codes)
+    if len(_prefixes) >= CACHE_SIZE:
+        _prefixes.clear()
+    prefix = _prefixes[key] = '\033[{}m'.format(';'.join(codes)) \
+        if codes else ''
+    return prefix
+
+
+def clearCache():
+    """Empties the cache of compiled prefixes."""
+
+    _prefixes.clear()
+
+
+class AsyncWriter(object):
+    """Writes styled text to an asyncio.StreamWriter in coalesced batches.
+
+    Methods
+    -------
+    start()
+        Start the task writing to the connection
+    write(text, spec=None)
+        Queue text with the attributes of spec, a coroutine
+    writeSegments(segments)
+        Queue (text, spec) segments as one write, a coroutine
+    close()
+        Write what is queued and stop the task, a coroutine
+    """
+
+    def __init__(self, writer, when=None, environ=None, depth=None,
+                 encoding='utf-8', queue_size=QUEUE_SIZE,
+                 batch_size=BATCH_SIZE, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        writer : asyncio.StreamWriter, mandatory
+            The connection to write to.  It is not closed by close().
+        when : str, optional
+            'always', 'never' or 'auto' for this connection, the WHEN of
+            `ansi` by default
+        environ : dict, optional
+            The environment the client reported, TERM, COLORTERM, NO_COLOR
+            and FORCE_COLOR, to judge 'auto' for a remote terminal.
+            Without it, 'auto' is judged by the pipe of the transport, and a
+            socket gets no color.
+        depth : int, optional
+            The color depth, as in the terminal module, instead of the
+            detected one
+        encoding : str, optional
+            The encoding of the text
+        queue_size : int, optional
+            Number of writes queued before write() waits
+        batch_size : int, optional
+            Most characters joined into a single write
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs
+        """
+
+        self.writer = writer
+        self.encoding = encoding
+        self.batch_size = batch_size
+        self._ansi = ansi
+
+        when = (ansi._when if when is None else when).lower()
+        if when not in ('always', 'never', 'auto'):
+            raise ValueError(
+                "WHEN must be one of 'never', 'always', or 'auto'.")
+        pipe = writer.get_extra_info('pipe')
+        if environ is not None:
+            capability = terminal.detect(_Terminal(), environ)
+        elif pipe is not None:
+            capability = terminal.probe(pipe)
+        else:
+            capability = terminal.Capability(False, False, terminal.NO_COLOR)
+        if when == 'always' or (when == 'auto' and capability.color):
+            self.depth = depth or capability.depth or terminal.COLORS_256
+        else:
+            self.depth = None
+
+        self._queue = asyncio.Queue(queue_size)
+        self._task = None
+        self._error = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def start(self):
+        """Starts the task writing the queue to the connection."""
+
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    def _style(self, text, spec):
+        if self.depth is None or not text:
+            return text
+        prefix = _prefix(self._ansi, spec, self.depth)
+        return prefix + text + '\033[0m' if prefix else text
+
+    async def write(self, text, spec=None):
+        """Queues `text` with the attributes of `spec`.
+
+        Waits while the queue is full, that is while the connection does not
+        keep up.  Raises the error that stopped the connection, if any.
+
+        Parameters
+        ----------
+        text : str, mandatory
+            The text to write
+        spec : optional
+            None for the SwaANSI defaults, a color name, a tuple of
+            (foreground, background, *style_list), a SwaANSI instance, or a
+            Style
+        """
+
+        await self._put(self._style(text, spec))
+
+    async def writeSegments(self, segments):
+        """Queues (text, spec) segments as a single write.
+
+        Parameters
+        ----------
+        segments : iterable((str, spec)), mandatory
+            The texts and their attributes, as for write
+        """
+
+        style = self._style
+        await self._put(''.join([style(text, spec)
+                                 for text, spec in segments]))
+
+    async def _put(self, text):
+        if self._error is not None:
+            raise self._error
+        if not text:
+            return
+        if self._task is None:
+            self.start()
+        await self._queue.put(text)
+
+    async def _run(self):
+        queue = self._queue
+        writer = self.writer
+        running = True
+        while running:
+            batch = [await queue.get()]
+            size = len(batch[0] or '')
+            # everything queued meanwhile goes into the same write
+            while size < self.batch_size and not queue.empty():
+                text = queue.get_nowait()
+                batch.append(text)
+                size += len(text or '')
+            if None in batch:
+                running = False
+                batch = batch[:batch.index(None)]
+            if self._error is not None or not batch:
+                # after the connection failed, discard so writers never wait
+                continue
+            try:
+                writer.write(''.join(batch).encode(self.encoding))
+                await writer.drain()
+            except Exception as error:  # NOSONAR
+                # without the frames of this task, which is still running
+                self._error = error.with_traceback(None)
+
+    async def close(self):
+        """Writes what is queued, then stops the task.  The connection is left
+            open.
+
+        Raises the error that stopped the connection, if any.
+        """
+
+        if self._task is not None:
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+        if self._error is not None:
+            raise self._error
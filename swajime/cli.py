@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Command line colorizer
+
+Colors the matches of a set of rules in files or standard input, for shell
+pipelines such as
+
+    tail -f service.log | swajime -r rules.json
+    swajime --when always -r rules.json service.log | less -R
+    python -m swajime -e '\\bERROR\\b' 'Red,,Bold' -e '\\bWARN\\b' Yellow
+
+A rules file is JSON, either an object mapping patterns to specs or a list of
+[pattern, spec] pairs, applied in order.  A spec is a color name, null for
+the SwaANSI defaults, or a list of [foreground, background, style, ...]:
+
+    [["\\\\bERROR\\\\b", ["Red", null, "Bold"]],
+     ["\\\\bWARN(ING)?\\\\b", "Yellow"],
+     ["\\\\b\\\\d+\\\\.\\\\d+\\\\.\\\\d+\\\\.\\\\d+\\\\b", "Cyan"]]
+
+Input is read in blocks of whatever is available, up to BLOCK_SIZE bytes, so
+a pipe fed a line at a time is shown a line at a time while a large file
+costs a few system calls per megabyte.  Output is flushed after each block
+only when it is a terminal.  Bytes that are not valid in the encoding are
+passed through unchanged.
+"""
+
+from __future__ import print_function
+
+from collections import OrderedDict
+
+import argparse
+import codecs
+import errno
+import io
+import json
+import os
+import re
+import six
+import sys
+
+from .SwaANSI import SwaANSI
+from .colorizer import Colorizer
+
+# Most bytes read and colorized at a time
+BLOCK_SIZE = 1 << 20
+
+# The rules used when none are given
+DEFAULT_RULES = [(r'\b(ERROR|CRITICAL|FATAL)\b', ('Red', None, 'Bold')),
+                 (r'\bWARN(ING)?\b', 'Yellow'),
+                 (r'\bINFO\b', 'Green'),
+                 (r'\bDEBUG\b', 'Grey50')]
+
+_DECODE_ERRORS = 'surrogateescape' if six.PY3 else 'strict'
+
+
+def _spec(value):
+    """Returns the spec of a rules file value or of an -e argument."""
+
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, six.string_types) and ',' in value:
+        return tuple(part.strip() or None for part in value.split(','))
+    return value
+
+
+def loadRules(path):
+    """Returns the (pattern, spec) rules of a JSON rules file.
+
+    Raises ValueError if the file is not a list of pairs or an object.
+
+    Parameters
+    ----------
+    path : str, mandatory
+        The rules file
+    """
+
+    with io.open(path, encoding='utf-8') as rules_file:
+        data = json.load(rules_file, object_pairs_hook=OrderedDict)
+    if isinstance(data, dict):
+        data = [list(item) for item in data.items()]
+    rules = []
+    for rule in data:
+        if not isinstance(rule, list) or len(rule) != 2 or \
+                not isinstance(rule[0], six.string_types):
+            raise ValueError('{}: a rule must be a [pattern, spec] pair, not '
+                             '{}'.format(path, json.dumps(rule)))
+        rules.append((rule[0], _spec(rule[1])))
+    return rules
+
+
+def colorizeStream(colorizer, infile, outfile, flush=False,
+                   encoding='utf-8', block_size=BLOCK_SIZE):
+    """Colorizes binary `infile` into binary `outfile` a block at a time.
+
+    Each block is what one read returns, cut at its last newline.
+
+    Parameters
+    ----------
+    colorizer : Colorizer, mandatory
+        The rules
+    infile : binary file, mandatory
+        Where to read from, with read1 if possible
+    outfile : binary file, mandatory
+        Where to write to
+    flush : bool, optional
+        Flush after each block, for a terminal
+    encoding : str, optional
+        The encoding of the input, and of the output
+    block_size : int, optional
+        Most bytes read at a time
+    """
+
+    read = getattr(infile, 'read1', infile.read)
+    write = outfile.write
+    decoder = codecs.getincrementaldecoder(encoding)(_DECODE_ERRORS)
+    sub = colorizer.regex.sub
+    replace = colorizer._replace
+    partial = ''
+    while True:
+        block = read(block_size)
+        if not block:
+            break
+        text = partial + decoder.decode(block)
+        end = text.rfind('\n') + 1
+        if end:
+            write(sub(replace, text[:end]).encode(encoding, _DECODE_ERRORS))
+            if flush:
+                outfile.flush()
+            partial = text[end:]
+        else:
+            partial = text
+    partial += decoder.decode(b'', True)
+    if partial:
+        write(sub(replace, partial).encode(encoding, _DECODE_ERRORS))
+    outfile.flush()
+
+
+def _copy(infile, outfile, flush=False, block_size=BLOCK_SIZE):
+    """Copies binary `infile` to `outfile`, as colorizeStream without
+        color."""
+
+    read = getattr(infile, 'read1', infile.read)
+    block = read(block_size)
+    while block:
+        outfile.write(block)
+        if flush:
+            outfile.flush()
+        block = read(block_size)
+    outfile.flush()
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog='swajime', description='Color the matches of rules in files or '
+        'standard input.')
+    parser.add_argument('files', nargs='*', metavar='FILE',
+                        help="files to read, '-' or none for standard input")
+    parser.add_argument('-r', '--rules', action='append', default=[],
+                        metavar='RULES', help='a JSON rules file')
+    parser.add_argument('-e', '--rule', action='append', default=[], nargs=2,
+                        metavar=('PATTERN', 'SPEC'),
+                        help="a rule, SPEC being a color name or "
+                        "'foreground,background,style,...'")
+    parser.add_argument('-i', '--ignore-case', action='store_true',
+                        help='match the patterns ignoring case')
+    parser.add_argument('--when', choices=('always', 'auto', 'never'),
+                        default='auto', help='when to color, as in setWHEN '
+                        "(default: auto, when the output is a terminal)")
+    parser.add_argument('--encoding', default='utf-8',
+                        help='encoding of the input (default: utf-8)')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='colorize files on this many processes, 0 for '
+                        'one per CPU (default: 1)')
+    return parser
+
+
+def main(argv=None):
+    """Runs the command line colorizer and returns its exit status.
+
+    Parameters
+    ----------
+    argv : list(str), optional
+        The arguments, sys.argv[1:] by default
+    """
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    rules = []
+    try:
+        for path in args.rules:
+            rules.extend(loadRules(path))
+    except (IOError, OSError, ValueError) as error:
+        parser.error(str(error))
+    rules.extend((pattern, _spec(spec)) for pattern, spec in args.rule)
+    if not rules:
+        rules = DEFAULT_RULES
+
+    sys.stdout.flush()
+    SwaANSI.setStream(sys.stdout)
+    SwaANSI.setWHEN(args.when)
+    enabled = SwaANSI._colorEnabled()
+    try:
+        colorizer = Colorizer(rules,
+                              re.IGNORECASE if args.ignore_case else 0)
+    except (re.error, ValueError) as error:
+        parser.error('invalid pattern: {}'.format(error))
+
+    tty = sys.stdout.isatty()
+    outfile = io.open(sys.stdout.fileno(), 'wb', buffering=BLOCK_SIZE,
+                      closefd=False)
+    status = 0
+    try:
+        for path in args.files or ['-']:
+            if path == '-':
+                infile = io.open(sys.stdin.fileno(), 'rb', closefd=False)
+            else:
+                if args.workers != 1 and enabled and not tty and \
+                        os.path.isfile(path):
+                    # regular files are memory mapped and split
+                    outfile.flush()
+                    colorizer.colorizePath(path, outfile,
+                                           args.workers or None,
+                                           encoding=args.encoding)
+                    continue
+                try:
+                    infile = io.open(path, 'rb')
+                except (IOError, OSError) as error:
+                    print('swajime: {}: {}'.format(path, error.strerror),
+                          file=sys.stderr)
+                    status = 1
+                    continue
+            with infile:
+                if enabled:
+                    colorizeStream(colorizer, infile, outfile, tty,
+                                   args.encoding)
+                else:
+                    _copy(infile, outfile, tty)
+        outfile.flush()
+    except KeyboardInterrupt:
+        return 130
+    except (IOError, OSError) as error:
+        if error.errno != errno.EPIPE:
+            raise
+        # the reader went away, as with head: stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+        return 1
+    return status
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Indexes over the color table
+
+A ColorIndex answers questions about the color table without scanning it:
+the names of a colorId, the colorId of a hex string, the color nearest to an
+RGB value among all of them, and the colors within HSL ranges.
+
+    from swajime import SwaANSI
+    index = SwaANSI.colorIndex()
+    index.names(208)                    # ('DarkOrange',)
+    index.byHex('#ff8700')              # 208
+    index.nearest(250, 130, 10)         # 208
+    index.hslRange(hue=(20, 40), saturation=(80, 100))
+
+Entries are kept sorted by red and by hue.  nearest bisects to the red value
+and walks outwards while the red difference alone is smaller than the best
+distance so far, which is exact and looks at a few dozen entries.  hslRange
+bisects the hue range and filters saturation and lightness on what is left.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from .quantize import parseHex
+
+
+class ColorIndex(object):
+    """Lookups by colorId, hex, RGB and HSL over a color table.
+
+    Methods
+    -------
+    name(color_id)
+        Return the canonical name of a colorId
+    names(color_id)
+        Return every name of a colorId
+    byHex(hex_string)
+        Return the colorId with a hex string
+    nearest(r, g, b)
+        Return the colorId nearest to an RGB value
+    hslRange(hue=None, saturation=None, lightness=None)
+        Return the colorIds within HSL ranges
+    """
+
+    def __init__(self, color_data, id_names=None):
+        """
+        Parameters
+        ----------
+        color_data : iterable, mandatory
+            Entries of (colorId, name, hexString, (r, g, b), (h, s, l)), as
+            in swajime._color_data.COLOR_DATA
+        id_names : dict, optional
+            colorId -> tuple of names.  By default every name of an entry,
+            in table order.
+        """
+
+        color_data = tuple(color_data)
+        if id_names is None:
+            id_names = {}
+            for color in color_data:
+                id_names[color[0]] = id_names.get(color[0], ()) + (color[1],)
+        self._id_names = id_names
+
+        # '#rrggbb' -> the first colorId with that value
+        self._hex_ids = {}
+        for color in color_data:
+            self._hex_ids.setdefault('#{:02x}{:02x}{:02x}'.format(*color[3]),
+                                     color[0])
+
+        # (r, g, b, colorId), by red then colorId
+        self._by_red = sorted(set(tuple(color[3]) + (color[0],)
+                                  for color in color_data))
+        self._reds = [entry[0] for entry in self._by_red]
+
+        # (h, s, l, colorId), by hue then colorId
+        self._by_hue = sorted(set(tuple(color[4]) + (color[0],)
+                                  for color in color_data))
+        self._hues = [entry[0] for entry in self._by_hue]
+
+    def name(self, color_id):
+        """Returns the name a colorId is listed under first, or None.
+
+        Parameters
+        ----------
+        color_id : int, mandatory
+            The color index
+        """
+
+        names = self._id_names.get(color_id)
+        return names[0] if names else None
+
+    def names(self, color_id):
+        """Returns the tuple of the names of a colorId, empty if it has none.
+
+        Parameters
+        ----------
+        color_id : int, mandatory
+            The color index
+        """
+
+        return self._id_names.get(color_id, ())
+
+    def byHex(self, hex_string):
+        """Returns the lowest colorId of exactly `hex_string`, or None.
+
+        Parameters
+        ----------
+        hex_string : str, mandatory
+            '#rrggbb' or '#rgb', in any case
+        """
+
+        rgb = parseHex(hex_string)
+        if rgb is None:
+            return None
+        return self._hex_ids.get('#{:02x}{:02x}{:02x}'.format(*rgb))
+
+    def nearest(self, r, g, b):
+        """Returns the colorId nearest to (r, g, b) by Euclidean distance,
+            the lowest colorId among equally near ones.
+
+        Parameters
+        ----------
+        r, g, b : int, mandatory
+            The channels, from 0 to 255
+        """
+
+        entries = self._by_red
+        count = len(entries)
+        above = bisect_left(self._reds, r)
+        below = above - 1
+        best = None
+        best_distance = 1 << 20
+        while below >= 0 or above < count:
+            # the side whose red is closer goes first
+            if above < count and (below < 0 or entries[above][0] - r <=
+                                  r - entries[below][0]):
+                entry = entries[above]
+                above += 1
+            else:
+                entry = entries[below]
+                below -= 1
+            red_distance = (entry[0] - r) ** 2
+            if red_distance > best_distance:
+                # every entry left is further on red alone
+                break
+            distance = red_distance + (entry[1] - g) ** 2 + \
+                (entry[2] - b) ** 2
+            if distance < best_distance or (distance == best_distance and
+                                            entry[3] < best):
+                best, best_distance = entry[3], distance
+        return best
+
+    def hslRange(self, hue=None, saturation=None, lightness=None):
+        """Returns the sorted colorIds whose HSL falls within the ranges.
+
+        Parameters
+        ----------
+        hue : (float, float), optional
+            Inclusive range of degrees.  A range whose start is above its
+            end wraps around 360, as (330, 30) for reds.
+        saturation : (float, float), optional
+            Inclusive range of percents
+        lightness : (float, float), optional
+            Inclusive range of percents
+        """
+
+        hues = self._hues
+        if hue is None:
+            spans = [(0, len(hues))]
+        elif hue[0] <= hue[1]:
+            spans = [(bisect_left(hues, hue[0]), bisect_right(hues, hue[1]))]
+        else:
+            spans = [(bisect_left(hues, hue[0]), len(hues)),
+                     (0, bisect_right(hues, hue[1]))]
+
+        s_low, s_high = saturation if saturation is not None else (0, 100)
+        l_low, l_high = lightness if lightness is not None else (0, 100)
+        entries = self._by_hue
+        return sorted(set(
+            entry[3] for start, end in spans for entry in entries[start:end]
+            if s_low <= entry[1] <= s_high and l_low <= entry[2] <= l_high))
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+r"""Rule based colorizer for streams of text
+
+A Colorizer takes rules pairing a regular expression with a SwaANSI spec,
+compiles all of them into a single alternation and wraps every match with the
+escape prefix of its rule.  Prefixes are resolved once, when the Colorizer is
+built.
+
+A spec is None for the SwaANSI defaults, a color name, a tuple of
+(foreground, background, *style_list), a SwaANSI instance, or a Style.
+
+    from swajime.colorizer import Colorizer
+    colorizer = Colorizer([(r'\bERROR\b', ('Red', None, 'Bold')),
+                           (r'\bWARN(ING)?\b', 'Yellow'),
+                           (r'\d+\.\d+\.\d+\.\d+', 'Cyan')])
+    print(colorizer.colorize('ERROR from 10.0.0.1'))
+
+    with open('service.log') as log:
+        colorizer.colorizeFile(log, sys.stdout)
+
+    # memory map a large file and colorize it on 8 processes
+    colorizer.colorizePath('archive.log', sys.stdout.buffer, workers=8)
+
+Patterns are matched with re.MULTILINE so '^' and '$' anchor at lines.  Large
+blocks are processed at once, so a pattern must not match across a newline.
+
+Each rule becomes a group of the alternation, so the groups of a pattern are
+numbered after those of the rules before it.  Numbered backreferences such as
+\1 and (?(1)...) are renumbered to match.  Python only reads \1 to \99 as
+backreferences, so a rule that refers to a group numbered past 99 in the
+alternation raises ValueError; use named groups there, with names unique
+across the rules.
+"""
+
+from __future__ import print_function
+
+from collections import deque
+
+import mmap
+import multiprocessing
+import os
+import re
+import six
+import sys
+
+from .SwaANSI import SwaANSI
+
+# Size of the blocks read and written by colorizeFile
+BLOCK_SIZE = 1 << 20
+# Size of the chunks handed to each worker by colorizePath
+CHUNK_SIZE = 16 << 20
+
+# lets undecodable bytes round trip unchanged
+_DECODE_ERRORS = 'surrogateescape' if six.PY3 else 'strict'
+
+# (regex, wrappers) compiled once in each colorizePath worker process
+_worker_rules = None
+
+# a character class, where \1 is an octal escape, a numbered backreference, an
+# other escape, or the group number of a conditional
+_REFERENCE = re.compile(r'\[\^?\]?(?:\\.|[^\]\\])*\]|\\([1-9][0-9]?)(?![0-9])'
+                        r'|\\.|\(\?\(([1-9][0-9]*)\)', re.DOTALL)
+
+
+def _init_worker(pattern, flags, wrappers):
+    """Pool initializer compiling the rules once per worker process."""
+
+    global _worker_rules
+    _worker_rules = (re.compile(pattern, flags), wrappers)
+
+
+def _colorize_chunk(args):
+    """Colorizes bytes [start, end) of a file in a worker process."""
+
+    path, start, end, encoding = args
+    regex, wrappers = _worker_rules
+    with open(path, 'rb') as infile:
+        mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            text = mapped[start:end].decode(encoding, _DECODE_ERRORS)
+        finally:
+            mapped.close()
+
+    def replace(match):
+        prefix, suffix = wrappers[match.lastindex]
+        return prefix + match.group() + suffix
+
+    return regex.sub(replace, text).encode(encoding, _DECODE_ERRORS)
+
+
+def _shiftGroups(pattern, offset):
+    """Returns `pattern` with its numbered group references moved up by
+        `offset`."""
+
+    def shift(match):
+        if match.group(1):
+            number = int(match.group(1)) + offset
+            if number > 99:
+                raise ValueError('{}: backreference \\{} would refer to group '
+                                 '{} of the rules; use a named group'.format(
+                                     pattern, match.group(1), number))
+            return '\\{}'.format(number)
+        if match.group(2):
+            return '(?({})'.format(int(match.group(2)) + offset)
+        return match.group()
+
+    return _REFERENCE.sub(shift, pattern) if offset else pattern
+
+
+def _chunk_bounds(mapped, size, chunk_size):
+    """Generates (start, end) offsets of chunks ending on a newline."""
+
+    start = 0
+    while start < size:
+        end = mapped.find(b'\n', min(start + chunk_size, size) - 1) + 1
+        if end <= 0:
+            end = size
+        yield start, end
+        start = end
+
+
+class Colorizer(object):
+    """Wraps the matches of a set of regular expressions with ANSI escapes.
+
+    Methods
+    -------
+    colorize(text)
+        Return text with every match wrapped
+    colorizeLines(lines)
+        Generate colorized lines from an iterable of lines
+    colorizeFile(infile, outfile=sys.stdout, block_size=BLOCK_SIZE)
+        Colorize a file object into another in large blocks
+    colorizePath(path, outfile=sys.stdout.buffer, workers=None, ...)
+        Colorize a file by name on a pool of worker processes
+    """
+
+    def __init__(self, rules, flags=0, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        rules : iterable((pattern, spec)) or dict, mandatory
+            Regular expressions and the spec to wrap their matches with.
+            Earlier rules win when several match at the same position.
+        flags : int, optional
+            re flags applied to every pattern
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs and decides whether color is enabled.
+        """
+
+        if isinstance(rules, dict):
+            rules = rules.items()
+        self.rules = tuple(rules)
+        self._ansi = ansi
+
+        groups = []
+        # groups before those of the current rule, counting its own
+        offset = 1
+        for index, (pattern, spec) in enumerate(self.rules):
+            pattern = getattr(pattern, 'pattern', pattern)
+            groups.append('(?P<_r{}>{})'.format(
+                index, _shiftGroups(pattern, offset)))
+            offset += re.compile(pattern, re.MULTILINE | flags).groups + 1
+        self.regex = re.compile('|'.join(groups), re.MULTILINE | flags)
+
+        # group number of each rule -> (prefix, suffix)
+        self._wrappers = {}
+        for index, (pattern, spec) in enumerate(self.rules):
+            prefix = ansi._specPrefix(spec)
+            self._wrappers[self.regex.groupindex['_r{}'.format(index)]] = \
+                (prefix, '\033[0m' if prefix else '')
+
+    def _replace(self, match):
+        """re.sub callback wrapping a match with the prefix of its rule."""
+
+        # lastindex is the outermost group of the matching rule, since it is
+        # the last group to close
+        prefix, suffix = self._wrappers[match.lastindex]
+        return prefix + match.group() + suffix
+
+    def colorize(self, text):
+        """Returns `text` with every match wrapped with its rule's escapes.
+
+        Parameters
+        ----------
+        text : str, mandatory
+            Any number of lines of text
+        """
+
+        if not text or not self._ansi._colorEnabled():
+            return text
+        return self.regex.sub(self._replace, text)
+
+    def colorizeLines(self, lines):
+        """Generates the colorized version of each line in `lines`.
+
+        Parameters
+        ----------
+        lines : iterable(str), mandatory
+            The lines to colorize, such as an open file
+        """
+
+        if not self._ansi._colorEnabled():
+            for line in lines:
+                yield line
+            return
+
+        sub = self.regex.sub
+        replace = self._replace
+        for line in lines:
+            yield sub(replace, line)
+
+    def colorizeFile(self, infile, outfile=None, block_size=BLOCK_SIZE):
+        """Colorizes `infile` into `outfile` a block of lines at a time.
+
+        Blocks of about `block_size` characters are read, cut at their last
+            newline, colorized with a single substitution and written with a
+            single write.
+
+        Parameters
+        ----------
+        infile : file, mandatory
+            Text file object to read from
+        outfile : file, optional
+            Text file object to write to, sys.stdout by default
+        block_size : int, optional
+            Number of characters to read at a time
+        """
+
+        if outfile is None:
+            outfile = sys.stdout
+        read = infile.read
+        write = outfile.write
+
+        if not self._ansi._colorEnabled(outfile):
+            block = read(block_size)
+            while block:
+                write(block)
+                block = read(block_size)
+            return
+
+        sub = self.regex.sub
+        replace = self._replace
+        partial = ''
+        block = read(block_size)
+        while block:
+            end = block.rfind('\n') + 1
+            if end:
+                write(sub(replace, partial + block[:end]))
+                partial = block[end:]
+            else:
+                partial += block
+            block = read(block_size)
+        if partial:
+            write(sub(replace, partial))
+
+    def colorizePath(self, path, outfile=None, workers=None,
+                     chunk_size=CHUNK_SIZE, encoding='utf-8'):
+        """Colorizes the file at `path` on a pool of worker processes.
+
+        The file is memory mapped and split into chunks of about `chunk_size`
+            bytes ending on a newline.  Each worker compiles the rules once
+            and colorizes whole chunks, which are written to `outfile` in file
+            order as they complete.  At most two chunks per worker are in
+            flight, so the file is never loaded into memory at once.  The
+            output is byte for byte the same as colorize() on the whole file.
+
+        Parameters
+        ----------
+        path : str, mandatory
+            The file to colorize
+        outfile : binary file, optional
+            Where the colorized bytes are written, sys.stdout's buffer by
+            default
+        workers : int, optional
+            Number of worker processes, os.cpu_count() by default.  With one
+            worker, or a single chunk, no pool is started.
+        chunk_size : int, optional
+            Number of bytes colorized by a worker at a time
+        encoding : str, optional
+            Encoding of the file.  It must encode newline as b'\\n', as
+            UTF-8 and Latin-1 do.
+        """
+
+        if outfile is None:
+            outfile = getattr(sys.stdout, 'buffer', sys.stdout)
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+
+        with open(path, 'rb') as infile:
+            size = os.fstat(infile.fileno()).st_size
+            if size == 0:
+                return
+            mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if not self._ansi._colorEnabled(outfile):
+                    for start, end in _chunk_bounds(mapped, size, chunk_size):
+                        outfile.write(mapped[start:end])
+                    return
+                bounds = list(_chunk_bounds(mapped, size, chunk_size))
+            finally:
+                mapped.close()
+
+        initargs = (self.regex.pattern, self.regex.flags, self._wrappers)
+        tasks = [(path, start, end, encoding) for start, end in bounds]
+
+        if workers <= 1 or len(tasks) == 1:
+            _init_worker(*initargs)
+            for task in tasks:
+                outfile.write(_colorize_chunk(task))
+            return
+
+        pool = multiprocessing.Pool(min(workers, len(tasks)), _init_worker,
+                                    initargs)
+        try:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.apply_async(_colorize_chunk, (task,)))
+                if len(pending) >= 2 * workers:
+                    outfile.write(pending.popleft().get())
+            while pending:
+                outfile.write(pending.popleft().get())
+        finally:
+            pool.terminate()
+            pool.join()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Colored grids for numeric arrays
+
+A Heatmap maps every value of a 2-D array onto a palette in one vectorized
+operation when NumPy is installed, and in plain Python otherwise.  Each
+palette entry gets a precompiled format template, so a row is rendered with a
+single join.
+
+    from swajime.heatmap import Heatmap
+    latency = [[12.0, 15.5, 80.1], [11.2, 240.0, 18.3]]
+    for line in Heatmap('heat', 0, 250).lines(latency):
+        print(line)
+
+A colormap is the name of a built-in palette (see PALETTES), a list of color
+names from SwaANSI.colors, or a list of RGB stops, '#rrggbb' or (r, g, b),
+that are interpolated into `steps` colors.
+"""
+
+from __future__ import division
+
+import math
+import six
+
+from .SwaANSI import SwaANSI, _rgb
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def _cube(r, g, b):
+    """Returns the colorId of level (r, g, b) of the 6x6x6 color cube."""
+
+    return 16 + 36 * r + 6 * g + b
+
+
+# Built-in palettes as colorIds of the 256 color table, low to high
+PALETTES = {
+    'grays': tuple(range(232, 256)),
+    'reds': tuple(_cube(level, 0, 0) for level in range(6)),
+    'greens': tuple(_cube(0, level, 0) for level in range(6)),
+    'blues': tuple(_cube(0, 0, level) for level in range(6)),
+    'heat': tuple([_cube(level, 0, 0) for level in range(6)] +
+                  [_cube(5, level, 0) for level in range(1, 6)] +
+                  [_cube(5, 5, level) for level in range(1, 6)]),
+    'traffic': tuple([_cube(level, 5, 0) for level in range(6)] +
+                     [_cube(5, level, 0) for level in range(4, -1, -1)]),
+    'cool': tuple(_cube(level, 5 - level, 5) for level in range(6)),
+}
+
+
+def _interpolate(stops, steps):
+    """Returns `steps` RGB tuples evenly spaced along the RGB `stops`."""
+
+    if len(stops) == 1 or steps < 2:
+        return [stops[0]] * max(1, steps)
+    colors = []
+    for step in range(steps):
+        position = step * (len(stops) - 1) / (steps - 1)
+        index = min(int(position), len(stops) - 2)
+        fraction = position - index
+        low, high = stops[index], stops[index + 1]
+        colors.append(tuple(int(round(a + (b - a) * fraction))
+                            for a, b in zip(low, high)))
+    return colors
+
+
+class Heatmap(object):
+    """Renders 2-D numeric arrays as grids of colored cells.
+
+    Methods
+    -------
+    indexes(values)
+        Return the palette index of every value
+    lines(values)
+        Generate the colored grid one row at a time
+    render(values)
+        Return the colored grid as a single string
+    """
+
+    def __init__(self, colormap='heat', vmin=None, vmax=None,
+                 cell='{:>7.1f}', background=True, steps=24, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        colormap : str or list, optional
+            A name in PALETTES, a list of color names, or a list of RGB stops
+        vmin, vmax : float, optional
+            The value range mapped onto the palette.  Values outside it are
+            clipped.  By default the range of each rendered array is used.
+        cell : str, optional
+            The str.format template of a cell
+        background : bool, optional
+            Color the background of cells rather than their text
+        steps : int, optional
+            The number of colors interpolated between RGB stops
+        ansi : SwaANSI class or instance, optional
+            Decides whether color is enabled and the color depth
+        """
+
+        self.vmin = vmin
+        self.vmax = vmax
+        self.cell = cell
+        base = 48 if background else 38
+
+        if isinstance(colormap, six.string_types):
+            colormap = PALETTES[colormap]
+        colormap = list(colormap)
+        if colormap and all(isinstance(color, int) for color in colormap):
+            parameters = ['{};5;{}'.format(base, color) for color in colormap]
+        else:
+            depth = ansi._colorDepth()
+            rgbs = [_rgb(color) for color in colormap]
+            if colormap and None not in rgbs:
+                colormap = _interpolate(rgbs, steps)
+            parameters = []
+            for color in colormap:
+                parameter = ansi._colorParameter(color, base, depth)
+                if parameter is None:
+                    raise ValueError('Color {} is not available.'.format(
+                        color))
+                parameters.append(parameter)
+        if not parameters:
+            raise ValueError('A colormap needs at least one color.')
+
+        self.size = len(parameters)
+        if ansi._colorEnabled():
+            self._templates = ['\033[{}m{}\033[0m'.format(parameter, cell)
+                               for parameter in parameters]
+        else:
+            self._templates = [cell] * self.size
+        # cells that are not numbers (NaN) are not colored
+        self._templates.append(cell)
+
+    def _range(self, flat):
+        """Returns (vmin, vmax) for finite values in `flat`."""
+
+        vmin, vmax = self.vmin, self.vmax
+        if vmin is None or vmax is None:
+            finite = [value for value in flat
+                      if not (math.isnan(value) or math.isinf(value))]
+            if vmin is None:
+                vmin = min(finite) if finite else 0.0
+            if vmax is None:
+                vmax = max(finite) if finite else 0.0
+        return vmin, vmax
+
+    def indexes(self, values):
+        """Returns the palette index of every value of a 2-D array.
+
+        NaN maps to the index after the last color and is not colored.
+        Infinities map to the first or last color, and are left out of the
+        range found when vmin or vmax is not given.
+
+        Parameters
+        ----------
+        values : 2-D array or list of lists of numbers, mandatory
+            The values to map
+        """
+
+        top = self.size - 1
+        if numpy is not None:
+            array = numpy.asarray(values, dtype=float)
+            finite = array[numpy.isfinite(array)]
+            vmin = self.vmin if self.vmin is not None else (
+                finite.min() if finite.size else 0.0)
+            vmax = self.vmax if self.vmax is not None else (
+                finite.max() if finite.size else 0.0)
+            span = (vmax - vmin) or 1.0
+            with numpy.errstate(invalid='ignore'):
+                scaled = numpy.rint((array - vmin) * (top / span))
+                result = numpy.clip(scaled, 0, top)
+            result[array == numpy.inf] = top
+            result[array == -numpy.inf] = 0
+            result[numpy.isnan(array)] = self.size
+            return result.astype(int)
+
+        rows = [[float(value) for value in row] for row in values]
+        vmin, vmax = self._range([value for row in rows for value in row])
+        scale = top / ((vmax - vmin) or 1.0)
+        result = []
+        for row in rows:
+            indexes = []
+            for value in row:
+                if math.isnan(value):
+                    indexes.append(self.size)
+                elif math.isinf(value):
+                    indexes.append(top if value > 0 else 0)
+                else:
+                    indexes.append(min(top, max(0, int(round(
+                        (value - vmin) * scale)))))
+            result.append(indexes)
+        return result
+
+    def lines(self, values):
+        """Generates each row of `values` as a string of colored cells.
+
+        Parameters
+        ----------
+        values : 2-D array or list of lists of numbers, mandatory
+            The values to render
+        """
+
+        templates = self._templates
+        indexes = self.indexes(values)
+        # cells are formatted as floats on both paths
+        if numpy is not None:
+            indexes = indexes.tolist()
+            values = numpy.asarray(values, dtype=float).tolist()
+        else:
+            values = [[float(value) for value in row] for row in values]
+        for row, row_indexes in zip(values, indexes):
+            yield ''.join([templates[index].format(value)
+                           for index, value in zip(row_indexes, row)])
+
+    def render(self, values):
+        """Returns the colored grid of `values`, one line per row.
+
+        Parameters
+        ----------
+        values : 2-D array or list of lists of numbers, mandatory
+            The values to render
+        """
+
+        return '\n'.join(self.lines(values))
@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Streaming highlighters for JSON and unified diffs
+
+A highlighter reads a text file in chunks and generates the colored text as
+it goes, so payloads of any size are highlighted in the memory of a chunk
+and of the longest token.  Each chunk is colored with one regular expression
+substitution, with the escape prefix of every token class resolved once when
+the highlighter is built.
+
+    import sys
+    from swajime.highlight import DiffHighlighter, JSONHighlighter
+    with open('response.json') as response:
+        JSONHighlighter().write(response, sys.stdout)
+
+    diff = subprocess.Popen(['git', 'diff'], stdout=subprocess.PIPE,
+                            universal_newlines=True)
+    for text in DiffHighlighter().chunks(diff.stdout):
+        sys.stdout.write(text)
+
+Token classes are styled with specs, as in SwaANSI.wrapEach: None for the
+SwaANSI defaults, a color name, a tuple of (foreground, background,
+*style_list), a SwaANSI instance, or a Style.  A class mapped to False is
+left plain.  The JSON highlighter colors any text, valid JSON or not, and
+leaves it unchanged apart from the escapes.  A string without its closing
+quote runs to the end of the text, which is left plain.
+"""
+
+import re
+import sys
+
+from .SwaANSI import SwaANSI
+
+# Number of characters read at a time
+CHUNK_SIZE = 1 << 16
+
+JSON_STYLES = {'key': ('Blue', None, 'Bold'),
+               'string': 'Green',
+               'number': 'Aqua',
+               'literal': 'Fuchsia',
+               'punctuation': False}
+
+DIFF_STYLES = {'header': (None, None, 'Bold'),
+               'hunk': 'Aqua',
+               'added': 'Green',
+               'removed': 'Red'}
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_NUMBER = r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?'
+# the part of a string up to its closing quote, or a backslash cut off at
+# the end of a chunk
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
+_DIFF_LINES = [
+    ('header', r'^(?:diff|index|---|\+\+\+) .*'),
+    ('hunk', r'^@@.*'),
+    ('added', r'^\+.*'),
+    ('removed', r'^-.*')]
+
+
+def _wrapper(ansi, spec):
+    """Returns the (prefix, suffix) of a token class, empty if plain."""
+
+    if spec is False:
+        return '', ''
+    prefix = ansi._specPrefix(spec)
+    return prefix, '\033[0m' if prefix else ''
+
+
+class _Highlighter(object):
+    """Colors the token classes of a text a chunk at a time."""
+
+    def __init__(self, pattern, styles, flags=0, ansi=SwaANSI):
+        self._ansi = ansi
+        self.styles = styles
+        self.regex = re.compile(pattern, flags)
+        # group number -> (prefix, suffix)
+        self._wrappers = dict(
+            (number, _wrapper(ansi, styles.get(name, False)))
+            for name, number in self.regex.groupindex.items())
+
+    def _replace(self, match):
+        prefix, suffix = self._wrappers[match.lastindex]
+        return prefix + match.group() + suffix
+
+    def _split(self, text, final):
+        """Returns the colored part of `text` that is complete, and the rest
+            to be completed by the next chunk."""
+
+        raise NotImplementedError
+
+    def _pending(self, rest):
+        """Returns the scan state of a `rest` no chunk can complete without
+            a given character, or None if the next chunk could complete it."""
+
+        return None
+
+    def _resume(self, state, chunk):
+        """Returns the scan state after `chunk` is added to a pending rest,
+            or None once `chunk` could complete it."""
+
+        return None
+
+    def highlight(self, text):
+        """Returns `text` colored.
+
+        Parameters
+        ----------
+        text : str, mandatory
+            The whole text
+        """
+
+        if not text or not self._ansi._colorEnabled():
+            return text
+        return self._split(text, True)[0]
+
+    def _chunks(self, infile, chunk_size, enabled):
+        read = infile.read
+        if not enabled:
+            chunk = read(chunk_size)
+            while chunk:
+                yield chunk
+                chunk = read(chunk_size)
+            return
+
+        # while the rest is pending, such as a string left open, only the
+        # chunks read are scanned, and the rest is split once it can end
+        rest = ''
+        pieces = []
+        state = None
+        chunk = read(chunk_size)
+        while chunk:
+            if state is None:
+                text = rest + chunk
+            else:
+                pieces.append(chunk)
+                state = self._resume(state, chunk)
+                if state is not None:
+                    chunk = read(chunk_size)
+                    continue
+                text = ''.join(pieces)
+                pieces = []
+            colored, rest = self._split(text, False)
+            if colored:
+                yield colored
+            state = self._pending(rest)
+            if state is not None:
+                pieces.append(rest)
+            chunk = read(chunk_size)
+        if pieces:
+            rest = ''.join(pieces)
+        if rest:
+            yield self._split(rest, True)[0]
+
+    def chunks(self, infile, chunk_size=CHUNK_SIZE):
+        """Generates the colored text of `infile` as it is read.
+
+        Parameters
+        ----------
+        infile : file, mandatory
+            Text file object to read from
+        chunk_size : int, optional
+            Number of characters read at a time
+        """
+
+        return self._chunks(infile, chunk_size, self._ansi._colorEnabled())
+
+    def write(self, infile, outfile=None, chunk_size=CHUNK_SIZE):
+        """Writes the colored text of `infile` to `outfile`, a chunk at a
+            time.
+
+        Parameters
+        ----------
+        infile : file, mandatory
+            Text file object to read from
+        outfile : file, optional
+            Text file object to write to, sys.stdout by default.  Its
+            capabilities decide WHEN 'auto'.
+        chunk_size : int, optional
+            Number of characters read at a time
+        """
+
+        if outfile is None:
+            outfile = sys.stdout
+        write = outfile.write
+        for text in self._chunks(infile, chunk_size,
+                                 self._ansi._colorEnabled(outfile)):
+            write(text)
+
+
+class JSONHighlighter(_Highlighter):
+    """Colors the keys, strings, numbers, literals and punctuation of JSON.
+
+    Methods
+    -------
+    highlight(text)
+        Return text colored
+    chunks(infile, chunk_size=CHUNK_SIZE)
+        Generate the colored text of a file as it is read
+    write(infile, outfile=sys.stdout, chunk_size=CHUNK_SIZE)
+        Write the colored text of a file to another
+    """
+
+    def __init__(self, styles=None, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        styles : dict, optional
+            A spec for 'key', 'string', 'number', 'literal' and
+            'punctuation', updating JSON_STYLES
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs and decides whether color is enabled
+        """
+
+        merged = dict(JSON_STYLES)
+        merged.update(styles or {})
+        # punctuation is only matched when it is colored, and the first
+        # character of a token is checked before trying each alternative
+        first = '-"\\w'
+        punctuation = ''
+        if merged.get('punctuation', False) is not False:
+            first += r'{}\[\],:'
+            punctuation = r'|(?P<punctuation>[{}\[\],:])'
+        # a quote that does not start a string matches as 'open', the
+        # start of a string the next chunk may close
+        pattern = (r'(?=[{}])(?:(?P<string>{})(?:(?=\s*:)(?P<key>))?'
+                   r'|(?P<number>{})|(?P<literal>\b(?:true|false|null)\b)'
+                   r'{}|(?P<open>"))').format(first, _STRING, _NUMBER,
+                                              punctuation)
+        super(JSONHighlighter, self).__init__(pattern, merged, re.DOTALL,
+                                              ansi)
+        self._string = self.regex.groupindex['string']
+        self._open = self.regex.groupindex['open']
+
+    def _split(self, text, final):
+        # the scan stops at a string left open, whose quotes may all be
+        # escaped ones, and the rest of the text is in the string
+        wrappers = self._wrappers
+        open_quote = self._open
+        parts = []
+        append = parts.append
+        position = 0
+        match = opened = None
+        for token in self.regex.finditer(text):
+            index = token.lastindex
+            if index == open_quote:
+                opened = token.start()
+                break
+            prefix, suffix = wrappers[index]
+            start, end = token.span()
+            append(text[position:start])
+            append(prefix)
+            append(text[start:end])
+            append(suffix)
+            position = end
+            match = token
+        if final:
+            append(text[position:])
+            return ''.join(parts), ''
+
+        length = len(text)
+        if opened is not None:
+            cut = opened
+        else:
+            cut = length
+            while cut > position and (text[cut - 1].isalnum() or
+                                      text[cut - 1] in '-+._'):
+                cut -= 1
+        if match is not None and (cut == position or (
+                cut == length and match.lastindex == self._string and
+                not text[position:].strip())):
+            # the last token could be extended, or turn out to be a key
+            del parts[-3:]
+            return ''.join(parts), text[match.start():]
+        # what follows the cut is left plain
+        append(text[position:cut])
+        return ''.join(parts), text[cut:]
+
+    def _pending(self, rest):
+        # a string left open, and whether it ends in a backslash
+        if not rest.startswith('"'):
+            return None
+        end = _STRING_BODY.match(rest, 1).end()
+        if end == len(rest):
+            return False
+        if end == len(rest) - 1 and rest[end] == '\\':
+            return True
+        return None
+
+    def _resume(self, escaped, chunk):
+        end = _STRING_BODY.match(chunk, 1 if escaped else 0).end()
+        if end == len(chunk):
+            return False
+        if chunk[end] == '"':
+            return None
+        return True
+
+
+class DiffHighlighter(_Highlighter):
+    """Colors the headers, hunk lines, additions and removals of unified
+    diffs.
+
+    Methods
+    -------
+    highlight(text)
+        Return text colored
+    chunks(infile, chunk_size=CHUNK_SIZE)
+        Generate the colored text of a file as it is read
+    write(infile, outfile=sys.stdout, chunk_size=CHUNK_SIZE)
+        Write the colored text of a file to another
+    """
+
+    def __init__(self, styles=None, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        styles : dict, optional
+            A spec for 'header', 'hunk', 'added' and 'removed' lines,
+            updating DIFF_STYLES
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs and decides whether color is enabled
+        """
+
+        merged = dict(DIFF_STYLES)
+        merged.update(styles or {})
+        pattern = '|'.join('(?P<{}>{})'.format(name, line)
+                           for name, line in _DIFF_LINES)
+        super(DiffHighlighter, self).__init__(pattern, merged, re.MULTILINE,
+                                              ansi)
+
+    def _split(self, text, final):
+        end = len(text) if final else text.rfind('\n') + 1
+        return self.regex.sub(self._replace, text[:end]), text[end:]
+
+    def _pending(self, rest):
+        # a line is only complete with its newline
+        return True if rest else None
+
+    def _resume(self, state, chunk):
+        return None if '\n' in chunk else state
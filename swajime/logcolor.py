@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Colored logging
+
+ColorFormatter colors fields of a log format by the level of the record and
+by the name of its logger.  The escape sequences are compiled into a copy of
+the format once per level and logger, so formatting a record costs the same
+as with logging.Formatter.  Records only get the attributes
+logging.Formatter sets, so other handlers of the same record still see plain
+level names and messages.
+
+    import logging
+    from swajime.logcolor import ColorHandler
+    handler = ColorHandler()            # sys.stderr
+    logging.getLogger().addHandler(handler)
+
+Whether to color is decided per handler, by the WHEN of SwaANSI and the
+capabilities of the stream of that handler, so two ColorHandlers sharing a
+ColorFormatter, one on a terminal and one on a pipe, write colored and plain
+lines respectively.  Other handlers using a ColorFormatter color when the
+stream given to the formatter allows it.
+
+To color off the threads that log, put a plain QueueHandler on the loggers and
+the ColorHandler on the QueueListener:
+
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+    records = queue.Queue(-1)
+    logging.getLogger().addHandler(QueueHandler(records))
+    listener = QueueListener(records, ColorHandler())
+    listener.start()
+"""
+
+import logging
+import re
+
+import six
+
+from .SwaANSI import SwaANSI
+
+# The spec of each level.  Levels without a spec take that of the closest
+# lower level.
+LEVEL_STYLES = {logging.DEBUG: 'Grey50',
+                logging.INFO: 'Green',
+                logging.WARNING: 'Yellow',
+                logging.ERROR: 'Red',
+                logging.CRITICAL: ('White', 'Red', 'Bold')}
+
+# the fields of the format, for each format style
+_FIELD = {'%': r'%\({}\)[#0+ -]*(?:\*|\d+)?(?:\.(?:\*|\d+))?'
+               r'[diouxXeEfFgGcrsa]',
+          '{': r'\{{{}(?:[.\[!:][^{{}}]*)?\}}',
+          '$': r'\$(?:\{{{0}\}}|{0}\b)'}
+_DEFAULT_FORMAT = {'%': '%(levelname)s:%(name)s:%(message)s',
+                   '{': '{levelname}:{name}:{message}',
+                   '$': '${levelname}:${name}:${message}'}
+
+
+def _prefix(ansi, spec, depth):
+    """Returns the escape prefix of a spec at a color depth, '' for None."""
+
+    if spec is None:
+        return ''
+    fg_string, bg_string, style_codes = ansi._specAttributes(spec, depth)
+    codes = [code for code in (fg_string, bg_string) if code] + \
+        list(style_codes)
+    return '\033[{}m'.format(';'.join(codes)) if codes else ''
+
+
+class ColorFormatter(logging.Formatter):
+    """A logging.Formatter coloring fields by level and by logger name.
+
+    Methods
+    -------
+    format(record)
+        Return the colored text of a record
+    formatColor(record, depth)
+        Return the text of a record, colored for a color depth
+    """
+
+    def __init__(self, fmt=None, datefmt=None, style='%', levels=None,
+                 names=None, fields=('levelname',), stream=None,
+                 ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        fmt : str, optional
+            The format, '%(levelname)s:%(name)s:%(message)s' in the chosen
+            style by default
+        datefmt : str, optional
+            The format of asctime, as for logging.Formatter
+        style : str, optional
+            '%', '{' or '$', as for logging.Formatter.  Python 2 only has '%'.
+        levels : dict, optional
+            A spec per level, as an int or a level name, LEVEL_STYLES by
+            default.  Unknown level names raise ValueError.
+        names : dict, optional
+            A spec per logger name, coloring the name field.  A name also
+            applies to the loggers below it: 'app' colors 'app.db'.
+        fields : iterable(str), optional
+            The fields colored with the spec of the level
+        stream : file, optional
+            The stream whose capabilities decide WHEN 'auto' for format(),
+            sys.stdout by default.  A ColorHandler judges by its own stream.
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs
+        """
+
+        if style not in _FIELD:
+            raise ValueError('Style must be one of: {}'.format(
+                ', '.join(sorted(_FIELD))))
+        if fmt is None:
+            fmt = _DEFAULT_FORMAT[style]
+        if style == '%':
+            super(ColorFormatter, self).__init__(fmt, datefmt)
+        else:
+            super(ColorFormatter, self).__init__(fmt, datefmt, style)
+        self.fmt = fmt
+        self.style = style
+        self._ansi = ansi
+
+        levels = LEVEL_STYLES if levels is None else levels
+        self._levels = []
+        for level, spec in levels.items():
+            if isinstance(level, six.string_types):
+                levelno = logging.getLevelName(level)
+                # an unknown name comes back as the string 'Level <name>'
+                if not isinstance(levelno, six.integer_types):
+                    raise ValueError('Unknown level name: {}'.format(level))
+                level = levelno
+            self._levels.append((level, spec))
+        self._levels.sort(key=lambda item: item[0])
+        self._names = dict(names or {})
+        self._fields = [re.compile(_FIELD[style].format(re.escape(field)))
+                        for field in fields]
+        self._name_field = re.compile(_FIELD[style].format('name'))
+
+        self._depth = ansi._colorDepth(stream) \
+            if ansi._colorEnabled(stream) else None
+        # (depth, levelno, logger name) -> function formatting the message
+        self._formatters = {}
+
+    def _levelSpec(self, levelno):
+        spec = None
+        for level, level_spec in self._levels:
+            if level > levelno:
+                break
+            spec = level_spec
+        return spec
+
+    def _nameMatch(self, name):
+        """Returns the entry of `names` that logger `name` falls under, or
+            None."""
+
+        while name:
+            if name in self._names:
+                return name
+            name = name.rpartition('.')[0]
+        return None
+
+    def _compile(self, depth, levelno, name):
+        """Returns the function formatting the message of a record of level
+            `levelno` from loggers under entry `name` of `names`, colored for
+            `depth`."""
+
+        fmt = self.fmt
+        if depth is not None:
+            level_prefix = _prefix(self._ansi, self._levelSpec(levelno),
+                                   depth)
+            name_prefix = _prefix(self._ansi, self._names.get(name), depth)
+
+            def colored(prefix):
+                return lambda match: prefix + match.group() + '\033[0m'
+            if name_prefix:
+                fmt = self._name_field.sub(colored(name_prefix), fmt)
+            if level_prefix:
+                for field in self._fields:
+                    fmt = field.sub(colored(level_prefix), fmt)
+
+        if self.style == '%':
+            def formatMessage(record):
+                return fmt % record.__dict__
+        else:
+            formatMessage = logging.Formatter(fmt, style=self.style) \
+                .formatMessage
+        self._formatters[depth, levelno, name] = formatMessage
+        return formatMessage
+
+    def formatColor(self, record, depth):
+        """Returns the text of `record`, colored for `depth`.
+
+        Parameters
+        ----------
+        record : logging.LogRecord, mandatory
+            The record to format.  Only the attributes logging.Formatter sets
+            are set.
+        depth : int, mandatory
+            A color depth of the terminal module, None for plain text
+        """
+
+        record.message = record.getMessage()
+        if self.usesTime():
+            record.asctime = self.formatTime(record, self.datefmt)
+        # one formatter per entry of names rather than per logger
+        name = self._nameMatch(record.name) if self._names else None
+        try:
+            formatMessage = self._formatters[depth, record.levelno, name]
+        except KeyError:
+            formatMessage = self._compile(depth, record.levelno, name)
+        text = formatMessage(record)
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if text[-1:] != '\n':
+                text += '\n'
+            text += record.exc_text
+        if getattr(record, 'stack_info', None):
+            if text[-1:] != '\n':
+                text += '\n'
+            text += self.formatStack(record.stack_info)
+        return text
+
+    def format(self, record):
+        """Returns the text of `record`, colored if the stream given to the
+            formatter allows it.
+
+        Parameters
+        ----------
+        record : logging.LogRecord, mandatory
+            The record to format
+        """
+
+        return self.formatColor(record, self._depth)
+
+
+class ColorHandler(logging.StreamHandler):
+    """A logging.StreamHandler coloring when its own stream allows it.
+
+    Records are formatted by a ColorFormatter, a default one unless
+    setFormatter gives another.  Other formatters are used as they are.
+    """
+
+    def __init__(self, stream=None, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        stream : file, optional
+            Text stream to write to, sys.stderr by default
+        ansi : SwaANSI class or instance, optional
+            Its WHEN decides whether to color, with 'auto' judged by the
+            capabilities of `stream`
+        """
+
+        super(ColorHandler, self).__init__(stream)
+        self._ansi = ansi
+        self._probe()
+        self.setFormatter(ColorFormatter(ansi=ansi))
+
+    def _probe(self):
+        ansi = self._ansi
+        self._depth = ansi._colorDepth(self.stream) \
+            if ansi._colorEnabled(self.stream) else None
+
+    def setStream(self, stream):
+        """Sets the stream and decides again whether to color."""
+
+        old = super(ColorHandler, self).setStream(stream)
+        self._probe()
+        return old
+
+    def format(self, record):
+        formatter = self.formatter
+        if isinstance(formatter, ColorFormatter):
+            return formatter.formatColor(record, self._depth)
+        return super(ColorHandler, self).format(record)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+r"""Inline style markup
+
+Markup marks spans of a str.format template with tags naming colors and
+styles.  A template is compiled once into a plain str.format template with
+the escape sequences in place, so rendering it costs the same as str.format.
+
+    from swajime import markup
+    print(markup.render('[Red on Yellow bold]{}[/] is {:.1f}% full', 'disk',
+                        97.5))
+
+    # compile once, format many times
+    line = markup.template('[Grey50]{time}[/] [bold]{host}[/] {message}')
+    print(line.format(time='12:00:01', host='web1', message='started'))
+
+A tag holds a foreground color, 'on' followed by a background color, and style
+names, in any order, with colors as in SwaANSI.wrap.  Tags nest: an inner tag
+adds to the colors and styles of the outer ones, and [/] returns to them.
+
+    [bold]one [Red]two[/] three[/]
+
+\[ is a literal '['.  A bracket whose contents are not all color and style
+names, such as [INFO], is kept as it is, as is a [/] without an open tag.
+When SwaANSI.setWHEN disables color, the tags are removed instead.
+"""
+
+import re
+
+from .SwaANSI import SwaANSI
+from .style import Style
+
+# Number of compiled templates kept before the cache is emptied
+CACHE_SIZE = 1024
+
+# an escaped bracket, or a tag with its closing slash and its contents
+_TOKEN = re.compile(r'\\\[|\[(/?)([^\[\]]*)\]')
+# the longest style names have this many words
+_STYLE_WORDS = 3
+
+# (ansi, text, color enabled, depth) -> compiled template
+_cache = {}
+
+
+def _parseTag(contents, ansi):
+    """Returns the Style named by the contents of a tag, or None if they are
+    not all color and style names."""
+
+    words = contents.split()
+    if not words:
+        return None
+    foreground = background = None
+    styles = []
+    index = 0
+    while index < len(words):
+        for count in range(min(_STYLE_WORDS, len(words) - index), 0, -1):
+            name = ' '.join(words[index:index + count]).lower()
+            if name in ansi._styles:
+                styles.append(name)
+                index += count
+                break
+        else:
+            word = words[index]
+            if word.lower() == 'on' and index + 1 < len(words) and \
+                    background is None and ansi._validColor(words[index + 1]):
+                background = words[index + 1]
+                index += 2
+            elif foreground is None and ansi._validColor(word):
+                foreground = word
+                index += 1
+            else:
+                return None
+    return Style(foreground, background, *styles)
+
+
+def _compile(text, ansi, enabled, depth):
+    """Returns the str.format template for markup `text`."""
+
+    pieces = []
+    stack = [Style()]
+    position = 0
+    for match in _TOKEN.finditer(text):
+        pieces.append(text[position:match.start()])
+        position = match.end()
+        if match.group() == '\\[':
+            pieces.append('[')
+        elif match.group(1):
+            if len(stack) == 1:
+                pieces.append(match.group())
+                continue
+            stack.pop()
+            if enabled:
+                # styles are only switched off reliably by a reset
+                pieces.append('\033[0m' + stack[-1].prefix(depth))
+        else:
+            style = _parseTag(match.group(2), ansi)
+            if style is None:
+                pieces.append(match.group())
+                continue
+            stack.append(stack[-1] + style)
+            if enabled:
+                pieces.append(stack[-1].prefix(depth))
+    pieces.append(text[position:])
+    if enabled and len(stack) > 1:
+        pieces.append('\033[0m')
+    return ''.join(pieces)
+
+
+def template(text, ansi=SwaANSI):
+    """Returns the str.format template compiled from markup `text`.
+
+    Templates are cached, so compiling the same text again is a dictionary
+    lookup.  The template honors setWHEN at the time it is returned.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The markup, a str.format template with tags
+    ansi : SwaANSI class or instance, optional
+        Decides whether color is enabled and the color depth
+    """
+
+    enabled = ansi._colorEnabled()
+    depth = ansi._colorDepth() if enabled else None
+    key = (ansi, text, enabled, depth)
+    try:
+        return _cache[key]
+    except KeyError:
+        pass
+    if len(_cache) >= CACHE_SIZE:
+        _cache.clear()
+    compiled = _cache[key] = _compile(text, ansi, enabled, depth)
+    return compiled
+
+
+def render(text, *args, **kwargs):
+    """Returns markup `text` compiled and formatted with the arguments.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The markup, a str.format template with tags
+    args, kwargs : optional
+        The values of the replacement fields
+    """
+
+    return template(text).format(*args, **kwargs)
+
+
+def strip(text):
+    """Returns the str.format template of markup `text` without any escape
+    sequences, whatever setWHEN is.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The markup, a str.format template with tags
+    """
+
+    return _compile(text, SwaANSI, False, None)
+
+
+def clearCache():
+    """Empties the cache of compiled templates."""
+
+    _cache.clear()
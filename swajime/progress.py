@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Rate limited progress and status lines
+
+Updating a Progress is setting an attribute, so it costs nothing next to the
+work being measured.  The line is drawn at most `rate` times a second, by a
+timer thread or when refresh() is called, with escape prefixes compiled
+once.  On a terminal the line is redrawn in place; anywhere else, or when
+SwaANSI.setWHEN disables color, a plain line is logged every `interval`
+seconds instead.
+
+    from swajime.progress import Progress
+    with Progress(len(items), 'import') as progress:
+        for item in items:
+            process(item)
+            progress.count += 1
+            progress.status = item.name
+"""
+
+import sys
+import threading
+import time
+
+from . import terminal
+from .SwaANSI import SwaANSI
+from .text import truncate
+
+# Most redraws per second of a line on a terminal
+RATE = 10
+# Seconds between plain lines when the stream is not a terminal
+LOG_INTERVAL = 10
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def _duration(seconds):
+    """Returns seconds as [h:]mm:ss."""
+
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return '{}:{:02d}:{:02d}'.format(hours, minutes, seconds)
+    return '{:02d}:{:02d}'.format(minutes, seconds)
+
+
+class Progress(object):
+    """A status line showing the progress of a job.
+
+    Attributes
+    ----------
+    count : int
+        Items done so far, set or incremented by the job
+    total : int
+        Items to do, or None if unknown
+    status : str
+        Text shown at the end of the line
+
+    Methods
+    -------
+    start()
+        Start the timer thread drawing the line
+    line()
+        Return the text of the line
+    refresh(force=False)
+        Draw the line if it is due
+    close()
+        Stop the timer and draw the final line
+    """
+
+    def __init__(self, total=None, label='', stream=None, rate=RATE,
+                 interval=LOG_INTERVAL, bar_width=30, width=None,
+                 label_style=(None, None, 'Bold'), bar_style='Green',
+                 status_style='Grey50', timer=True, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        total : int, optional
+            Number of items to do, None if unknown
+        label : str, optional
+            Text shown first on the line
+        stream : file, optional
+            Text stream to write to, sys.stderr by default
+        rate : float, optional
+            Most redraws per second on a terminal
+        interval : float, optional
+            Seconds between plain lines when not drawing in place
+        bar_width : int, optional
+            Columns of the bar shown when total is known, 0 for none
+        width : int, optional
+            Columns the line is cut to, the terminal width by default
+        label_style, bar_style, status_style : spec, optional
+            A color name, a tuple of (foreground, background, *style_list),
+            a SwaANSI instance or a Style, None to leave the part plain
+        timer : bool, optional
+            Whether entering a with block starts the timer thread
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs.  Its WHEN, judged by `stream`, and whether
+            `stream` is a terminal decide between drawing in place and
+            logging plain lines.
+        """
+
+        self.count = 0
+        self.total = total
+        self.status = ''
+        self.label = label
+        self.stream = sys.stderr if stream is None else stream
+        self.bar_width = bar_width if total else 0
+        self.timer = timer
+
+        self._live = ansi._colorEnabled(self.stream) and \
+            terminal.probe(self.stream).isatty
+        self._period = 1.0 / rate if self._live else interval
+        if width is None:
+            width = self._terminalWidth() if self._live else 0
+        self.width = width
+
+        def template(spec):
+            prefix = ansi._specPrefix(spec) \
+                if self._live and spec is not None else ''
+            return prefix + '{}\033[0m' if prefix else '{}'
+
+        # compiled once, formatted on every draw
+        self._label = template(label_style).format(label) if label else ''
+        self._bar = template(bar_style)
+        self._status = template(status_style)
+
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._started = _clock()
+        self._last = None
+
+    def __enter__(self):
+        if self.timer:
+            self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _terminalWidth(self):
+        try:
+            import shutil
+            return shutil.get_terminal_size().columns - 1
+        except (AttributeError, ValueError, OSError):
+            return 79
+
+    def line(self):
+        """Returns the text of the line for the current count and status."""
+
+        count = self.count
+        total = self.total
+        elapsed = max(_clock() - self._started, 1e-9)
+        per_second = count / elapsed
+        parts = [self._label] if self._label else []
+        if total:
+            fraction = min(1.0, float(count) / total)
+            if self.bar_width:
+                filled = int(self.bar_width * fraction)
+                parts.append('[' + (self._bar.format('#' * filled)
+                                    if filled else '') +
+                             '-' * (self.bar_width - filled) + ']')
+            parts.append('{}/{} {:5.1f}%'.format(count, total,
+                                                 fraction * 100))
+        else:
+            parts.append(str(count))
+        parts.append('{:.1f}/s'.format(per_second))
+        if total and 0 < count < total:
+            parts.append('ETA ' + _duration((total - count) / per_second))
+        else:
+            parts.append(_duration(elapsed))
+        if self.status:
+            parts.append(self._status.format(self.status))
+        line = ' '.join(parts)
+        return truncate(line, self.width) if self.width else line
+
+    def refresh(self, force=False):
+        """Draws the line if the previous one is older than the period.
+            Returns whether it drew.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Draw whatever the time
+        """
+
+        now = _clock()
+        if not force and self._last is not None and \
+                now - self._last < self._period:
+            return False
+        with self._lock:
+            self._last = now
+            self._write(self.line())
+        return True
+
+    def _write(self, line):
+        if self._live:
+            # back to the start of the line, then clear what is left of it
+            self.stream.write('\r' + line + '\033[K')
+        else:
+            self.stream.write(line + '\n')
+        self.stream.flush()
+
+    def _run(self):
+        while not self._stopped.wait(self._period):
+            self.refresh(force=True)
+
+    def start(self):
+        """Starts a daemon thread drawing the line every period."""
+
+        if self._thread is None:
+            self._started = _clock()
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def close(self):
+        """Stops the timer thread and draws the final line, once."""
+
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.refresh(force=True)
+        if self._live:
+            self.stream.write('\n')
+            self.stream.flush()
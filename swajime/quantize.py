@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Nearest xterm color lookup for RGB values
+
+A Quantizer is built from the color table (the rgb of every colorId) and
+precomputes 3-D lookup tables, so mapping an RGB value to the nearest 256 or
+16 color index is a couple of shifts and one index instead of a distance scan.
+
+    from swajime import SwaANSI
+    quantizer = SwaANSI.quantizer()
+    quantizer.nearest256(255, 128, 0)        # 208, DarkOrange
+    quantizer.quantizeMany([(255, 128, 0), (10, 10, 10)], 16)
+
+Colors 16 to 231 of the xterm palette form a 6x6x6 cube and 232 to 255 are
+grays, so the nearest cube color is found one channel at a time and the
+nearest gray from the mean of the channels.  Tables are indexed by the top
+RGB_BITS (for 256 colors) or RGB_BITS_16 bits of each channel.
+"""
+
+from bisect import bisect_left
+
+# bits of each channel used to index the lookup tables
+RGB_BITS = 5
+RGB_BITS_16 = 4
+
+
+def parseHex(value):
+    """Returns the (r, g, b) tuple of a '#rrggbb' or '#rgb' string, or None
+    if it is not one."""
+
+    digits = value[1:] if value.startswith('#') else None
+    if digits is None or len(digits) not in (3, 6):
+        return None
+    if len(digits) == 3:
+        digits = ''.join(digit * 2 for digit in digits)
+    try:
+        return (int(digits[0:2], 16), int(digits[2:4], 16),
+                int(digits[4:6], 16))
+    except ValueError:
+        return None
+
+
+def _nearest_brute(palette, r, g, b):
+    """Returns the colorId in `palette` closest to (r, g, b)."""
+
+    best = None
+    best_distance = 1 << 20
+    for color, (red, green, blue) in palette:
+        distance = (red - r) ** 2 + (green - g) ** 2 + (blue - b) ** 2
+        if distance < best_distance:
+            best, best_distance = color, distance
+    return best
+
+
+def _cell_candidates(palette, lut, bits, unknown):
+    """Returns a dict of the colors that can be nearest to some value in each
+    `unknown` cell of `lut`.
+
+    A color is a candidate unless it is further from every point of the cell
+    than another color is from the furthest point of the cell.
+    """
+
+    step = 1 << 8 - bits
+    mask = (1 << bits) - 1
+    # [channel][cell coordinate] -> squared distances of each palette entry
+    # to the nearest and to the furthest value of the cell along the channel
+    near = []
+    far = []
+    for channel in range(3):
+        near.append([])
+        far.append([])
+        for low in range(0, 256, step):
+            high = low + step - 1
+            values = [entry[1][channel] for entry in palette]
+            near[channel].append([(low - value) ** 2 if value < low else
+                                  (value - high) ** 2 if value > high else 0
+                                  for value in values])
+            far[channel].append([max(value - low, high - value) ** 2
+                                 for value in values])
+
+    candidates = {}
+    for cell, color in enumerate(lut):
+        if color != unknown:
+            continue
+        r, g, b = cell >> 2 * bits, cell >> bits & mask, cell & mask
+        bound = min(map(sum, zip(far[0][r], far[1][g], far[2][b])))
+        candidates[cell] = tuple(
+            entry for entry, nr, ng, nb in zip(palette, near[0][r],
+                                               near[1][g], near[2][b])
+            if nr + ng + nb <= bound)
+    return candidates
+
+
+def _nearest_level(levels, value):
+    """Returns the index of the level in sorted `levels` closest to value."""
+
+    index = bisect_left(levels, value)
+    if index == 0:
+        return 0
+    if index == len(levels):
+        return index - 1
+    return index if levels[index] - value < value - levels[index - 1] \
+        else index - 1
+
+
+class Quantizer(object):
+    """Maps RGB values to the nearest color of a 256 color table.
+
+    Methods
+    -------
+    nearest256(r, g, b)
+        Return the nearest colorId from 16 to 255
+    nearest16(r, g, b)
+        Return the nearest colorId from 0 to 15
+    quantizeMany(colors, depth=256)
+        Return the nearest colorId of each (r, g, b) in colors
+    """
+
+    def __init__(self, color_data):
+        """
+        Parameters
+        ----------
+        color_data : iterable, mandatory
+            Entries of (colorId, name, hexString, (r, g, b), (h, s, l)), as
+            in swajime._color_data.COLOR_DATA
+        """
+
+        rgbs = dict((color[0], tuple(color[3])) for color in color_data)
+        self._palette16 = [(index, rgbs[index]) for index in range(16)
+                           if index in rgbs]
+        self._palette256 = [(index, rgbs[index]) for index in range(16, 256)
+                            if index in rgbs]
+        if not self._setupXterm(rgbs):
+            self._exact256 = lambda r, g, b: _nearest_brute(self._palette256,
+                                                            r, g, b)
+        self.lut256 = self._buildLUT(self._exact256, RGB_BITS, 0)
+        self.lut16 = self._buildLUT(self._exact16, RGB_BITS_16, 255)
+        self._candidates16 = _cell_candidates(self._palette16, self.lut16,
+                                              RGB_BITS_16, 255)
+
+    def _setupXterm(self, rgbs):
+        """Precomputes per channel tables if colors 16 to 255 have the xterm
+        layout of a 6x6x6 cube followed by grays.  Returns whether they do.
+        """
+
+        cube = [rgbs.get(index) for index in range(16, 232)]
+        grays = [rgbs.get(index) for index in range(232, 256)]
+        if None in cube or None in grays:
+            return False
+        levels = sorted(set(rgb[0] for rgb in cube))
+        if len(levels) != 6 or any(
+                rgb != (levels[index // 36], levels[index // 6 % 6],
+                        levels[index % 6]) for index, rgb in enumerate(cube)) \
+                or any(not rgb[0] == rgb[1] == rgb[2] for rgb in grays):
+            return False
+
+        # value -> nearest cube level index and its squared error
+        self._cube_index = [_nearest_level(levels, value)
+                            for value in range(256)]
+        self._cube_error = [(levels[self._cube_index[value]] - value) ** 2
+                            for value in range(256)]
+        # r + g + b -> gray level nearest to the mean of the channels
+        gray_levels = [rgb[0] for rgb in grays]
+        self._gray_level = [gray_levels[_nearest_level(gray_levels, total / 3.0)]
+                            for total in range(766)]
+        self._gray_id = dict((level, 232 + index)
+                             for index, level in enumerate(gray_levels))
+        return True
+
+    def _exact256(self, r, g, b):
+        """Returns the colorId from 16 to 255 closest to (r, g, b)."""
+
+        cube_index = self._cube_index
+        cube_error = self._cube_error
+        level = self._gray_level[r + g + b]
+        if (level - r) ** 2 + (level - g) ** 2 + (level - b) ** 2 < \
+                cube_error[r] + cube_error[g] + cube_error[b]:
+            return self._gray_id[level]
+        return 16 + cube_index[r] * 36 + cube_index[g] * 6 + cube_index[b]
+
+    def _exact16(self, r, g, b):
+        """Returns the colorId from 0 to 15 closest to (r, g, b)."""
+
+        return _nearest_brute(self._palette16, r, g, b)
+
+    @staticmethod
+    def _buildLUT(exact, bits, unknown):
+        """Returns a bytearray lookup table with 2**bits cells per channel.
+
+        Nearest color regions are convex, so when the eight corners of a cell
+            share their nearest color so does every value inside it.  Other
+            cells hold `unknown` and are looked up with `exact`.
+        """
+
+        step = 1 << 8 - bits
+        corners = [min(255, cell * step) for cell in range((1 << bits) + 1)]
+        size = len(corners)
+        nearest = [exact(r, g, b)
+                   for r in corners for g in corners for b in corners]
+
+        # keep a corner's color only if the next corner along b, then g,
+        # then r has the same color, so each cell's first corner ends up
+        # holding the color shared by all eight corners, or -1
+        for offset in (1, size, size * size):
+            nearest = [color if color == following else -1 for color,
+                       following in zip(nearest, nearest[offset:])]
+
+        cells = range(1 << bits)
+        return bytearray(unknown if nearest[(r * size + g) * size + b] < 0
+                         else nearest[(r * size + g) * size + b]
+                         for r in cells for g in cells for b in cells)
+
+    def nearest256(self, r, g, b):
+        """Returns the colorId from 16 to 255 closest to (r, g, b)."""
+
+        shift = 8 - RGB_BITS
+        return self.lut256[(r >> shift) << 2 * RGB_BITS |
+                           (g >> shift) << RGB_BITS | b >> shift] or \
+            self._exact256(r, g, b)
+
+    def nearest16(self, r, g, b):
+        """Returns the colorId from 0 to 15 closest to (r, g, b)."""
+
+        shift = 8 - RGB_BITS_16
+        cell = (r >> shift) << 2 * RGB_BITS_16 | (g >> shift) << RGB_BITS_16 | \
+            b >> shift
+        color = self.lut16[cell]
+        return color if color != 255 else \
+            _nearest_brute(self._candidates16[cell], r, g, b)
+
+    def quantizeMany(self, colors, depth=256):
+        """Returns the list of the nearest colorId of each (r, g, b).
+
+        Parameters
+        ----------
+        colors : iterable((int, int, int)), mandatory
+            The RGB values to map
+        depth : int, optional
+            256 for colorIds 16 to 255, 16 for colorIds 0 to 15
+        """
+
+        if depth == 16:
+            # ambiguous cells are looked up again, so colors is read twice
+            if not isinstance(colors, (list, tuple)):
+                colors = list(colors)
+            nearest = self.nearest16
+            lut, bits = self.lut16, RGB_BITS_16
+            shift, g_shift, r_shift = 8 - bits, bits, 2 * bits
+            result = [lut[(r >> shift) << r_shift | (g >> shift) << g_shift |
+                          b >> shift] for r, g, b in colors]
+            if 255 in result:
+                for index, color in enumerate(result):
+                    if color == 255:
+                        result[index] = nearest(*colors[index])
+            return result
+
+        # unknown cells of lut256 hold 0, which is not in 16 to 255
+        exact = self._exact256
+        lut, bits = self.lut256, RGB_BITS
+        shift, g_shift, r_shift = 8 - bits, bits, 2 * bits
+        return [lut[(r >> shift) << r_shift | (g >> shift) << g_shift |
+                    b >> shift] or exact(r, g, b) for r, g, b in colors]
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Double buffered screen with damage tracking
+
+A Screen is a grid of cells, each a character and a style.  Drawing changes
+a back buffer; flush compares it with the front buffer, which holds what the
+terminal shows, and writes only cursor moves and the runs of cells that
+changed.  A screen that barely changes costs a few bytes per frame instead of
+a full redraw.
+
+    import time
+    from swajime.screen import Screen
+    screen = Screen(80, 24, fps=10)
+    ok = screen.style('Green')
+    error = screen.style(('Red', None, 'Bold'))
+    while True:
+        screen.put(0, 0, time.strftime('%H:%M:%S'))
+        screen.put(0, 2, 'web1 up  ', ok)
+        screen.put(0, 3, 'db1  DOWN', error)
+        screen.flush()
+        time.sleep(0.05)
+
+Characters are stored as code points in an array('I') and styles as small
+ints in an array('H'), so a 200x60 screen uses a few tens of kilobytes.
+Every character is taken to be one column wide.
+"""
+
+from array import array
+
+import six
+import sys
+import time
+
+from .SwaANSI import SwaANSI
+
+# Frames per second written by flush at most
+FPS = 30
+
+# unchanged cells between two changes that are rewritten rather than skipped
+# with a cursor move, which takes about as many bytes
+_GAP = 6
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class Screen(object):
+    """A grid of styled cells redrawn by difference.
+
+    Methods
+    -------
+    style(spec)
+        Return the small int standing for a spec
+    put(x, y, text, style=0)
+        Draw text from column x of row y
+    fill(char=' ', style=0)
+        Set every cell
+    render()
+        Return the escapes and text turning the front buffer into the back
+    flush(force=False)
+        Write the changes to the stream, at most FPS times a second
+    invalidate()
+        Redraw every cell on the next frame
+    """
+
+    def __init__(self, width, height, stream=None, fps=FPS, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        width : int, mandatory
+            Number of columns
+        height : int, mandatory
+            Number of rows
+        stream : file, optional
+            Text stream of the terminal, sys.stdout by default
+        fps : float, optional
+            Most frames written per second, 0 for no limit
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs.  Its WHEN decides whether styles are written,
+            with 'auto' judged by the capabilities of `stream`.
+        """
+
+        self.width = width
+        self.height = height
+        self.stream = sys.stdout if stream is None else stream
+        self.fps = fps
+        self._ansi = ansi
+        self._color = ansi._colorEnabled(self.stream)
+        self._last = None
+        # style of the terminal, -1 until the first frame sets it.  Without
+        # color every cell is plain and nothing is ever reset.
+        self._state = -1 if self._color else 0
+
+        cells = width * height
+        self._chars = array('I', [ord(' ')]) * cells
+        self._styles = array('H', [0]) * cells
+        self._front_chars = array('I', [0]) * cells
+        self._front_styles = array('H', [0]) * cells
+
+        # style 0 is plain.  Each style switches from any state with a reset.
+        self._sequences = ['\033[0m']
+        self._ids = {'': 0}
+        self._spec_ids = {}
+
+    def style(self, spec):
+        """Returns the int standing for `spec` in put and fill.
+
+        Specs with the same escape sequence share an int.
+
+        Parameters
+        ----------
+        spec : mandatory
+            A color name, a tuple of (foreground, background, *style_list),
+            a SwaANSI instance or a Style.  None is plain.
+        """
+
+        key = tuple(spec) if isinstance(spec, list) else spec
+        try:
+            return self._spec_ids[key]
+        except KeyError:
+            pass
+        prefix = self._ansi._specPrefix(spec) \
+            if spec is not None and self._color else ''
+        style_id = self._ids.get(prefix)
+        if style_id is None:
+            style_id = self._ids[prefix] = len(self._sequences)
+            if style_id > 0xffff:
+                raise ValueError('A Screen holds at most 65536 styles.')
+            # a reset first, so switching never inherits attributes
+            self._sequences.append('\033[0;' + prefix[2:])
+        self._spec_ids[key] = style_id
+        return style_id
+
+    def put(self, x, y, text, style=0):
+        """Draws `text` from column `x` of row `y`, clipped to the screen.
+
+        Parameters
+        ----------
+        x : int, mandatory
+            The first column, from 0
+        y : int, mandatory
+            The row, from 0
+        text : str, mandatory
+            The characters to draw, without newlines or escapes
+        style : int, optional
+            A value returned by style(), 0 for plain
+        """
+
+        if not 0 <= y < self.height or x >= self.width:
+            return
+        if x < 0:
+            text = text[-x:]
+            x = 0
+        text = text[:self.width - x]
+        if not text:
+            return
+        start = y * self.width + x
+        end = start + len(text)
+        self._chars[start:end] = array('I', [ord(char) for char in text])
+        self._styles[start:end] = array('H', [style]) * len(text)
+
+    def fill(self, char=' ', style=0):
+        """Sets every cell to `char` with `style`.
+
+        Parameters
+        ----------
+        char : str, optional
+            A single character
+        style : int, optional
+            A value returned by style(), 0 for plain
+        """
+
+        cells = self.width * self.height
+        self._chars[:] = array('I', [ord(char)]) * cells
+        self._styles[:] = array('H', [style]) * cells
+
+    def invalidate(self):
+        """Makes the next frame redraw every cell, as after the terminal was
+        cleared."""
+
+        cells = self.width * self.height
+        self._front_chars[:] = array('I', [0]) * cells
+        if self._color:
+            self._state = -1
+
+    def render(self):
+        """Returns the output that turns what the terminal shows into the
+        back buffer, and takes the back buffer as shown.
+
+        Only rows that differ are scanned.  Changes closer than a cursor move
+        are joined into one run.
+        """
+
+        width = self.width
+        chars, styles = self._chars, self._styles
+        front_chars, front_styles = self._front_chars, self._front_styles
+        sequences = self._sequences
+        unichr = six.unichr
+        output = []
+        current = self._state
+
+        for start in range(0, width * self.height, width):
+            end = start + width
+            if chars[start:end] == front_chars[start:end] and \
+                    styles[start:end] == front_styles[start:end]:
+                continue
+            changed = [index for index in range(start, end)
+                       if chars[index] != front_chars[index] or
+                       styles[index] != front_styles[index]]
+
+            run_start = previous = changed[0]
+            runs = []
+            for index in changed[1:]:
+                if index - previous > _GAP:
+                    runs.append((run_start, previous + 1))
+                    run_start = index
+                previous = index
+            runs.append((run_start, previous + 1))
+
+            row = start // width + 1
+            for run_start, run_end in runs:
+                output.append('\033[{};{}H'.format(row,
+                                                   run_start - start + 1))
+                for index in range(run_start, run_end):
+                    style = styles[index]
+                    if style != current:
+                        output.append(sequences[style])
+                        current = style
+                    output.append(unichr(chars[index]))
+
+        if current > 0:
+            output.append('\033[0m')
+        # every frame ends plain
+        if output:
+            self._state = 0
+        front_chars[:] = chars
+        front_styles[:] = styles
+        return ''.join(output)
+
+    def flush(self, force=False):
+        """Writes the changes since the last frame to the stream.
+
+        Returns False without writing if the previous frame was less than
+            1/fps seconds ago, keeping the changes for a later frame.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Write even if the frame rate would be exceeded
+        """
+
+        now = _clock()
+        if not force and self.fps and self._last is not None and \
+                now - self._last < 1.0 / self.fps:
+            return False
+        self._last = now
+        output = self.render()
+        if output:
+            self.stream.write(output)
+            self.stream.flush()
+        return True
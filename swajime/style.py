@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Immutable styles
+
+A Style is a frozen foreground, background and style list.  Styles compare
+and hash by value, so they can be used as dictionary keys and shared between
+threads and asyncio tasks without locking.  The escape prefix of a Style is
+compiled the first time it is needed at each color depth.
+
+    from swajime.style import Style, using
+    error = Style('Red', None, 'Bold')
+    banner = error + Style(background='Grey11')
+    print(error.wrap('disk full'))
+
+Styles can be given anywhere SwaANSI takes a spec, and as the foreground of
+SwaANSI.wrap.  using(style) replaces the class level defaults of SwaANSI for
+the current thread or asyncio task only:
+
+    with using(Style('Green')):
+        print(SwaANSI.wrap('ok'))     # green here, unchanged elsewhere
+"""
+
+from contextlib import contextmanager
+
+import six
+import threading
+
+from .quantize import parseHex
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma: no cover
+    ContextVar = None
+
+
+class _ThreadVar(object):
+    """The part of contextvars.ContextVar used here, scoped to threads, for
+    Python versions without contextvars."""
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self._default = default
+        self._local = threading.local()
+
+    def get(self):
+        return getattr(self._local, 'value', self._default)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+# Style replacing the class level defaults of SwaANSI in the current context
+_current = (ContextVar or _ThreadVar)('swajime_style', default=None)
+
+
+def _ansi():
+    """Returns the SwaANSI class, imported late since it imports Style."""
+
+    from .SwaANSI import SwaANSI
+    return SwaANSI
+
+
+def _color(color, ansi, kind):
+    """Returns a color in the canonical form of a Style, lower case names and
+    (r, g, b) tuples, or None if it is not available."""
+
+    if color is None:
+        return None
+    if not ansi._validColor(color):
+        ansi._reportInvalid(kind + ' color', color)
+        return None
+    if isinstance(color, six.string_types):
+        return parseHex(color) or color.lower()
+    return tuple(color)
+
+
+class Style(object):
+    """A frozen set of colors and attributes.
+
+    Attributes
+    ----------
+    foreground : str or (int, int, int)
+        The foreground color, or None
+    background : str or (int, int, int)
+        The background color, or None
+    styles : tuple(str)
+        The style names
+
+    Methods
+    -------
+    prefix(depth=None)
+        Return the escape prefix at a color depth
+    wrap(text)
+        Wrap text with the escape codes of the style
+    template(field='{}')
+        Return a str.format template wrapping field
+    """
+
+    __slots__ = ('foreground', 'background', 'styles', '_hash', '_prefixes')
+
+    def __init__(self, foreground=None, background=None, *style_list):
+        """
+        Parameters
+        ----------
+        foreground : str or (int, int, int), optional
+            A color name, '#rrggbb', '#rgb' or (r, g, b)
+        background : str or (int, int, int), optional
+            A color name, '#rrggbb', '#rgb' or (r, g, b)
+        style_list : list(str), optional
+            Names from SwaANSI.styles
+
+        Names that are not available are reported as set by
+            SwaANSI.setErrorPolicy and left out.
+        """
+
+        ansi = _ansi()
+        styles = []
+        for style in style_list:
+            if style is None:
+                continue
+            if style.lower() not in ansi._styles:
+                ansi._reportInvalid('Style', style)
+            elif style.lower() not in styles:
+                styles.append(style.lower())
+
+        init = super(Style, self).__setattr__
+        init('foreground', _color(foreground, ansi, 'Foreground'))
+        init('background', _color(background, ansi, 'Background'))
+        init('styles', tuple(styles))
+        init('_hash', hash((self.foreground, self.background, self.styles)))
+        # color depth -> escape prefix.  Concurrent first uses may both build
+        # the prefix, but they store the same string.
+        init('_prefixes', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Style objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Style objects are immutable')
+
+    def __reduce__(self):
+        return Style, (self.foreground, self.background) + self.styles
+
+    def __eq__(self, other):
+        if not isinstance(other, Style):
+            return NotImplemented
+        return (self.foreground, self.background, self.styles) == \
+            (other.foreground, other.background, other.styles)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return 'Style({})'.format(', '.join(
+            repr(value) for value in
+            (self.foreground, self.background) + self.styles))
+
+    def __add__(self, other):
+        """Returns a Style with the colors of `other` where it sets them and
+            the styles of both."""
+
+        if not isinstance(other, Style):
+            return NotImplemented
+        return Style(self.foreground if other.foreground is None
+                     else other.foreground,
+                     self.background if other.background is None
+                     else other.background,
+                     *(self.styles + other.styles))
+
+    __or__ = __add__
+
+    def prefix(self, depth=None):
+        """Returns the escape prefix of the style.
+
+        Parameters
+        ----------
+        depth : int, optional
+            The color depth used for RGB colors, that of SwaANSI by default
+        """
+
+        if depth is None:
+            depth = _ansi()._colorDepth()
+        try:
+            return self._prefixes[depth]
+        except KeyError:
+            prefix = self._prefixes[depth] = _ansi()._buildPrefix(
+                self.foreground, self.background, self.styles, depth)[0]
+            return prefix
+
+    def wrap(self, text):
+        """Wraps `text` with the escape codes of the style, honoring
+            SwaANSI.setWHEN.
+
+        Parameters
+        ----------
+        text : str, mandatory
+            The text that will be wrapped
+        """
+
+        ansi = _ansi()
+        if not text or not ansi._colorEnabled():
+            return text
+        prefix = self.prefix(ansi._colorDepth())
+        return prefix + text + '\033[0m' if prefix else text
+
+    def template(self, field='{}'):
+        """Returns a str.format template that wraps `field` with the style,
+            honoring SwaANSI.setWHEN at the time it is created.
+
+        Parameters
+        ----------
+        field : str, optional
+            The replacement field to be wrapped, '{}' by default.
+        """
+
+        ansi = _ansi()
+        if not ansi._colorEnabled():
+            return field
+        prefix = self.prefix(ansi._colorDepth())
+        return prefix + field + '\033[0m' if prefix else field
+
+
+def current():
+    """Returns the Style set by using() in the current context, or None."""
+
+    return _current.get()
+
+
+@contextmanager
+def using(style):
+    """Uses `style` instead of the class level defaults of SwaANSI in the
+    current thread or asyncio task until the block exits.
+
+    Parameters
+    ----------
+    style : Style, mandatory
+        The defaults to use, or None to use those of SwaANSI again
+    """
+
+    token = _current.set(style)
+    try:
+        yield style
+    finally:
+        _current.reset(token)
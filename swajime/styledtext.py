@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Styled text built from spans
+
+Wrapping text that holds a SwaANSI.wrap result loses the outer style after
+the inner one, since the inner reset ends both.  A StyledText keeps a list
+of (text, Style) spans instead, and writes the escape sequences once, when
+it is rendered: each change of style resets and applies the style of the
+next span, so the outer style is back after an inner one.
+
+    from swajime.styledtext import StyledText
+    line = StyledText()
+    with line.styled('Grey50'):
+        line.append('[')
+        line.append('web1', (None, None, 'Bold'))
+        line.append(']')
+    line.append(' disk ').append('97.5%', ('Red', None, 'Bold'))
+    print(line.render())
+    len(line)                           # 17
+    line[:6].plain()                    # '[web1]'
+
+Styles are given as in SwaANSI.wrapEach: a Style, a color name or RGB color,
+or a tuple of (foreground, background, *style_list).  None adds no style.
+A style applies on top of the ones pushed on the stack, as nested markup
+tags do.  Appending costs a list append whatever the nesting, and rendering
+a single join, where wrapping and concatenating again at every level costs
+a copy of the text so far each time.
+"""
+
+from contextlib import contextmanager
+
+from .SwaANSI import SwaANSI, _spec_arguments
+from .style import Style
+
+
+# Number of styles kept in each cache before it is emptied
+CACHE_SIZE = 1024
+
+# spec -> Style or None
+_styles = {}
+# (outer Style, inner Style) -> Style
+_combined = {}
+
+
+def _style(spec):
+    """Returns the Style of a spec, or None if it has no colors or styles."""
+
+    if spec is None:
+        return None
+    try:
+        return _styles[spec]
+    except (KeyError, TypeError):
+        pass
+    style = spec
+    if not isinstance(style, Style):
+        foreground, background, style_list = _spec_arguments(spec)
+        style = Style(foreground, background, *style_list)
+    if style.foreground is None and style.background is None and \
+            not style.styles:
+        style = None
+    try:
+        if len(_styles) >= CACHE_SIZE:
+            _styles.clear()
+        _styles[spec] = style
+    except TypeError:
+        # a list spec
+        pass
+    return style
+
+
+def _combine(outer, inner):
+    """Returns the Style of `inner` applied on top of `outer`."""
+
+    if outer is None:
+        return inner
+    if inner is None:
+        return outer
+    key = (outer, inner)
+    try:
+        return _combined[key]
+    except KeyError:
+        pass
+    if len(_combined) >= CACHE_SIZE:
+        _combined.clear()
+    style = _combined[key] = outer + inner
+    return style
+
+
+def clearCache():
+    """Empties the caches of styles."""
+
+    _styles.clear()
+    _combined.clear()
+
+
+class StyledText(object):
+    """Text made of spans, each with its own Style.
+
+    Methods
+    -------
+    append(text, style=None)
+        Add text in a style, on top of the pushed styles
+    extend(other)
+        Add the spans of another StyledText, on top of the pushed styles
+    push(style)
+        Apply a style to what is appended until the matching pop
+    pop()
+        Remove the style pushed last
+    styled(style)
+        Context manager that pushes a style and pops it
+    render(ansi=SwaANSI)
+        Return the text with escape sequences, honoring setWHEN
+    plain()
+        Return the text without escape sequences
+    """
+
+    __slots__ = ('_spans', '_stack', '_length')
+
+    def __init__(self, text='', style=None):
+        """
+        Parameters
+        ----------
+        text : str, optional
+            The first span
+        style : Style or spec, optional
+            The style of the first span
+        """
+
+        # (text, Style or None), in order
+        self._spans = []
+        # the effective Style of each pushed level, the innermost last
+        self._stack = [None]
+        self._length = 0
+        if text:
+            self.append(text, style)
+
+    def append(self, text, style=None):
+        """Appends `text` in `style` applied on top of the pushed styles, and
+            returns the StyledText.
+
+        Parameters
+        ----------
+        text : str, mandatory
+            Text without escape sequences
+        style : Style or spec, optional
+            The style of the text
+        """
+
+        if text:
+            self._spans.append((text, _combine(self._stack[-1],
+                                               _style(style))))
+            self._length += len(text)
+        return self
+
+    def extend(self, other):
+        """Appends the spans of StyledText `other` with the pushed styles
+            applied under theirs, and returns the StyledText.
+
+        Parameters
+        ----------
+        other : StyledText, mandatory
+            The spans to add
+        """
+
+        outer = self._stack[-1]
+        if outer is None:
+            self._spans.extend(other._spans)
+        else:
+            self._spans.extend((text, _combine(outer, style))
+                               for text, style in other._spans)
+        self._length += other._length
+        return self
+
+    def push(self, style):
+        """Applies `style` on top of the pushed styles to what is appended
+            until the matching pop.
+
+        Parameters
+        ----------
+        style : Style or spec, mandatory
+            The style to push
+        """
+
+        self._stack.append(_combine(self._stack[-1], _style(style)))
+
+    def pop(self):
+        """Removes the style pushed last.
+
+        Raises IndexError if no style is pushed.
+        """
+
+        if len(self._stack) == 1:
+            raise IndexError('pop from an empty style stack')
+        self._stack.pop()
+
+    @contextmanager
+    def styled(self, style):
+        """Pushes `style` until the block exits.
+
+        Parameters
+        ----------
+        style : Style or spec, mandatory
+            The style to push
+        """
+
+        self.push(style)
+        try:
+            yield self
+        finally:
+            self.pop()
+
+    def render(self, ansi=SwaANSI):
+        """Returns the text with the escape sequences of its styles, or
+            plain when SwaANSI.setWHEN disables color.
+
+        Parameters
+        ----------
+        ansi : SwaANSI class or instance, optional
+            Decides whether color is enabled and the color depth
+        """
+
+        if not ansi._colorEnabled():
+            return self.plain()
+        depth = ansi._colorDepth()
+        pieces = []
+        append = pieces.append
+        current = None
+        for text, style in self._spans:
+            if style is not current and style != current:
+                if current is not None:
+                    append('\033[0m')
+                if style is not None:
+                    append(style.prefix(depth))
+                current = style
+            append(text)
+        if current is not None:
+            append('\033[0m')
+        return ''.join(pieces)
+
+    def plain(self):
+        """Returns the text without escape sequences."""
+
+        return ''.join([text for text, _ in self._spans])
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return 'StyledText({!r})'.format(self._spans)
+
+    def __len__(self):
+        """Returns the number of characters, without escape sequences."""
+
+        return self._length
+
+    def __eq__(self, other):
+        if not isinstance(other, StyledText):
+            return NotImplemented
+        return self._spans == other._spans
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __add__(self, other):
+        """Returns a StyledText of this one followed by `other`, a StyledText
+            or plain text."""
+
+        result = StyledText()
+        result._spans = list(self._spans)
+        result._length = self._length
+        if isinstance(other, StyledText):
+            return result.extend(other)
+        return result.append(other)
+
+    def __getitem__(self, index):
+        """Returns the StyledText of the characters at a slice, or at an
+            index, counted without escape sequences.  Steps other than 1 are
+            not supported."""
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                raise ValueError('StyledText slices need a step of 1')
+        else:
+            start = index + self._length if index < 0 else index
+            if not 0 <= start < self._length:
+                raise IndexError('StyledText index out of range')
+            stop = start + 1
+
+        result = StyledText()
+        spans = result._spans
+        position = 0
+        for text, style in self._spans:
+            end = position + len(text)
+            if end > start:
+                if position >= stop:
+                    break
+                spans.append((text[max(start - position, 0):stop - position],
+                              style))
+            position = end
+        result._length = max(stop - start, 0)
+        return result
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Streaming tables with colored columns
+
+A Table renders rows one line at a time, so result sets of any size are
+printed in constant memory.  Column widths are declared, or measured on a
+sample of the first rows, and always on the plain cell text: cells are padded
+and truncated first and colored last, with escape prefixes resolved once per
+column and condition.
+
+A spec is a color name, a tuple of (foreground, background, *style_list), a
+SwaANSI instance, or a Style.  A column style of None leaves the column
+plain, while None as the spec of a condition or of the header stands for the
+SwaANSI defaults.
+
+    import sys
+    from swajime.table import Table
+    table = Table(['host', 'status', 'latency'],
+                  styles=[None, 'Green', None],
+                  conditions=[('status', lambda value: value != 'ok', 'Red'),
+                              ('latency', lambda value: value > 100,
+                               ('Yellow', None, 'Bold'))],
+                  formats=[None, None, '{:.1f}'])
+    table.write(cursor, sys.stdout)
+
+Rows wider than the sampled widths are truncated to keep the columns
+aligned.  Numbers are right aligned and everything else left aligned, unless
+align says otherwise.
+"""
+
+from itertools import islice
+
+import numbers
+import six
+import sys
+
+from .SwaANSI import SwaANSI
+from .text import truncate, visibleLen
+
+# Number of rows measured when a column has no declared width
+SAMPLE_SIZE = 1000
+# Number of lines joined into a single write by Table.write
+WRITE_LINES = 256
+
+
+class Table(object):
+    """Renders rows as aligned, colored columns.
+
+    Methods
+    -------
+    lines(rows)
+        Generate the header and each row as a line of text
+    write(rows, stream=sys.stdout)
+        Write the lines to a stream in batches
+    """
+
+    def __init__(self, columns, widths=None, styles=None, conditions=(),
+                 align=None, formats=None, sample=SAMPLE_SIZE, max_width=None,
+                 separator='  ', header=(None, None, 'Bold'), ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        columns : list(str), mandatory
+            The column names
+        widths : list(int), optional
+            The width of each column.  Columns whose width is None are
+            measured on a sample of rows.
+        styles : list, optional
+            A spec per column, None to leave the column plain
+        conditions : iterable((column, predicate, spec)), optional
+            Cells of `column`, an index or a name, whose raw value satisfies
+            predicate(value) get spec instead of the column style.  The
+            first matching condition wins.
+        align : list(str), optional
+            '<', '>' or '^' per column, None to align by value type
+        formats : list(str), optional
+            A str.format template per column, None for str(value)
+        sample : int, optional
+            Number of rows measured to size columns without a width
+        max_width : int, optional
+            The widest a measured column can be
+        separator : str, optional
+            The text between columns
+        header : spec, optional
+            The style of the column names, or False for no header line
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs and decides whether color is enabled
+        """
+
+        self.columns = [str(column) for column in columns]
+        count = len(self.columns)
+        self.widths = list(widths or [None] * count)
+        self.align = list(align or [None] * count)
+        self.formats = list(formats or [None] * count)
+        self.sample = sample
+        self.max_width = max_width
+        self.separator = separator
+        self.header = header
+        self._ansi = ansi
+
+        # prefixes are resolved once per column and per condition
+        self._prefixes = [ansi._specPrefix(spec) if spec is not None else ''
+                          for spec in (styles or [None] * count)]
+        self._conditions = [[] for _ in range(count)]
+        for column, predicate, spec in conditions:
+            index = self.columns.index(column) \
+                if isinstance(column, six.string_types) else column
+            self._conditions[index].append((predicate,
+                                            ansi._specPrefix(spec)))
+        self._header_prefix = ansi._specPrefix(header) \
+            if header is not False else ''
+
+    def _raw(self, row):
+        """Returns the values of a row, one per column, and their text."""
+
+        values = list(islice(row, len(self.columns)))
+        values.extend([None] * (len(self.columns) - len(values)))
+        raws = []
+        for value, template in zip(values, self.formats):
+            if value is None:
+                raws.append('')
+            elif template is not None:
+                raws.append(template.format(value))
+            else:
+                raws.append(value if isinstance(value, six.string_types)
+                            else str(value))
+        return values, raws
+
+    def _measure(self, sample):
+        """Returns the widths, measuring undeclared ones on `sample`."""
+
+        widths = list(self.widths)
+        for index, width in enumerate(widths):
+            if width is not None:
+                continue
+            measured = max([visibleLen(self.columns[index])
+                            if self.header is not False else 0] +
+                           [visibleLen(raws[index]) for _, raws in sample])
+            if self.max_width is not None:
+                measured = min(measured, self.max_width)
+            widths[index] = measured
+        return widths
+
+    def _render(self, values, raws, widths, aligns, prefixes, conditions,
+                enabled):
+        """Returns a row as a line, colored with the column `prefixes` or
+            the first matching `conditions`."""
+
+        cells = []
+        last = len(raws) - 1
+        for index, raw in enumerate(raws):
+            value = values[index]
+            width = widths[index]
+            size = visibleLen(raw)
+            if size > width:
+                raw = truncate(raw, width)
+                size = visibleLen(raw)
+
+            if enabled and raw:
+                prefix = prefixes[index]
+                for predicate, condition_prefix in conditions[index]:
+                    if value is not None and predicate(value):
+                        prefix = condition_prefix
+                        break
+                if prefix:
+                    raw = prefix + raw + '\033[0m'
+
+            padding = width - size
+            align = aligns[index] or (
+                '>' if isinstance(value, numbers.Number) else '<')
+            if padding <= 0:
+                cells.append(raw)
+            elif align == '>':
+                cells.append(' ' * padding + raw)
+            elif align == '^':
+                left = padding // 2
+                cells.append(' ' * left + raw + ' ' * (padding - left)
+                             if index < last else ' ' * left + raw)
+            else:
+                # the last column is not padded, to leave no trailing spaces
+                cells.append(raw + ' ' * padding if index < last else raw)
+        line = self.separator.join(cells)
+        # rows ending with missing values leave no trailing spaces either
+        return line.rstrip(' ') if not raws[last] else line
+
+    def _lines(self, rows, enabled):
+        rows = iter(rows)
+        raw = self._raw
+        sample = []
+        if None in self.widths:
+            sample = [raw(row) for row in islice(rows, self.sample)]
+        widths = self._measure(sample)
+
+        render = self._render
+        if self.header is not False:
+            # names line up with the values of the first row
+            first = sample[0][0] if sample else [None] * len(self.columns)
+            aligns = [align or ('>' if isinstance(value, numbers.Number)
+                                else '<')
+                      for align, value in zip(self.align, first)]
+            header = [self._header_prefix] * len(self.columns)
+            yield render(self.columns, self.columns, widths, aligns, header,
+                         [()] * len(self.columns), enabled)
+        aligns = self.align
+        prefixes = self._prefixes
+        conditions = self._conditions
+        for values, raws in sample:
+            yield render(values, raws, widths, aligns, prefixes, conditions,
+                         enabled)
+        del sample[:]
+        for row in rows:
+            values, raws = raw(row)
+            yield render(values, raws, widths, aligns, prefixes, conditions,
+                         enabled)
+
+    def lines(self, rows):
+        """Generates the header line, then a line per row.
+
+        Only the sample window of rows is held in memory.
+
+        Parameters
+        ----------
+        rows : iterable(sequence), mandatory
+            The rows of values
+        """
+
+        return self._lines(rows, self._ansi._colorEnabled())
+
+    def write(self, rows, stream=None):
+        """Writes the lines of `rows` to `stream`, WRITE_LINES at a time.
+
+        Parameters
+        ----------
+        rows : iterable(sequence), mandatory
+            The rows of values
+        stream : file, optional
+            Text stream to write to, sys.stdout by default.  Its
+            capabilities decide WHEN 'auto'.
+        """
+
+        if stream is None:
+            stream = sys.stdout
+        batch = []
+        for line in self._lines(rows, self._ansi._colorEnabled(stream)):
+            batch.append(line)
+            if len(batch) >= WRITE_LINES:
+                batch.append('')
+                stream.write('\n'.join(batch))
+                batch = []
+        if batch:
+            batch.append('')
+            stream.write('\n'.join(batch))
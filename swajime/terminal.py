@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Terminal capability detection
+
+probe(stream) decides once per stream whether escape codes should be written
+to it and how many colors it supports, then caches the answer.  Call
+invalidate() after the environment or the terminal changes.
+
+    import sys
+    from swajime import terminal
+    capability = terminal.probe(sys.stderr)
+    if capability.color and capability.depth >= terminal.TRUECOLOR:
+        ...
+
+The decision uses, in order:
+    FORCE_COLOR   forces color on, 0 or false forces it off.  Levels 1, 2 and
+                  3 request 16 colors, 256 colors and truecolor.
+    NO_COLOR      when set and not empty, disables color.
+    isatty()      only terminals get color.
+    TERM          'dumb' disables color, '256color' implies 256 colors, and
+                  'direct' implies truecolor.
+    COLORTERM     'truecolor' or '24bit' implies truecolor.
+"""
+
+from collections import namedtuple
+
+import os
+import sys
+import weakref
+
+# Color depths reported by probe
+NO_COLOR = 0
+COLORS_16 = 16
+COLORS_256 = 256
+TRUECOLOR = 1 << 24
+
+
+class Capability(namedtuple('Capability', ['isatty', 'color', 'depth'])):
+    """What a stream supports.
+
+    Attributes
+    ----------
+    isatty : bool
+        Whether the stream is a terminal
+    color : bool
+        Whether escape codes should be written to the stream
+    depth : int
+        Number of colors supported, NO_COLOR, COLORS_16, COLORS_256 or
+        TRUECOLOR
+    """
+
+    __slots__ = ()
+
+
+# stream -> Capability, dropped when the stream is garbage collected
+_cache = weakref.WeakKeyDictionary()
+
+_FORCE_LEVELS = {'': COLORS_16, '1': COLORS_16, 'true': COLORS_16,
+                 '2': COLORS_256, '3': TRUECOLOR}
+
+
+def _isatty(stream):
+    try:
+        return bool(stream.isatty())
+    except (AttributeError, ValueError):
+        # no isatty, or a closed stream
+        return False
+
+
+def _depth(environ):
+    """Returns the color depth implied by TERM and COLORTERM."""
+
+    term = environ.get('TERM', '').lower()
+    colorterm = environ.get('COLORTERM', '').lower()
+    if colorterm in ('truecolor', '24bit') or 'direct' in term:
+        return TRUECOLOR
+    if '256' in term:
+        return COLORS_256
+    if sys.platform.startswith('win'):
+        return TRUECOLOR if 'WT_SESSION' in environ else COLORS_256
+    return COLORS_16
+
+
+def detect(stream, environ=None):
+    """Returns the Capability of `stream` without using the cache.
+
+    Parameters
+    ----------
+    stream : file, mandatory
+        The stream that will be written to
+    environ : dict, optional
+        The environment to use instead of os.environ
+    """
+
+    if environ is None:
+        environ = os.environ
+    isatty = _isatty(stream)
+
+    force = environ.get('FORCE_COLOR')
+    if force is not None:
+        force = force.strip().lower()
+        if force in ('0', 'false'):
+            return Capability(isatty, False, NO_COLOR)
+        return Capability(isatty, True,
+                          max(_FORCE_LEVELS.get(force, COLORS_16),
+                              _depth(environ)))
+
+    if environ.get('NO_COLOR') or not isatty or \
+            environ.get('TERM', '').lower() == 'dumb':
+        return Capability(isatty, False, NO_COLOR)
+    return Capability(isatty, True, _depth(environ))
+
+
+def probe(stream=None):
+    """Returns the cached Capability of `stream`, detecting it on first use.
+
+    Parameters
+    ----------
+    stream : file, optional
+        The stream that will be written to, sys.stdout by default
+    """
+
+    if stream is None:
+        stream = sys.stdout
+    try:
+        return _cache[stream]
+    except KeyError:
+        capability = _cache[stream] = detect(stream)
+        return capability
+    except TypeError:
+        # streams that cannot be weakly referenced are not cached
+        return detect(stream)
+
+
+def invalidate(stream=None):
+    """Forgets the cached Capability of `stream`, or of every stream.
+
+    Parameters
+    ----------
+    stream : file, optional
+        The stream to probe again, all streams by default
+    """
+
+    if stream is None:
+        _cache.clear()
+    else:
+        _cache.pop(stream, None)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Measure and align text holding escape sequences
+
+The printable width of a string produced by SwaANSI.wrap is not its len():
+escape sequences take no columns, and East Asian wide characters take two.
+These functions scan for escape sequences with one precompiled expression,
+and return at once for strings without an escape character or without
+characters outside ASCII.
+
+    from swajime import SwaANSI
+    from swajime import text
+    cell = SwaANSI.wrap('ok', 'Green')
+    text.visibleLen(cell)               # 2
+    text.ljust(cell, 6) + '|'           # padded to 6 columns
+    text.truncate(SwaANSI.wrap('a long status', 'Red'), 6)
+"""
+
+import re
+import unicodedata
+
+ESC = '\033'
+
+# CSI sequences such as SGR, OSC sequences ending with BEL or ST, and the
+# other two character escapes
+_ESCAPE = re.compile(r'\033(?:\[[0-?]*[ -/]*[@-~]|\][^\007\033]*'
+                     r'(?:\007|\033\\)|[@-Z\\-_])')
+
+try:
+    _isascii = str.isascii
+except AttributeError:  # pragma: no cover
+    _NON_ASCII = re.compile(u'[^\x00-\x7f]')
+
+    def _isascii(text):
+        return not _NON_ASCII.search(text)
+
+# character -> columns, filled in as characters outside ASCII are seen
+_widths = dict((chr(code), 1) for code in range(128))
+
+
+def _charWidth(char):
+    """Returns the number of columns of a character outside ASCII."""
+
+    if unicodedata.combining(char) or \
+            unicodedata.category(char) in ('Mn', 'Me', 'Cf'):
+        width = 0
+    elif unicodedata.east_asian_width(char) in ('W', 'F'):
+        width = 2
+    else:
+        width = 1
+    _widths[char] = width
+    return width
+
+
+def _width(plain):
+    """Returns the number of columns of text without escape sequences."""
+
+    if _isascii(plain):
+        return len(plain)
+    widths = _widths
+    total = 0
+    for char in plain:
+        try:
+            total += widths[char]
+        except KeyError:
+            total += _charWidth(char)
+    return total
+
+
+def stripANSI(text):
+    """Returns `text` without its escape sequences.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The text to strip
+    """
+
+    if ESC not in text:
+        return text
+    return _ESCAPE.sub('', text)
+
+
+def visibleLen(text):
+    """Returns the number of terminal columns `text` takes.
+
+    Escape sequences take none, combining characters none, and East Asian
+    wide and fullwidth characters two.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The text to measure
+    """
+
+    if ESC in text:
+        text = _ESCAPE.sub('', text)
+    return _width(text)
+
+
+def ljust(text, width, fillchar=' '):
+    """Returns `text` padded on the right to `width` columns.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The text to pad
+    width : int, mandatory
+        The number of columns to fill
+    fillchar : str, optional
+        A character one column wide
+    """
+
+    padding = width - visibleLen(text)
+    return text + fillchar * padding if padding > 0 else text
+
+
+def rjust(text, width, fillchar=' '):
+    """Returns `text` padded on the left to `width` columns.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The text to pad
+    width : int, mandatory
+        The number of columns to fill
+    fillchar : str, optional
+        A character one column wide
+    """
+
+    padding = width - visibleLen(text)
+    return fillchar * padding + text if padding > 0 else text
+
+
+def center(text, width, fillchar=' '):
+    """Returns `text` centered in `width` columns, any odd column of padding
+    on the right.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The text to pad
+    width : int, mandatory
+        The number of columns to fill
+    fillchar : str, optional
+        A character one column wide
+    """
+
+    padding = width - visibleLen(text)
+    if padding <= 0:
+        return text
+    left = padding // 2
+    return fillchar * left + text + fillchar * (padding - left)
+
+
+def visibleSlice(text, start, stop=None):
+    """Returns the characters of `text` in columns `start` to `stop`.
+
+    Escape sequences before the end of the slice are kept, so the slice has
+    the attributes it had in `text`, and a reset is added after it if any
+    were kept.  A wide character cut by a boundary is left out.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The text to slice
+    start : int, mandatory
+        The first column, from 0
+    stop : int, optional
+        The column after the last, the end of text by default
+    """
+
+    if ESC not in text and _isascii(text):
+        return text[start:stop]
+
+    pieces = []
+    escaped = False
+    column = 0
+    position = 0
+    for match in _ESCAPE.finditer(text) if ESC in text else ():
+        column = _slicePlain(text[position:match.start()], column, start,
+                             stop, pieces)
+        position = match.end()
+        if stop is not None and column >= stop:
+            break
+        pieces.append(match.group())
+        escaped = True
+    else:
+        _slicePlain(text[position:], column, start, stop, pieces)
+    if escaped:
+        pieces.append('\033[0m')
+    return ''.join(pieces)
+
+
+def _slicePlain(plain, column, start, stop, pieces):
+    """Appends the characters of `plain` inside [start, stop) to `pieces`,
+    `plain` beginning at `column`.  Returns the column after `plain`."""
+
+    widths = _widths
+    for char in plain:
+        if stop is not None and column >= stop:
+            break
+        try:
+            width = widths[char]
+        except KeyError:
+            width = _charWidth(char)
+        if column >= start and (stop is None or column + width <= stop):
+            pieces.append(char)
+        column += width
+    return column
+
+
+def truncate(text, width, ellipsis=u'\u2026'):
+    """Returns `text` cut to at most `width` columns.
+
+    Text that fits is returned unchanged.  Otherwise `ellipsis` replaces the
+    last columns, and escape sequences are kept and closed as in
+    visibleSlice.
+
+    Parameters
+    ----------
+    text : str, mandatory
+        The text to cut
+    width : int, mandatory
+        The number of columns available
+    ellipsis : str, optional
+        Marks text that was cut, '' for none
+    """
+
+    if visibleLen(text) <= width:
+        return text
+    room = width - visibleLen(ellipsis)
+    if room <= 0:
+        return visibleSlice(ellipsis, 0, width)
+    cut = visibleSlice(text, 0, room)
+    if cut.endswith('\033[0m') and ESC in text:
+        return cut[:-4] + ellipsis + '\033[0m'
+    return cut + ellipsis
@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+#
+# Compatible with Python 2 and Python 3
+#
+
+"""Buffered writers for styled text
+
+StyledWriter keeps track of the SGR state of the terminal.  Each segment only
+emits the attributes that differ from the previous segment, adjacent segments
+with the same style share one escape sequence, and everything is collected in
+a buffer that is written to the stream in bulk.
+
+A spec is None for the SwaANSI defaults, a color name, a tuple of
+(foreground, background, *style_list), a SwaANSI instance, or a Style.
+
+    import sys
+    from swajime.writer import StyledWriter
+    with StyledWriter(sys.stdout) as out:
+        out.write('12:00:01 ', 'Grey50')
+        out.write('ERROR', ('Red', None, 'Bold'))
+        out.write(' disk full', 'Red')
+        out.write('\\n')
+    print(out.bytesSaved())
+
+VectoredWriter does the same for bytes.  The prefix, the payload and the
+reset of each segment are gathered as separate buffers and handed to
+os.writev, so payloads are neither copied nor transcoded:
+
+    from swajime.writer import VectoredWriter
+    with VectoredWriter() as out:          # sys.stdout.buffer
+        for record in records:
+            out.write(record, 'Red' if b'ERROR' in record else None)
+"""
+
+from __future__ import print_function
+
+import os
+import six
+import sys
+
+from .SwaANSI import SwaANSI, _asciiBytes, _bytes
+
+# Number of characters collected before the buffer is written to the stream
+BUFFER_SIZE = 1 << 16
+
+try:
+    # Most buffers passed to a single writev call
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):  # pragma: no cover
+    IOV_MAX = 1024
+
+# The state of a terminal without any attributes
+_PLAIN = ('', '', frozenset())
+
+
+class StyledWriter(object):
+    """Writes styled segments with the fewest SGR transitions.
+
+    Methods
+    -------
+    write(text, spec=None)
+        Write text with the attributes of spec
+    reset()
+        Return the terminal to plain text
+    flush()
+        Write the buffer to the stream
+    close()
+        Reset and flush, without closing the stream
+    bytesSaved()
+        Return how many bytes were saved compared to SwaANSI.wrap
+    """
+
+    def __init__(self, stream=None, buffer_size=BUFFER_SIZE, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        stream : file, optional
+            Text stream to write to, sys.stdout by default
+        buffer_size : int, optional
+            Number of characters buffered before writing to the stream
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs.  Its WHEN decides whether color is enabled,
+            with 'auto' judged by the capabilities of `stream`.
+        """
+
+        self.stream = sys.stdout if stream is None else stream
+        self.buffer_size = buffer_size
+        self._ansi = ansi
+        self._color = ansi._colorEnabled(self.stream)
+        self._depth = ansi._colorDepth(self.stream)
+        self._buffer = []
+        self._buffered = 0
+        self._state = _PLAIN
+        # spec -> (state, overhead), resolved once per distinct spec
+        self._states = {}
+        self._naive = 0
+        self._written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _stateOf(self, spec):
+        """Returns the (foreground, background, styles) state for a spec and
+            the length of the escapes SwaANSI.wrap would add around it."""
+
+        key = tuple(spec) if isinstance(spec, list) else spec
+        try:
+            return self._states[key]
+        except KeyError:
+            pass
+        fg_string, bg_string, style_codes = self._ansi._specAttributes(
+            spec, self._depth)
+        # resets inside a spec do not set any attribute
+        state = (fg_string, bg_string,
+                 frozenset(code for code in style_codes if code != '0'))
+        # SwaANSI.wrap adds a prefix and a 4 character reset
+        overhead = len(_sequence(_codes(state))) + 4 if state != _PLAIN \
+            else 0
+        self._states[key] = state, overhead
+        return state, overhead
+
+    def _append(self, string):
+        self._buffer.append(string)
+        self._buffered += len(string)
+        self._written += len(string)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def write(self, text, spec=None):
+        """Writes `text` with the attributes of `spec`.
+
+        Only the attributes that changed since the previous segment are
+            emitted.
+
+        Parameters
+        ----------
+        text : str, mandatory
+            The text to write
+        spec : optional
+            The attributes of the text
+        """
+
+        if not text:
+            return
+        if not self._color:
+            self._naive += len(text)
+            self._append(text)
+            return
+
+        state, overhead = self._stateOf(spec)
+        self._naive += overhead + len(text)
+
+        if state != self._state:
+            self._append(_transition(self._state, state))
+            self._state = state
+        self._append(text)
+
+    def reset(self):
+        """Returns the terminal to plain text if any attribute is set."""
+
+        if self._state != _PLAIN:
+            self._append('\033[0m')
+            self._state = _PLAIN
+
+    def flush(self):
+        """Writes the buffer to the stream in a single write."""
+
+        if self._buffer:
+            self.stream.write(''.join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self):
+        """Resets the attributes and flushes.  The stream is left open."""
+
+        self.reset()
+        self.flush()
+
+    def bytesSaved(self):
+        """Returns how many fewer bytes were written than by wrapping every
+            segment with SwaANSI.wrap."""
+
+        return self._naive - self._written
+
+
+def _codes(state):
+    """Returns the list of SGR parameters that set `state` from plain."""
+
+    fg_string, bg_string, styles = state
+    return [code for code in [fg_string, bg_string] if code] + \
+        sorted(styles, key=int)
+
+
+def _sequence(codes):
+    return '\033[{}m'.format(';'.join(codes))
+
+
+def _transition(old, new):
+    """Returns the shortest escape sequence changing `old` into `new`."""
+
+    full = _sequence(['0'] + _codes(new)) if new != _PLAIN else '\033[0m'
+    if old[2] - new[2]:
+        # styles are only switched off reliably by a reset
+        return full
+
+    codes = []
+    if old[0] != new[0]:
+        codes.append(new[0] or '39')
+    if old[1] != new[1]:
+        codes.append(new[1] or '49')
+    codes.extend(sorted(new[2] - old[2], key=int))
+    diff = _sequence(codes)
+    return diff if len(diff) < len(full) else full
+
+
+class _Descriptor(object):
+    """The part of a stream terminal.probe needs, for a file descriptor."""
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def fileno(self):
+        return self.fd
+
+    def isatty(self):
+        return os.isatty(self.fd)
+
+
+class VectoredWriter(object):
+    """Writes styled bytes with vectored writes, without copying payloads.
+
+    Payloads are referenced until they are written, so a bytearray or a
+    memoryview must not change before the next flush.
+
+    Methods
+    -------
+    write(data, spec=None)
+        Queue bytes with the attributes of spec
+    flush()
+        Write the queued buffers
+    close()
+        Flush, without closing the file
+    """
+
+    def __init__(self, target=None, buffer_size=BUFFER_SIZE, ansi=SwaANSI):
+        """
+        Parameters
+        ----------
+        target : int or file, optional
+            A file descriptor, or a binary or text file with a descriptor.
+            sys.stdout's buffer by default.  Files are flushed first, so
+            earlier writes to them come out in order.
+        buffer_size : int, optional
+            Number of payload bytes queued before they are written
+        ansi : SwaANSI class or instance, optional
+            Resolves the specs.  Its WHEN decides whether color is enabled,
+            with 'auto' judged by the capabilities of `target`.
+        """
+
+        if target is None:
+            target = getattr(sys.stdout, 'buffer', sys.stdout)
+        if isinstance(target, int):
+            self.fd = target
+            self._stream = _Descriptor(target)
+        else:
+            target.flush()
+            self.fd = target.fileno()
+            self._stream = target
+        self.buffer_size = buffer_size
+        self._ansi = ansi
+        self._color = ansi._colorEnabled(self._stream)
+        self._depth = ansi._colorDepth(self._stream)
+        self._buffers = []
+        self._buffered = 0
+        # spec -> (prefix, suffix) as bytes
+        self._wrappers = {}
+        self._writev = getattr(os, 'writev', None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _wrapper(self, spec):
+        key = tuple(spec) if isinstance(spec, list) else spec
+        try:
+            return self._wrappers[key]
+        except KeyError:
+            pass
+        prefix = self._ansi._specPrefix(spec) if self._color else ''
+        wrapper = self._wrappers[key] = (_asciiBytes(prefix),
+                                         b'\033[0m' if prefix else b'')
+        return wrapper
+
+    def write(self, data, spec=None):
+        """Queues `data` wrapped with the attributes of `spec`.
+
+        Parameters
+        ----------
+        data : bytes-like, mandatory
+            The bytes to write
+        spec : optional
+            None for the SwaANSI defaults, a color name, a tuple of
+            (foreground, background, *style_list), a SwaANSI instance, or a
+            Style
+        """
+
+        if not len(data):
+            return
+        if six.PY2 and not isinstance(data, bytes):
+            # Python 2 has no writev, and only joins str
+            data = _bytes(data)
+        prefix, suffix = self._wrapper(spec)
+        buffers = self._buffers
+        if prefix:
+            buffers.append(prefix)
+            buffers.append(data)
+            buffers.append(suffix)
+        else:
+            buffers.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self.buffer_size or \
+                len(buffers) > IOV_MAX - 3:
+            self.flush()
+
+    def flush(self):
+        """Writes every queued buffer, with as few system calls as the
+        IOV_MAX limit allows."""
+
+        buffers = self._buffers
+        if not buffers:
+            return
+        self._buffers = []
+        self._buffered = 0
+        if self._writev is None:
+            # no vectored writes on this platform: one joined write
+            buffers = [b''.join(buffers)]
+        fd = self.fd
+        while buffers:
+            batch = buffers[:IOV_MAX]
+            if self._writev is not None:
+                written = self._writev(fd, batch)
+            else:
+                written = os.write(fd, batch[0])
+            # drop what was written, keeping the rest of a partial buffer
+            index = 0
+            while index < len(batch) and written >= len(batch[index]):
+                written -= len(batch[index])
+                index += 1
+            buffers = buffers[index:]
+            if written:
+                buffers[0] = buffers[0][written:] if six.PY2 else \
+                    memoryview(buffers[0])[written:]
+
+    def close(self):
+        """Writes the queued buffers.  The file is left open."""
+
+        self.flush()
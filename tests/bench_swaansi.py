@@ -0,0 +1,816 @@
+#!/usr/bin/env python
+#
+
+"""Benchmark the SwaANSI module
+
+These are not unit tests and are not collected by pytest.  Run them with:
+    python -m tests.bench_swaansi [benchmark ...]
+"""
+
+from __future__ import print_function
+
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from swajime import SwaANSI
+from swajime import heatmap
+from swajime import markup
+from swajime import text
+from swajime.colorizer import Colorizer
+from swajime.logcolor import ColorFormatter
+from swajime.progress import Progress
+from swajime.screen import Screen
+from swajime.table import Table
+from swajime.writer import VectoredWriter
+
+
+def _report(label, seconds, number):
+    print('    {:<40} {:>10.3f} us/op'.format(label,
+                                                 seconds * 1e6 / number))
+
+
+def bench_compiled(number=200000):
+    """Compare a compiled instance wrap with the override path."""
+
+    SwaANSI.setWHEN('always')
+    red_error = SwaANSI('Red', None, 'Double Underline')
+    template = red_error.template()
+
+    def uncached():
+        SwaANSI.setCacheSize(0)
+        try:
+            return timeit.timeit(
+                lambda: SwaANSI.wrap('text', 'Red', None, 'Double Underline'),
+                number=number)
+        finally:
+            SwaANSI.setCacheSize(256)
+
+    print('bench_compiled')
+    _report('SwaANSI.wrap overrides, no cache', uncached(), number)
+    _report('SwaANSI.wrap overrides, cached', timeit.timeit(
+        lambda: SwaANSI.wrap('text', 'Red', None, 'Double Underline'),
+        number=number), number)
+    _report('instance.wrap compiled', timeit.timeit(
+        lambda: red_error.wrap('text'), number=number), number)
+    _report('instance.template().format', timeit.timeit(
+        lambda: template.format('text'), number=number), number)
+
+
+def bench_batch(cells=200000):
+    """Compare the batch wrap methods with a loop over wrap."""
+
+    SwaANSI.setWHEN('always')
+    texts = ['cell {}'.format(i) for i in range(cells)]
+    specs = ['Red', ('Green', None, 'Bold'), None] * (cells // 3 + 1)
+
+    print('bench_batch ({} cells)'.format(cells))
+    _report('loop over SwaANSI.wrap', timeit.timeit(
+        lambda: [SwaANSI.wrap(text, 'Red', None, 'Bold') for text in texts],
+        number=1), cells)
+    _report('SwaANSI.wrapMany', timeit.timeit(
+        lambda: SwaANSI.wrapMany(texts, 'Red', None, 'Bold'),
+        number=1), cells)
+    _report('loop over SwaANSI.wrap, mixed specs', timeit.timeit(
+        lambda: [SwaANSI.wrap(text, *((spec,) if not isinstance(spec, tuple)
+                                      else spec))
+                 for text, spec in zip(texts, specs)], number=1), cells)
+    _report('SwaANSI.wrapEach, mixed specs', timeit.timeit(
+        lambda: SwaANSI.wrapEach(texts, specs), number=1), cells)
+
+
+LOG_RULES = [(r'\bERROR\b', ('Red', None, 'Bold')),
+             (r'\bWARN(ING)?\b', 'Yellow'),
+             (r'\bINFO\b', 'Green'),
+             (r'\b\d+\.\d+\.\d+\.\d+\b', 'Cyan'),
+             (r'\b[0-9a-f]{8}-[0-9a-f]{4}\b', 'Grey50')]
+
+
+def _write_log(path, megabytes):
+    """Writes a synthetic service log of about `megabytes` MB to `path`."""
+
+    levels = ('INFO', 'INFO', 'INFO', 'WARN', 'ERROR', 'DEBUG')
+    lines = ['2020-07-22 12:00:{:02d} {:<5} request {:08x}-{:04x} from '
+             '10.0.{}.{} took {} ms\n'.format(i % 60, levels[i % len(levels)],
+                                              i * 7919, i % 65536, i % 256,
+                                              i % 251, i % 977)
+             for i in range(4096)]
+    chunk = ''.join(lines)
+    with io.open(path, 'w', newline='') as log:
+        for _ in range(max(1, megabytes * (1 << 20) // len(chunk))):
+            log.write(chunk)
+    return os.path.getsize(path)
+
+
+def _throughput(label, size, function):
+    start = time.time()
+    function()
+    seconds = time.time() - start
+    print('    {:<40} {:>10.1f} MB/s'.format(label, size / seconds / (1 << 20)))
+
+
+def bench_colorizer(megabytes=64):
+    """Colorize a synthetic log file and compare with copy and grep.
+
+    Set SWAJIME_BENCH_MB for a bigger file, e.g. 4096 for a multi-GB log.
+    """
+
+    megabytes = int(os.environ.get('SWAJIME_BENCH_MB', megabytes))
+    SwaANSI.setWHEN('always')
+    colorizer = Colorizer(LOG_RULES)
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'service.log')
+        size = _write_log(path, megabytes)
+        print('bench_colorizer ({:.0f} MB)'.format(size / float(1 << 20)))
+
+        def copy():
+            with io.open(path, 'r', newline='') as log, \
+                    io.open(os.devnull, 'w') as null:
+                shutil.copyfileobj(log, null, 1 << 20)
+
+        def colorize():
+            with io.open(path, 'r', newline='') as log, \
+                    io.open(os.devnull, 'w') as null:
+                colorizer.colorizeFile(log, null)
+
+        def grep():
+            # grep stops at the first match when writing to /dev/null
+            with open(path + '.out', 'w') as out:
+                subprocess.call(['grep', '--color=always', '-E',
+                                 'ERROR|WARN|INFO', path], stdout=out)
+
+        def parallel():
+            with open(os.devnull, 'wb') as null:
+                colorizer.colorizePath(path, null)
+
+        _throughput('text copy', size, copy)
+        _throughput('Colorizer.colorizeFile', size, colorize)
+        _throughput('Colorizer.colorizePath, {} workers'.format(
+            multiprocessing.cpu_count()), size, parallel)
+        if getattr(shutil, 'which', lambda name: None)('grep'):
+            _throughput('grep --color=always', size, grep)
+    finally:
+        shutil.rmtree(directory)
+
+
+def bench_quantize(colors=1000000):
+    """Map random RGB values to the nearest 256 and 16 color indexes."""
+
+    import random
+    rgbs = [(random.randrange(256), random.randrange(256),
+             random.randrange(256)) for _ in range(colors)]
+
+    print('bench_quantize ({} colors)'.format(colors))
+    start = time.time()
+    quantizer = SwaANSI.quantizer()
+    print('    {:<40} {:>10.3f} s'.format('build lookup tables',
+                                          time.time() - start))
+    for depth in (256, 16):
+        start = time.time()
+        quantizer.quantizeMany(rgbs, depth)
+        print('    {:<40} {:>10.3f} s'.format(
+            'quantizeMany, {} colors'.format(depth), time.time() - start))
+
+
+def bench_heatmap(rows=500, columns=200):
+    """Render a latency grid per cell with wrap and with a Heatmap."""
+
+    import random
+    grid = [[random.uniform(0, 250) for _ in range(columns)]
+            for _ in range(rows)]
+    palette = ['Grey{}'.format(level) for level in (0, 19, 35, 50, 66, 82,
+                                                    100)]
+    SwaANSI.setWHEN('always')
+    print('bench_heatmap ({}x{} cells)'.format(rows, columns))
+
+    def per_cell():
+        lines = []
+        for row in grid:
+            cells = []
+            for value in row:
+                index = min(len(palette) - 1, max(0, int(round(
+                    value * (len(palette) - 1) / 250.0))))
+                cells.append(SwaANSI.wrap('{:>7.1f}'.format(value), None,
+                                          palette[index]))
+            lines.append(''.join(cells))
+        return lines
+
+    grays = heatmap.Heatmap(palette, 0, 250)
+    array = heatmap.numpy.asarray(grid) if heatmap.numpy is not None \
+        else grid
+    for label, function in [('wrap per cell', per_cell),
+                            ('Heatmap.lines, lists',
+                             lambda: list(grays.lines(grid))),
+                            ('Heatmap.lines, array',
+                             lambda: list(grays.lines(array)))]:
+        start = time.time()
+        function()
+        print('    {:<40} {:>10.3f} s'.format(label, time.time() - start))
+    saved = heatmap.numpy
+    heatmap.numpy = None
+    try:
+        start = time.time()
+        list(grays.lines(grid))
+        print('    {:<40} {:>10.3f} s'.format('Heatmap.lines, pure Python',
+                                              time.time() - start))
+    finally:
+        heatmap.numpy = saved
+
+
+def bench_markup(number=100000):
+    """Compare a mixed style line built with wrap, markup and str.format."""
+
+    SwaANSI.setWHEN('always')
+    text = '[Grey50]{}[/] [bold]{}[/] [Red on Yellow]{}[/] {}'
+    line = markup.template(text)
+    plain = '{} {} {} {}'
+    args = ('12:00:01', 'web1', 'ERROR', 'disk full')
+
+    print('bench_markup')
+    _report('wrap per span', timeit.timeit(
+        lambda: '{} {} {} {}'.format(SwaANSI.wrap(args[0], 'Grey50'),
+                                     SwaANSI.wrap(args[1], None, None,
+                                                  'Bold'),
+                                     SwaANSI.wrap(args[2], 'Red', 'Yellow'),
+                                     args[3]), number=number), number)
+    _report('markup.render', timeit.timeit(
+        lambda: markup.render(text, *args), number=number), number)
+    _report('markup.template().format', timeit.timeit(
+        lambda: line.format(*args), number=number), number)
+    _report('plain str.format', timeit.timeit(
+        lambda: plain.format(*args), number=number), number)
+
+
+def bench_text(cells=200000, megabytes=16):
+    """Compare stripANSI and visibleLen with a naive re.sub.
+
+    On cells the fast paths win.  A large string is stripped with one
+    substitution either way, so the last two take the same time.
+    """
+
+    SwaANSI.setWHEN('always')
+    colors = ['Red', 'Green', 'Yellow', None]
+    cells = ['cell{}'.format(index) if colors[index % 4] is None else
+             SwaANSI.wrap('cell{}'.format(index), colors[index % 4])
+             for index in range(cells)]
+    blob = ' '.join(cells)
+    blob = blob * max(1, megabytes * (1 << 20) // len(blob))
+
+    def naive_strip(value):
+        return re.sub(r'\x1b\[[0-9;]*[A-Za-z]', '', value)
+
+    print('bench_text ({} cells, {:.0f} MB)'.format(
+        len(cells), len(blob) / float(1 << 20)))
+    for label, function in [
+            ('naive re.sub len, cells',
+             lambda: [len(naive_strip(cell)) for cell in cells]),
+            ('visibleLen, cells',
+             lambda: [text.visibleLen(cell) for cell in cells]),
+            ('naive re.sub ljust, cells',
+             lambda: [cell + ' ' * (12 - len(naive_strip(cell)))
+                      for cell in cells]),
+            ('ljust, cells', lambda: [text.ljust(cell, 12) for cell in cells]),
+            ('naive re.sub, large string', lambda: naive_strip(blob)),
+            ('stripANSI, large string', lambda: text.stripANSI(blob))]:
+        # the best of three, as single runs differ by more than the gap
+        best = None
+        for _ in range(3):
+            start = time.time()
+            function()
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print('    {:<40} {:>10.3f} s'.format(label, best))
+
+
+def bench_table(rows=200000):
+    """Render a colored result set with sampled and declared widths."""
+
+    SwaANSI.setWHEN('always')
+
+    def result():
+        for index in range(rows):
+            yield ('host{}'.format(index % 97), 'ok' if index % 13 else 'down',
+                   index * 0.37 % 500)
+
+    options = dict(styles=[None, 'Green', None],
+                   conditions=[(1, lambda value: value != 'ok', 'Red'),
+                               (2, lambda value: value > 400, 'Yellow')],
+                   formats=[None, None, '{:.1f}'])
+    print('bench_table ({} rows)'.format(rows))
+    for label, table in [
+            ('sampled widths', Table(['host', 'status', 'ms'], **options)),
+            ('declared widths', Table(['host', 'status', 'ms'],
+                                      widths=[7, 6, 5], **options))]:
+        start = time.time()
+        for _ in table.lines(result()):
+            pass
+        elapsed = time.time() - start
+        print('    {:<40} {:>10.0f} rows/s'.format(label, rows / elapsed))
+
+
+def bench_screen(frames=100, width=200, height=60):
+    """Compare redrawing a dashboard with wrapped lines and with a Screen."""
+
+    import random
+    SwaANSI.setWHEN('always')
+    colors = ['Green', 'Yellow', 'Red', None]
+    cells = [[('{:>9.1f}'.format(random.uniform(0, 1000)),
+               random.choice(colors)) for _ in range(width // 10)]
+             for _ in range(height)]
+
+    def update(frame):
+        # the clock and two cells change every frame
+        cells[0][0] = ('{:>9}'.format(frame), None)
+        for _ in range(2):
+            row = random.choice(cells)
+            row[random.randrange(len(row))] = (
+                '{:>9.1f}'.format(random.uniform(0, 1000)),
+                random.choice(colors))
+
+    start = time.time()
+    full = 0
+    for frame in range(frames):
+        update(frame)
+        full += len('\033[H' + '\n'.join(
+            ' '.join(SwaANSI.wrap(text, color) for text, color in row)
+            for row in cells))
+    full_time = time.time() - start
+
+    screen = Screen(width, height, io.StringIO(), fps=0)
+    styles = dict((color, screen.style(color)) for color in colors)
+    start = time.time()
+    diff = 0
+    for frame in range(frames):
+        update(frame)
+        for y, row in enumerate(cells):
+            for x, (text, color) in enumerate(row):
+                screen.put(x * 10, y, text, styles[color])
+        diff += len(screen.render())
+    diff_time = time.time() - start
+
+    print('bench_screen ({} frames of {}x{})'.format(frames, width, height))
+    print('    {:<40} {:>10.0f} bytes/frame {:>8.2f} ms/frame'.format(
+        'full redraw with wrap', full / float(frames),
+        full_time * 1e3 / frames))
+    print('    {:<40} {:>10.0f} bytes/frame {:>8.2f} ms/frame'.format(
+        'Screen.render', diff / float(frames), diff_time * 1e3 / frames))
+
+
+def bench_progress(items=1000000):
+    """Compare a wrap, write and flush per item with a Progress line."""
+
+    SwaANSI.setWHEN('always')
+    print('bench_progress ({} items)'.format(items))
+    with open(os.devnull, 'w') as devnull:
+        start = time.time()
+        for index in range(items):
+            devnull.write('\r' + SwaANSI.wrap('{}/{}'.format(index, items),
+                                              'Green'))
+            devnull.flush()
+        _report('wrap, write and flush per item', time.time() - start,
+                items)
+
+        status = Progress(items, 'bench', devnull, timer=False)
+        start = time.time()
+        for index in range(items):
+            status.count += 1
+            status.refresh()
+        status.close()
+        _report('Progress, refresh per item', time.time() - start, items)
+
+        with Progress(items, 'bench', devnull) as status:
+            start = time.time()
+            for index in range(items):
+                status.count += 1
+        _report('Progress, timer thread', time.time() - start, items)
+
+
+def bench_bytes(records=500000):
+    """Compare decoding, wrapping and encoding byte records with wrapBytes
+    and with a VectoredWriter."""
+
+    SwaANSI.setWHEN('always')
+    print('bench_bytes ({} records)'.format(records))
+    data = [('{:06d} GET /index.html 200 '.format(index) + 'x' * 60)
+            .encode('ascii') for index in range(records)]
+    size = sum(len(record) for record in data) / 1e6
+    fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        start = time.time()
+        chunk = []
+        for record in data:
+            chunk.append(SwaANSI.wrap(record.decode('utf-8'), 'Red')
+                         .encode('utf-8'))
+            if len(chunk) >= 256:
+                os.write(fd, b''.join(chunk))
+                chunk = []
+        os.write(fd, b''.join(chunk))
+        elapsed = time.time() - start
+        print('    {:<40} {:>8.1f} MB/s'.format('decode, wrap, encode',
+                                               size / elapsed))
+
+        start = time.time()
+        chunk = []
+        wrap = SwaANSI.wrapBytes
+        for record in data:
+            chunk.append(wrap(record, 'Red'))
+            if len(chunk) >= 256:
+                os.write(fd, b''.join(chunk))
+                chunk = []
+        os.write(fd, b''.join(chunk))
+        elapsed = time.time() - start
+        print('    {:<40} {:>8.1f} MB/s'.format('wrapBytes', size / elapsed))
+
+        start = time.time()
+        with VectoredWriter(fd) as out:
+            write = out.write
+            for record in data:
+                write(record, 'Red')
+        elapsed = time.time() - start
+        print('    {:<40} {:>8.1f} MB/s'.format('VectoredWriter',
+                                               size / elapsed))
+    finally:
+        os.close(fd)
+
+
+def bench_logging(records=200000):
+    """Compare formatting records with logging.Formatter, with a Formatter
+    calling SwaANSI.wrap per record, and with ColorFormatter."""
+
+    SwaANSI.setWHEN('always')
+    print('bench_logging ({} records)'.format(records))
+    fmt = '%(asctime)s %(levelname)-8s %(name)s: %(message)s'
+    levels = [logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR]
+    batch = [logging.LogRecord('app.db', levels[index % 4], __file__, index,
+                               'query %d took %.1f ms', (index, 1.5), None)
+             for index in range(records)]
+    colors = {logging.DEBUG: 'Grey50', logging.INFO: 'Green',
+              logging.WARNING: 'Yellow', logging.ERROR: 'Red'}
+
+    class WrapFormatter(logging.Formatter):
+        def format(self, record):
+            text = logging.Formatter.format(self, record)
+            return SwaANSI.wrap(text, colors[record.levelno])
+
+    for name, formatter in [('logging.Formatter', logging.Formatter(fmt)),
+                            ('SwaANSI.wrap per record', WrapFormatter(fmt)),
+                            ('ColorFormatter', ColorFormatter(fmt))]:
+        format_record = formatter.format
+        start = time.time()
+        for record in batch:
+            format_record(record)
+        elapsed = time.time() - start
+        print('    {:<40} {:>10.0f} records/s'.format(name,
+                                                      records / elapsed))
+
+
+def bench_async(connections=100, messages=2000):
+    """Compare wrap, write and drain per message with AsyncWriter, over
+    socket pairs served by one event loop."""
+
+    import asyncio
+    import socket
+    from swajime.aio import AsyncWriter
+
+    SwaANSI.setWHEN('always')
+    print('bench_async ({} connections, {} messages each)'.format(
+        connections, messages))
+
+    async def consume(reader):
+        while await reader.read(1 << 16):
+            pass
+
+    async def naive(writer):
+        for index in range(messages):
+            writer.write(SwaANSI.wrap('message {}\n'.format(index), 'Red')
+                         .encode('utf-8'))
+            await writer.drain()
+
+    async def batched(writer):
+        async with AsyncWriter(writer, 'always') as out:
+            for index in range(messages):
+                await out.write('message {}\n'.format(index), 'Red')
+
+    async def serve(produce):
+        consumers = []
+        producers = []
+        ends = []
+        for _ in range(connections):
+            left, right = socket.socketpair()
+            # both ends kept: a collected StreamWriter closes its socket
+            reader, reader_end = await asyncio.open_connection(sock=right)
+            writer = (await asyncio.open_connection(sock=left))[1]
+            consumers.append(consume(reader))
+            ends.append(reader_end)
+            producers.append((writer, produce(writer)))
+
+        async def finish(writer, producer):
+            await producer
+            writer.close()
+        await asyncio.gather(*([finish(writer, producer)
+                                for writer, producer in producers] +
+                               consumers))
+        for end in ends:
+            end.close()
+
+    for name, produce in [('wrap, write and drain per message', naive),
+                          ('AsyncWriter', batched)]:
+        loop = asyncio.new_event_loop()
+        start = time.time()
+        loop.run_until_complete(serve(produce))
+        elapsed = time.time() - start
+        loop.close()
+        print('    {:<40} {:>10.0f} messages/s'.format(
+            name, connections * messages / elapsed))
+
+
+def bench_cli(megabytes=64):
+    """Compare python -m swajime with cat on a large log file.
+
+    Set SWAJIME_BENCH_MB for a bigger file.
+    """
+
+    megabytes = int(os.environ.get('SWAJIME_BENCH_MB', megabytes))
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'service.log')
+        size = _write_log(path, megabytes)
+        rules = os.path.join(directory, 'rules.json')
+        with open(rules, 'w') as rules_file:
+            json.dump([[pattern, list(spec) if isinstance(spec, tuple)
+                        else spec] for pattern, spec in LOG_RULES],
+                      rules_file)
+        print('bench_cli ({:.0f} MB)'.format(size / float(1 << 20)))
+
+        def command(args, stdin=False):
+            def run():
+                with open(path, 'rb') as log, \
+                        open(os.devnull, 'wb') as null:
+                    subprocess.check_call(args + ([] if stdin else [path]),
+                                          stdin=log, stdout=null)
+            return run
+
+        swajime = [sys.executable, '-m', 'swajime', '-r', rules]
+        if getattr(shutil, 'which', lambda name: None)('cat'):
+            _throughput('cat', size, command(['cat']))
+        _throughput('swajime --when never', size,
+                    command(swajime + ['--when', 'never']))
+        _throughput('swajime --when always', size,
+                    command(swajime + ['--when', 'always']))
+        _throughput('swajime --when always < file', size,
+                    command(swajime + ['--when', 'always'], True))
+        _throughput('swajime --when always --workers {}'.format(
+            multiprocessing.cpu_count()), size,
+            command(swajime + ['--when', 'always', '--workers', '0']))
+    finally:
+        shutil.rmtree(directory)
+
+
+def bench_colors(runs=20):
+    """Time a cold import and first color lookup, with the bundled table,
+    with $HOME/dat/color_data.json parsed, and with its binary cache."""
+
+    import importlib
+    # the module, which the package hides behind the class of the same name
+    module = importlib.import_module('swajime.SwaANSI')
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    home = tempfile.mkdtemp()
+    color_dir = os.path.join(home, 'dat')
+    cache_path = os.path.join(color_dir, module.color_cache_name)
+    print('bench_colors ({} runs)'.format(runs))
+    try:
+        def cold(keep_cache):
+            environ = dict(os.environ, HOME=home)
+            total = 0.0
+            for _ in range(runs):
+                if not keep_cache and os.path.exists(cache_path):
+                    os.remove(cache_path)
+                start = time.time()
+                subprocess.check_call(
+                    [sys.executable, '-c', 'from swajime import SwaANSI; '
+                     'SwaANSI.colors'], cwd=root, env=environ)
+                total += time.time() - start
+            return total / runs
+
+        os.mkdir(color_dir)
+        bundled = cold(True)
+        shutil.copy(os.path.join(root, 'dat', 'color_data.json'), color_dir)
+        parsed = cold(False)
+        cached = cold(True)
+        print('    {:<40} {:>10.1f} ms/import'.format('bundled table',
+                                                      bundled * 1e3))
+        print('    {:<40} {:>10.1f} ms/import'.format(
+            'JSON parsed (and cache written)', parsed * 1e3))
+        print('    {:<40} {:>10.1f} ms/import'.format('binary cache',
+                                                      cached * 1e3))
+
+        # the table loading alone, in process
+        color_path = os.path.join(color_dir, 'color_data.json')
+        number = 200
+
+        def parse():
+            with open(color_path, 'r') as color_file:
+                module._build_color_tables(module._json_to_color_data(
+                    json.load(color_file)))
+        _report('json.load and table building', timeit.timeit(
+            parse, number=number), number)
+        _report('cache validated and loaded', timeit.timeit(
+            lambda: module._cached_color_tables(color_path), number=number),
+            number)
+    finally:
+        shutil.rmtree(home)
+
+
+def bench_colorindex(queries=20000):
+    """Compare linear scans of the color table with ColorIndex lookups."""
+
+    import random
+    from swajime.quantize import _nearest_brute
+
+    print('bench_colorindex ({} queries)'.format(queries))
+    SwaANSI.quantizer()
+    data = SwaANSI._color_data
+    start = time.time()
+    index = SwaANSI.colorIndex()
+    print('    {:<40} {:>10.3f} ms'.format('ColorIndex built',
+                                           (time.time() - start) * 1e3))
+    hexes = [random.choice(data)[2] for _ in range(queries)]
+    rgbs = [(random.randrange(256), random.randrange(256),
+             random.randrange(256)) for _ in range(queries)]
+    ranges = [(random.randrange(360), random.randrange(360))
+              for _ in range(queries // 10)]
+    palette = [(color[0], color[3]) for color in data]
+
+    def scan_hex():
+        for value in hexes:
+            for color in data:
+                if color[2].lower() == value.lower():
+                    break
+
+    def scan_hsl():
+        for low, high in ranges:
+            [color[0] for color in data
+             if (low <= color[4][0] <= high if low <= high else
+                 color[4][0] >= low or color[4][0] <= high) and
+             40 <= color[4][2] <= 60]
+
+    byHex = index.byHex
+    nearest = index.nearest
+    hslRange = index.hslRange
+    for label, function, number in [
+            ('hex, linear scan', scan_hex, queries),
+            ('hex, ColorIndex.byHex',
+             lambda: [byHex(value) for value in hexes], queries),
+            ('nearest RGB, linear scan',
+             lambda: [_nearest_brute(palette, *rgb) for rgb in rgbs],
+             queries),
+            ('nearest RGB, ColorIndex.nearest',
+             lambda: [nearest(*rgb) for rgb in rgbs], queries),
+            ('HSL range, linear scan', scan_hsl, len(ranges)),
+            ('HSL range, ColorIndex.hslRange',
+             lambda: [hslRange((low, high), None, (40, 60))
+                      for low, high in ranges], len(ranges))]:
+        start = time.time()
+        function()
+        _report(label, time.time() - start, number)
+
+def bench_highlight(megabytes=8):
+    """Highlight JSON and a diff, streamed, and compare with SwaANSI.wrap
+    called per token."""
+
+    from swajime.highlight import DiffHighlighter, JSONHighlighter
+
+    print('bench_highlight ({} MB of each)'.format(megabytes))
+    SwaANSI.setWHEN('always')
+    SwaANSI.setDefaults()
+    records = []
+    while len(records) * 180 < megabytes << 20:
+        records.append({'id': len(records), 'name': 'item %d' % len(records),
+                        'price': len(records) * 0.25, 'active': True,
+                        'tags': ['a', 'b', None], 'owner': {'login': 'x'}})
+    document = json.dumps(records, indent=2)
+    lines = []
+    while len(lines) * 24 < megabytes << 20:
+        lines.extend(['@@ -%d,3 +%d,3 @@' % (len(lines), len(lines)),
+                      ' context line here', '-removed line here',
+                      '+added line here'])
+    diff = '--- a/file\n+++ b/file\n' + '\n'.join(lines) + '\n'
+
+    json_tokens = re.compile(r'(?P<key>"[^"\\]*(?:\\.[^"\\]*)*"(?=\s*:))'
+                             r'|(?P<string>"[^"\\]*(?:\\.[^"\\]*)*")'
+                             r'|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)'
+                             r'|(?P<literal>\b(?:true|false|null)\b)')
+    json_specs = {'key': ('Blue', None, 'Bold'), 'string': ('Green',),
+                  'number': ('Aqua',), 'literal': ('Fuchsia',)}
+    wrap = SwaANSI.wrap
+
+    def wrap_json():
+        parts = []
+        end = 0
+        for match in json_tokens.finditer(document):
+            parts.append(document[end:match.start()])
+            parts.append(wrap(match.group(), *json_specs[match.lastgroup]))
+            end = match.end()
+        parts.append(document[end:])
+        return ''.join(parts)
+
+    def wrap_diff():
+        parts = []
+        for line in diff.splitlines(True):
+            if line.startswith(('--- ', '+++ ')):
+                line = wrap(line[:-1], None, None, 'Bold') + '\n'
+            elif line.startswith('@@'):
+                line = wrap(line[:-1], 'Aqua') + '\n'
+            elif line.startswith('+'):
+                line = wrap(line[:-1], 'Green') + '\n'
+            elif line.startswith('-'):
+                line = wrap(line[:-1], 'Red') + '\n'
+            parts.append(line)
+        return ''.join(parts)
+
+    def stream(highlighter, text):
+        return lambda: highlighter.write(io.StringIO(text), io.StringIO())
+
+    for label, text, function in [
+            ('JSON, SwaANSI.wrap per token', document, wrap_json),
+            ('JSON, JSONHighlighter.write', document,
+             stream(JSONHighlighter(), document)),
+            ('diff, SwaANSI.wrap per line', diff, wrap_diff),
+            ('diff, DiffHighlighter.write', diff,
+             stream(DiffHighlighter(), diff))]:
+        _throughput(label, len(text), function)
+
+    # a single string spans every chunk, and is only scanned once
+    string = json.dumps({'blob': 'x\\"y' * (megabytes << 18)})
+    highlighter = JSONHighlighter()
+    _throughput('JSON string, JSONHighlighter.highlight', len(string),
+                lambda: highlighter.highlight(string))
+    _throughput('JSON string, JSONHighlighter.write', len(string),
+                stream(highlighter, string))
+
+def bench_styledtext(counts=(1000, 10000)):
+    """Build a message of words nested in an outer style, re-wrapping the
+    message at each word, and with a StyledText rendered once."""
+
+    from swajime.styledtext import StyledText
+
+    print('bench_styledtext')
+    SwaANSI.setWHEN('always')
+    SwaANSI.setDefaults()
+    wrap = SwaANSI.wrap
+    outer = SwaANSI._specPrefix('Red')
+    for count in counts:
+        words = ['word%d' % index for index in range(count)]
+
+        def rewrap():
+            body = line = ''
+            for word in words:
+                # the inner reset ends the outer style, which is applied
+                # again, and the message is wrapped again as it grows
+                body += wrap(word, 'Blue') + outer + ' '
+                line = wrap(body, 'Red')
+            return line
+
+        def styled():
+            text = StyledText()
+            with text.styled('Red'):
+                for word in words:
+                    text.append(word, 'Blue').append(' ')
+            return text.render()
+
+        for label, function in [
+                ('{} words, wrap and concatenate'.format(count), rewrap),
+                ('{} words, StyledText'.format(count), styled)]:
+            start = time.time()
+            function()
+            _report(label, time.time() - start, count)
+
+
+BENCHMARKS = [bench_compiled, bench_batch, bench_colorizer, bench_quantize,
+              bench_heatmap, bench_markup, bench_text, bench_table,
+              bench_screen, bench_progress, bench_bytes, bench_logging,
+              bench_async, bench_cli, bench_colors, bench_colorindex,
+              bench_highlight, bench_styledtext]
+
+
+def main(argv=None):
+    names = (sys.argv[1:] if argv is None else argv) or \
+        [bench.__name__ for bench in BENCHMARKS]
+    for bench in BENCHMARKS:
+        if bench.__name__ in names:
+            bench()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""pytest configuration for the tests"""
+
+import sys
+
+# asyncio with async and await needs Python 3.5
+collect_ignore = ['test_aio.py'] if sys.version_info < (3, 5) else []
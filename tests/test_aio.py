@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+#
+
+"""Test the aio module"""
+
+import asyncio
+import socket
+import unittest
+
+from swajime import Style
+from swajime import aio
+from swajime import terminal
+from swajime.aio import AsyncWriter
+from swajime.style import using
+
+SwaANSI = aio.SwaANSI
+
+
+class FakeWriter(object):
+    """Records the writes and drains of an asyncio.StreamWriter."""
+
+    def __init__(self, pipe=None):
+        self.writes = []
+        self.drains = 0
+        self.pipe = pipe
+        self.blocked = None
+        self.error = None
+
+    def get_extra_info(self, name, default=None):
+        return self.pipe if name == 'pipe' else default
+
+    def write(self, data):
+        self.writes.append(data)
+
+    async def drain(self):
+        self.drains += 1
+        if self.error is not None:
+            raise self.error
+        if self.blocked is not None:
+            await self.blocked.wait()
+
+
+class FakeTerminal(object):
+    def isatty(self):
+        return True
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsyncWriter(unittest.TestCase):
+    """Test the AsyncWriter class."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        aio.clearCache()
+
+    def test_coalesced(self):
+        fake = FakeWriter()
+
+        async def main():
+            async with AsyncWriter(fake) as out:
+                await out.write('a', 'RED')
+                await out.write('b')
+                await out.write('', 'BLUE')
+                await out.writeSegments([('c', (None, 'GREEN')), ('d', None)])
+        run(main())
+        # queued before the task ran, so written at once
+        self.assertEqual(fake.writes, [b'\033[38;5;9ma\033[0mb'
+                                       b'\033[48;5;2mc\033[0md'])
+        self.assertEqual(fake.drains, 1)
+
+    def test_batch_size(self):
+        fake = FakeWriter()
+
+        async def main():
+            out = AsyncWriter(fake, when='never', batch_size=2)
+            for text in 'abcde':
+                await out.write(text, 'RED')
+            await out.close()
+        run(main())
+        self.assertEqual(fake.writes, [b'ab', b'cd', b'e'])
+
+    def test_backpressure(self):
+        fake = FakeWriter()
+        fake.blocked = None
+
+        async def main():
+            fake.blocked = asyncio.Event()
+            out = AsyncWriter(fake, queue_size=2)
+            out.start()
+            await out.write('a')
+            # the task takes 'a' and waits in drain
+            await asyncio.sleep(0)
+            await out.write('b')
+            await out.write('c')
+            writing = asyncio.ensure_future(out.write('d'))
+            await asyncio.sleep(0)
+            self.assertFalse(writing.done())
+            fake.blocked.set()
+            await writing
+            await out.close()
+        run(main())
+        self.assertEqual(b''.join(fake.writes), b'abcd')
+        self.assertEqual(fake.writes[0], b'a')
+
+    def test_per_connection(self):
+        SwaANSI.setWHEN('NEVER')
+        fake = FakeWriter()
+        self.assertIsNone(AsyncWriter(fake).depth)
+        self.assertIsNone(AsyncWriter(fake, 'auto').depth)
+        self.assertEqual(AsyncWriter(fake, 'always').depth,
+                         terminal.COLORS_256)
+        self.assertEqual(AsyncWriter(fake, 'auto', {'TERM': 'xterm',
+                                                    'COLORTERM': 'truecolor'}
+                                     ).depth, terminal.TRUECOLOR)
+        self.assertIsNone(AsyncWriter(fake, 'auto', {'TERM': 'dumb'}).depth)
+        self.assertEqual(AsyncWriter(FakeWriter(FakeTerminal()), 'auto',
+                                     depth=terminal.COLORS_16).depth,
+                         terminal.COLORS_16)
+        self.assertRaises(ValueError, AsyncWriter, fake, 'sometimes')
+
+        fake = FakeWriter()
+
+        async def main():
+            async with AsyncWriter(fake, 'always', depth=terminal.TRUECOLOR) \
+                    as out:
+                await out.write('a', '#ff8000')
+        run(main())
+        self.assertEqual(fake.writes, [b'\033[38;2;255;128;0ma\033[0m'])
+        SwaANSI.setWHEN('ALWAYS')
+
+    def test_shared_prefixes(self):
+        async def main():
+            for _ in range(100):
+                async with AsyncWriter(FakeWriter()) as out:
+                    await out.write('a', 'RED')
+                    await out.write('b', ('GREEN', None, 'BOLD'))
+        run(main())
+        self.assertEqual(len(aio._prefixes), 2)
+
+    def test_context_defaults(self):
+        async def write():
+            fake = FakeWriter()
+            async with AsyncWriter(fake) as out:
+                await out.write('a', 'RED')
+            return fake.writes
+
+        with using(Style(None, 'Blue', 'Bold')):
+            self.assertEqual(run(write()),
+                             [b'\033[38;5;9;48;5;12;1ma\033[0m'])
+        # the prefix resolved in that context is not used outside it
+        self.assertEqual(run(write()), [b'\033[38;5;9ma\033[0m'])
+
+    def test_connection_error(self):
+        fake = FakeWriter()
+        fake.error = ConnectionResetError()
+
+        async def main():
+            out = AsyncWriter(fake, queue_size=1)
+            await out.write('a')
+            await asyncio.sleep(0)
+            with self.assertRaises(ConnectionResetError):
+                for _ in range(10):
+                    await out.write('b')
+                    await asyncio.sleep(0)
+            with self.assertRaises(ConnectionResetError):
+                await out.close()
+        run(main())
+
+    def test_socket(self):
+        left, right = socket.socketpair()
+
+        async def main():
+            reader, writer = await asyncio.open_connection(sock=left)
+            async with AsyncWriter(writer, 'always') as out:
+                for index in range(1000):
+                    await out.write('{}\n'.format(index), 'RED')
+            writer.close()
+
+        run(main())
+        right.settimeout(5)
+        data = b''
+        while True:
+            chunk = right.recv(1 << 16)
+            if not chunk:
+                break
+            data += chunk
+        right.close()
+        self.assertEqual(data, b''.join(
+            b'\033[38;5;9m' + str(index).encode() + b'\n\033[0m'
+            for index in range(1000)))
+
+
+if __name__ == '__main__':
+    unittest.main()
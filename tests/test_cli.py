@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+
+"""Test the cli module"""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from swajime import cli
+from swajime.colorizer import Colorizer
+
+SwaANSI = cli.SwaANSI
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class OneByteReader(io.BytesIO):
+    """Returns a byte per read1, as a slow pipe could."""
+
+    def read1(self, size=-1):
+        return self.read(1)
+
+
+def swajime(args, data=b''):
+    """Runs python -m swajime and returns its status and output."""
+
+    process = subprocess.Popen([sys.executable, '-m', 'swajime'] + args,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, cwd=ROOT)
+    output, errors = process.communicate(data)
+    return process.returncode, output, errors
+
+
+class TestCli(unittest.TestCase):
+    """Test the command line colorizer."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as output:
+            output.write(data)
+        return path
+
+    def test_load_rules(self):
+        path = self.path('rules.json', json.dumps(
+            [['a', 'Red'], ['b', ['Red', None, 'Bold']], ['c', None]])
+            .encode('utf-8'))
+        self.assertEqual(cli.loadRules(path),
+                         [('a', 'Red'), ('b', ('Red', None, 'Bold')),
+                          ('c', None)])
+        path = self.path('object.json', b'{"z": "Red", "a": "Blue"}')
+        self.assertEqual(cli.loadRules(path), [('z', 'Red'), ('a', 'Blue')])
+        path = self.path('bad.json', b'[["a"]]')
+        self.assertRaises(ValueError, cli.loadRules, path)
+
+    def test_colorize_stream(self):
+        colorizer = Colorizer([('b', 'RED')])
+        data = u'ab\nbéb\nb'.encode('utf-8') + b'\xff'
+        expected = u'a\033[38;5;9mb\033[0m\n\033[38;5;9mb\033[0mé' \
+            u'\033[38;5;9mb\033[0m\n\033[38;5;9mb\033[0m'.encode('utf-8') + \
+            b'\xff'
+        for infile in (io.BytesIO(data), OneByteReader(data)):
+            output = io.BytesIO()
+            cli.colorizeStream(colorizer, infile, output)
+            self.assertEqual(output.getvalue(), expected)
+
+    def test_main(self):
+        status, output, _ = swajime(['--when', 'always', '-e', 'b', 'Red,,Bold',
+                                     '-e', 'c', 'Blue'], b'abc\n')
+        self.assertEqual(status, 0)
+        self.assertEqual(output, b'a\033[38;5;9;1mb\033[0m'
+                                 b'\033[38;5;12mc\033[0m\n')
+
+        # the default rules, and no color on a pipe
+        status, output, _ = swajime(['-'], b'ERROR x\n')
+        self.assertEqual(output, b'ERROR x\n')
+        status, output, _ = swajime(['--when', 'always'], b'ERROR x\n')
+        self.assertEqual(output, b'\033[38;5;9;1mERROR\033[0m x\n')
+
+    def test_files(self):
+        log = self.path('log', b'INFO a\n' * 1000)
+        rules = self.path('rules.json', b'[["INFO", "Green"]]')
+        status, output, errors = swajime(['--when', 'always', '-r', rules,
+                                          log, 'missing', log])
+        self.assertEqual(status, 1)
+        self.assertEqual(output, b'\033[38;5;2mINFO\033[0m a\n' * 2000)
+        self.assertIn(b'missing', errors)
+
+        status, parallel, _ = swajime(['--when', 'always', '-r', rules,
+                                       '--workers', '2', log])
+        self.assertEqual(parallel, output[:len(output) // 2])
+
+        status, _, errors = swajime(['-r', log])
+        self.assertEqual(status, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+#
+
+"""Test the colorindex module"""
+
+import random
+import sys
+import unittest
+
+from swajime.colorindex import ColorIndex
+from swajime.quantize import _nearest_brute
+
+COLORS = ((0, 'Black', '#000000', (0, 0, 0), (0, 0, 0)),
+          (1, 'Red', '#ff0000', (255, 0, 0), (0, 100, 50)),
+          (2, 'Rose', '#ff0080', (255, 0, 128), (330, 100, 50)),
+          (3, 'Orange', '#ff8000', (255, 128, 0), (30, 100, 50)),
+          (4, 'Black', '#000000', (0, 0, 0), (0, 0, 0)),
+          (5, 'Grey', '#808080', (128, 128, 128), (0, 0, 50)),
+          (6, 'Gray', '#808080', (128, 128, 128), (0, 0, 50)))
+
+
+class TestColorIndex(unittest.TestCase):
+    """Test the ColorIndex class."""
+
+    def test_names_and_hex(self):
+        index = ColorIndex(COLORS)
+        self.assertEqual(index.names(0), ('Black',))
+        self.assertEqual(index.name(5), 'Grey')
+        self.assertEqual(index.names(7), ())
+        self.assertIsNone(index.name(7))
+        self.assertEqual(index.byHex('#FF8000'), 3)
+        self.assertEqual(index.byHex('#000'), 0)
+        self.assertEqual(index.byHex('#808080'), 5)
+        self.assertIsNone(index.byHex('#123456'))
+        self.assertIsNone(index.byHex('red'))
+
+        index = ColorIndex(COLORS, {0: ('Black',), 1: ('Red', 'Scarlet')})
+        self.assertEqual(index.names(1), ('Red', 'Scarlet'))
+        self.assertEqual(index.names(4), ())
+
+    def test_nearest(self):
+        index = ColorIndex(COLORS)
+        self.assertEqual(index.nearest(250, 10, 10), 1)
+        self.assertEqual(index.nearest(10, 10, 10), 0)
+        self.assertEqual(index.nearest(128, 128, 128), 5)
+        self.assertEqual(index.nearest(255, 64, 0), 1)
+
+    def test_hsl_range(self):
+        index = ColorIndex(COLORS)
+        self.assertEqual(index.hslRange(), [0, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(index.hslRange(hue=(20, 40)), [3])
+        self.assertEqual(index.hslRange(hue=(320, 10), saturation=(50, 100)),
+                         [1, 2])
+        self.assertEqual(index.hslRange(saturation=(0, 0),
+                                        lightness=(40, 60)), [5, 6])
+        self.assertEqual(index.hslRange(hue=(100, 200)), [])
+
+    def test_color_table(self):
+        SwaANSI = sys.modules['swajime.SwaANSI'].SwaANSI
+        index = SwaANSI.colorIndex()
+        self.assertIs(SwaANSI.colorIndex(), index)
+        self.assertEqual(index.names(208), ('DarkOrange',))
+        self.assertEqual(index.byHex('#ff8700'), 208)
+
+        palette = [(color[0], color[3]) for color in SwaANSI._color_data]
+        hsls = [(color[0], color[4]) for color in SwaANSI._color_data]
+        generator = random.Random(1)
+        for _ in range(2000):
+            r, g, b = [generator.randrange(256) for _ in range(3)]
+            self.assertEqual(index.nearest(r, g, b),
+                             _nearest_brute(palette, r, g, b))
+        for low, high in [(0, 60), (300, 30), (180, 180)]:
+            self.assertEqual(
+                index.hslRange(hue=(low, high), lightness=(20, 80)),
+                sorted(color_id for color_id, (h, s, l) in hsls
+                       if (low <= h <= high if low <= high else
+                           h >= low or h <= high) and 20 <= l <= 80))
+
+        # a new color table gets new indexes
+        SwaANSI._loadColors()
+        self.assertIsNot(SwaANSI.colorIndex(), index)
+
+
+if __name__ == '__main__':
+    unittest.main()
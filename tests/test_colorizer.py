@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+#
+
+"""Test the colorizer module"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from swajime import colorizer
+from swajime.colorizer import Colorizer
+
+SwaANSI = colorizer.SwaANSI
+
+RED = '\033[38;5;9m{}\033[0m'
+BOLD_YELLOW = '\033[38;5;11;1m{}\033[0m'
+
+
+class TestColorizer(unittest.TestCase):
+    """Test the Colorizer class."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        self.colorizer = Colorizer([(r'\bERROR\b', 'RED'),
+                                    (r'^WARN(ING)?', ('YELLOW', None, 'BOLD')),
+                                    (r'\bFAKE\b', 'INVALID')])
+
+    def test_colorize(self):
+        self.assertEqual(self.colorizer.colorize('an ERROR here'),
+                         'an {} here'.format(RED.format('ERROR')))
+        self.assertEqual(self.colorizer.colorize('WARNING ERROR\nWARN x'),
+                         '{} {}\n{} x'.format(BOLD_YELLOW.format('WARNING'),
+                                              RED.format('ERROR'),
+                                              BOLD_YELLOW.format('WARN')))
+        # anchors are per line and invalid specs leave matches alone
+        self.assertEqual(self.colorizer.colorize('x WARN FAKE'), 'x WARN FAKE')
+        self.assertEqual(self.colorizer.colorize(''), '')
+
+    def test_backreferences(self):
+        doubled = Colorizer([(r'(\w)\1', 'Red')])
+        self.assertEqual(doubled.colorize('abbc'),
+                         'a{}c'.format(RED.format('bb')))
+        # numbered after the groups of the rules before
+        rules = Colorizer([(r'x(y)', 'Red'), (r'(\w)\1', 'Red'),
+                           (r'(a)?(?(1)b|c)[\1]', 'Red')])
+        self.assertEqual(rules.colorize('xy bb ab c\x01'),
+                         '{} {} ab {}'.format(RED.format('xy'),
+                                              RED.format('bb'),
+                                              RED.format('c\x01')))
+        self.assertRaises(ValueError, Colorizer,
+                          [('(a)' * 100, 'Red'), (r'(b)\1', 'Red')])
+
+    def test_colorize_lines(self):
+        lines = ['ERROR\n', 'nothing\n', 'WARN\n']
+        self.assertEqual(list(self.colorizer.colorizeLines(lines)),
+                         [RED.format('ERROR') + '\n', 'nothing\n',
+                          BOLD_YELLOW.format('WARN') + '\n'])
+
+    def test_colorize_file(self):
+        text = ''.join('line {} ERROR WARN\nWARN {}\n'.format(i, i)
+                       for i in range(500)) + 'ERROR'
+        out = io.StringIO()
+        self.colorizer.colorizeFile(io.StringIO(text), out, block_size=64)
+        self.assertEqual(out.getvalue(), self.colorizer.colorize(text))
+
+    def test_colorize_path(self):
+        text = u''.join(u'line {} ERROR WARN \u00e9\nWARN {}\n'.format(i, i)
+                        for i in range(500)) + u'ERROR'
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'test.log')
+            with io.open(path, 'w', encoding='utf-8', newline='') as log:
+                log.write(text)
+            expected = self.colorizer.colorize(text).encode('utf-8')
+
+            for workers in (1, 3):
+                out = io.BytesIO()
+                self.colorizer.colorizePath(path, out, workers=workers,
+                                            chunk_size=256)
+                self.assertEqual(out.getvalue(), expected)
+
+            SwaANSI.setWHEN('NEVER')
+            out = io.BytesIO()
+            self.colorizer.colorizePath(path, out, workers=3, chunk_size=256)
+            self.assertEqual(out.getvalue(), text.encode('utf-8'))
+            SwaANSI.setWHEN('ALWAYS')
+
+            open(path, 'w').close()
+            out = io.BytesIO()
+            self.colorizer.colorizePath(path, out)
+            self.assertEqual(out.getvalue(), b'')
+        finally:
+            shutil.rmtree(directory)
+
+    def test_never(self):
+        SwaANSI.setWHEN('NEVER')
+        self.assertEqual(self.colorizer.colorize('ERROR'), 'ERROR')
+        self.assertEqual(list(self.colorizer.colorizeLines(['ERROR'])),
+                         ['ERROR'])
+        out = io.StringIO()
+        self.colorizer.colorizeFile(io.StringIO(u'ERROR\n'), out)
+        self.assertEqual(out.getvalue(), 'ERROR\n')
+        SwaANSI.setWHEN('ALWAYS')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+#
+
+"""Test the heatmap module"""
+
+import unittest
+
+from swajime import heatmap
+from swajime.heatmap import Heatmap, PALETTES
+
+SwaANSI = heatmap.SwaANSI
+
+GRID = [[0.0, 5.0, 10.0], [2.5, float('nan'), 20.0]]
+
+
+class TestHeatmap(unittest.TestCase):
+    """Test the Heatmap class."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        SwaANSI.setColorDepth()
+
+    def tearDown(self):
+        SwaANSI.setColorDepth()
+
+    def check_grid(self):
+        grays = Heatmap(['Grey0', 'Grey50', 'Grey100'], 0, 10, cell='{:.1f}',
+                        background=False)
+        indexes = grays.indexes(GRID)
+        self.assertEqual([list(row) for row in indexes],
+                         [[0, 1, 2], [0, 3, 2]])
+        self.assertEqual(grays.render(GRID).split('\n'), [
+            '\033[38;5;16m0.0\033[0m\033[38;5;244m5.0\033[0m'
+            '\033[38;5;231m10.0\033[0m',
+            '\033[38;5;16m2.5\033[0mnan\033[38;5;231m20.0\033[0m'])
+
+        # the range of the array by default
+        self.assertEqual([list(row) for row in Heatmap('grays').indexes(
+            [[1, 2], [3, 1]])], [[0, 12], [23, 0]])
+        self.assertEqual([list(row) for row in Heatmap('grays').indexes(
+            [[4, 4]])], [[0, 0]])
+
+    def test_numpy(self):
+        if heatmap.numpy is None:
+            self.skipTest('numpy is not installed')
+        self.check_grid()
+        array = heatmap.numpy.arange(12.0).reshape(3, 4)
+        self.assertEqual(Heatmap('heat').indexes(array).max(),
+                         len(PALETTES['heat']) - 1)
+
+    def test_pure_python(self):
+        saved = heatmap.numpy
+        heatmap.numpy = None
+        try:
+            self.check_grid()
+        finally:
+            heatmap.numpy = saved
+
+    def test_same_render(self):
+        if heatmap.numpy is None:
+            self.skipTest('numpy is not installed')
+        grid = [[0, 1, 2], [3, float('nan'), 5]]
+        maps = [Heatmap('heat', cell='{}'),
+                Heatmap(['#000000', '#ff0000'], 0, 5, cell='{!r:>6}')]
+        rendered = [ramp.render(grid) for ramp in maps]
+        saved = heatmap.numpy
+        heatmap.numpy = None
+        try:
+            self.assertEqual([ramp.render(grid) for ramp in maps], rendered)
+        finally:
+            heatmap.numpy = saved
+
+    def test_infinity(self):
+        if heatmap.numpy is None:
+            self.skipTest('numpy is not installed')
+        inf = float('inf')
+        grid = [[0, inf, 2], [-inf, float('nan'), 4]]
+        maps = [Heatmap('reds', cell='{}'), Heatmap('reds', 1, 3, cell='{}')]
+        expected = [[[0, 5, 2], [0, 6, 5]], [[0, 5, 2], [0, 6, 5]]]
+        for backend in [heatmap.numpy, None]:
+            saved = heatmap.numpy
+            heatmap.numpy = backend
+            try:
+                self.assertEqual([[list(row) for row in ramp.indexes(grid)]
+                                  for ramp in maps], expected)
+                rendered = [ramp.render(grid) for ramp in maps]
+            finally:
+                heatmap.numpy = saved
+            if backend is not None:
+                numpy_rendered = rendered
+        self.assertEqual(rendered, numpy_rendered)
+
+    def test_colormaps(self):
+        self.assertEqual(len(PALETTES['heat']), 16)
+        self.assertEqual(PALETTES['reds'], (16, 52, 88, 124, 160, 196))
+
+        SwaANSI.setColorDepth(1 << 24)
+        ramp = Heatmap(['#000000', '#ff0000'], 0, 1, cell='{}', steps=3)
+        self.assertEqual(ramp.size, 3)
+        self.assertEqual(ramp.render([[0, 0.5, 1]]),
+                         '\033[48;2;0;0;0m0.0\033[0m'
+                         '\033[48;2;128;0;0m0.5\033[0m'
+                         '\033[48;2;255;0;0m1.0\033[0m')
+
+        SwaANSI.setColorDepth(256)
+        ramp = Heatmap([(0, 0, 0), (255, 0, 0)], 0, 1, cell='{:g}', steps=2)
+        self.assertEqual(ramp.render([[0, 1]]),
+                         '\033[48;5;16m0\033[0m\033[48;5;196m1\033[0m')
+
+        with self.assertRaises(ValueError):
+            Heatmap(['NotAColor'])
+        with self.assertRaises(ValueError):
+            Heatmap([])
+
+    def test_never(self):
+        SwaANSI.setWHEN('NEVER')
+        self.assertEqual(Heatmap('heat', cell='{:g}').render([[1, 2], [3, 4]]),
+                         '12\n34')
+
+
+if __name__ == '__main__':
+    unittest.main()
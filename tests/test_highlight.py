@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+
+"""Test the highlight module"""
+
+import io
+import json
+import sys
+import time
+import unittest
+
+from swajime import highlight
+from swajime.highlight import DiffHighlighter, JSONHighlighter
+
+SwaANSI = sys.modules['swajime.SwaANSI'].SwaANSI
+
+DOCUMENT = json.dumps(
+    {u'name': u'café "quoted" \\ back', u'count': -12.5e3,
+     u'items': [1, 22, 333, True, False, None, {u'key': u'value'}],
+     u'empty': {}, u'nested': {u'a b': [u'x', 0]}},
+    indent=2, sort_keys=True, ensure_ascii=False)
+
+# not JSON, with a string left open and words cut between chunks
+MALFORMED = u'[1e5, tru e, "a\\"" :2, x0"e1 true"null, -3.5E+2 "b"  \n:"c'
+
+DIFF = u'''diff --git a/x.py b/x.py
+index 1111111..2222222 100644
+--- a/x.py
++++ b/x.py
+@@ -1,3 +1,3 @@ def f():
+ context
+-old line
++new line
+ café
+'''
+
+
+class TestHighlight(unittest.TestCase):
+    """Test the JSON and diff highlighters."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+
+    def tearDown(self):
+        SwaANSI.setWHEN('AUTO')
+
+    def test_json(self):
+        highlighter = JSONHighlighter()
+        self.assertEqual(
+            highlighter.highlight(u'{"a": [1, "b", true, null], "c": -2.5}'),
+            u'{\033[38;5;12;1m"a"\033[0m: [\033[38;5;14m1\033[0m, '
+            u'\033[38;5;2m"b"\033[0m, \033[38;5;13mtrue\033[0m, '
+            u'\033[38;5;13mnull\033[0m], \033[38;5;12;1m"c"\033[0m: '
+            u'\033[38;5;14m-2.5\033[0m}')
+        self.assertEqual(highlighter.highlight(u'"a \\" b"'),
+                         u'\033[38;5;2m"a \\" b"\033[0m')
+        self.assertEqual(highlighter.highlight(u''), u'')
+
+        # a spec for the SwaANSI defaults, which set nothing
+        self.assertEqual(JSONHighlighter({'key': None}).highlight(u'{"a": 1}'),
+                         u'{"a": \033[38;5;14m1\033[0m}')
+        self.assertEqual(DiffHighlighter({'added': None}).highlight(u'+x\n'),
+                         u'+x\n')
+
+        highlighter = JSONHighlighter({'punctuation': 'Red', 'number': False})
+        self.assertEqual(highlighter.highlight(u'[1]'),
+                         u'\033[38;5;9m[\033[0m1\033[38;5;9m]\033[0m')
+
+    def test_diff(self):
+        highlighted = DiffHighlighter().highlight(DIFF).split(u'\n')
+        self.assertEqual(highlighted[0],
+                         u'\033[1mdiff --git a/x.py b/x.py\033[0m')
+        self.assertEqual(highlighted[3], u'\033[1m+++ b/x.py\033[0m')
+        self.assertEqual(highlighted[4],
+                         u'\033[38;5;14m@@ -1,3 +1,3 @@ def f():\033[0m')
+        self.assertEqual(highlighted[5], u' context')
+        self.assertEqual(highlighted[6], u'\033[38;5;9m-old line\033[0m')
+        self.assertEqual(highlighted[7], u'\033[38;5;2m+new line\033[0m')
+
+    def test_chunk_boundaries(self):
+        for highlighter, text in [(JSONHighlighter(), DOCUMENT),
+                                  (JSONHighlighter(), MALFORMED),
+                                  (JSONHighlighter({'punctuation': 'Red'}),
+                                   MALFORMED),
+                                  (DiffHighlighter(), DIFF),
+                                  (DiffHighlighter(), DIFF.rstrip(u'\n'))]:
+            whole = highlighter.highlight(text)
+            for chunk_size in range(1, 40):
+                chunks = list(highlighter.chunks(io.StringIO(text),
+                                                 chunk_size))
+                self.assertEqual(u''.join(chunks), whole)
+
+    def test_long_string(self):
+        # a string of several MB is scanned once, not again with each chunk
+        value = u'ab\\"cd\\\\' * (1 << 19)
+        text = u'{"key": "' + value + u'", "other": ["' + value + u'"'
+        highlighter = JSONHighlighter()
+        start = time.time()
+        chunks = list(highlighter.chunks(io.StringIO(text)))
+        elapsed = time.time() - start
+        self.assertEqual(u''.join(chunks), highlighter.highlight(text))
+        self.assertLess(elapsed, 2.0)
+        for chunk_size in [1000, 1001, 4095]:
+            chunks = highlighter.chunks(io.StringIO(text[:20000]),
+                                        chunk_size)
+            self.assertEqual(u''.join(chunks),
+                             highlighter.highlight(text[:20000]))
+        long_line = DIFF + u'+' + u'x' * (4 << 20) + u'\n' + DIFF
+        self.assertEqual(
+            u''.join(DiffHighlighter().chunks(io.StringIO(long_line))),
+            DiffHighlighter().highlight(long_line))
+
+    def test_bounded_memory(self):
+        # no chunk holds more than a read and the token it ends in
+        text = u'[' + u', '.join([u'"value"'] * 10000) + u']'
+        for chunk in JSONHighlighter().chunks(io.StringIO(text), 100):
+            self.assertLess(len(chunk), 300)
+
+    def test_write(self):
+        output = io.StringIO()
+        JSONHighlighter().write(io.StringIO(DOCUMENT), output, 7)
+        self.assertEqual(output.getvalue(),
+                         JSONHighlighter().highlight(DOCUMENT))
+
+        # WHEN 'auto' is decided by the output, a StringIO is no terminal
+        SwaANSI.setWHEN('AUTO')
+        output = io.StringIO()
+        DiffHighlighter().write(io.StringIO(DIFF), output, 7)
+        self.assertEqual(output.getvalue(), DIFF)
+
+        SwaANSI.setWHEN('NEVER')
+        self.assertEqual(JSONHighlighter().highlight(DOCUMENT), DOCUMENT)
+        self.assertEqual(u''.join(DiffHighlighter().chunks(io.StringIO(DIFF),
+                                                           5)), DIFF)
+        self.assertEqual(highlight.CHUNK_SIZE, 1 << 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+#
+
+"""Test the logcolor module"""
+
+import io
+import logging
+import sys
+import threading
+import unittest
+
+from swajime import logcolor
+from swajime.logcolor import ColorFormatter, ColorHandler
+
+SwaANSI = logcolor.SwaANSI
+
+try:
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+except ImportError:  # pragma: no cover
+    QueueHandler = None
+
+
+class FakeTerminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def _record(msg, level=logging.INFO, name='app', args=None):
+    return logging.makeLogRecord({'name': name, 'levelno': level,
+                                  'levelname': logging.getLevelName(level),
+                                  'msg': msg, 'args': args})
+
+
+class TestColorFormatter(unittest.TestCase):
+    """Test the ColorFormatter class."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+
+    def test_levels(self):
+        formatter = ColorFormatter('%(levelname)-7s %(message)s')
+        self.assertEqual(formatter.format(_record('a %s', args=('b',))),
+                         '\033[38;5;2mINFO   \033[0m a b')
+        self.assertEqual(formatter.format(_record('c', logging.CRITICAL)),
+                         '\033[38;5;15;48;5;9;1mCRITICAL\033[0m c')
+        # a level without a spec takes that of the closest lower one
+        self.assertEqual(formatter.format(_record('d', 25)),
+                         '\033[38;5;2mLevel 25\033[0m d')
+        self.assertEqual(formatter.format(_record('e', 5)), 'Level 5 e')
+
+    def test_names_and_fields(self):
+        formatter = ColorFormatter('{levelname} {name}: {message!s:>3}',
+                                   style='{', levels={'WARNING': 'Red'},
+                                   names={'app': 'Blue'},
+                                   fields=('levelname', 'message'))
+        self.assertEqual(formatter.format(_record('m', logging.WARNING,
+                                                  'app.db')),
+                         '\033[38;5;9mWARNING\033[0m '
+                         '\033[38;5;12mapp.db\033[0m: '
+                         '\033[38;5;9m  m\033[0m')
+        self.assertEqual(formatter.format(_record('m', logging.INFO,
+                                                  'application')),
+                         'INFO application:   m')
+
+    def test_bounded_formatters(self):
+        formatter = ColorFormatter('%(name)s %(message)s')
+        for index in range(100):
+            formatter.format(_record('m', name='app{}'.format(index)))
+        self.assertEqual(len(formatter._formatters), 1)
+
+        formatter = ColorFormatter('%(name)s %(message)s',
+                                   names={'app': 'Blue'})
+        for index in range(100):
+            formatter.format(_record('m', name='app.{}'.format(index)))
+            formatter.format(_record('m', name='db{}'.format(index)))
+        self.assertEqual(len(formatter._formatters), 2)
+        self.assertEqual(formatter.format(_record('m', name='app.x')),
+                         '\033[38;5;12mapp.x\033[0m m')
+
+    def test_record_unchanged(self):
+        formatter = ColorFormatter()
+        record = _record('a %s', args=('b',))
+        formatter.format(record)
+        self.assertEqual(record.levelname, 'INFO')
+        self.assertEqual(record.msg, 'a %s')
+        self.assertEqual(logging.Formatter().format(record), 'a b')
+
+    def test_exception(self):
+        formatter = ColorFormatter('%(message)s')
+        try:
+            raise ValueError('bad')
+        except ValueError:
+            record = logging.LogRecord('app', logging.ERROR, __file__, 1,
+                                       'failed', None, sys.exc_info())
+        text = formatter.format(record)
+        self.assertTrue(text.startswith('failed\nTraceback'))
+        self.assertTrue(text.endswith('ValueError: bad'))
+
+    def test_never(self):
+        SwaANSI.setWHEN('NEVER')
+        formatter = ColorFormatter()
+        self.assertEqual(formatter.format(_record('m')), 'INFO:app:m')
+        SwaANSI.setWHEN('ALWAYS')
+        self.assertRaises(ValueError, ColorFormatter, style='#')
+        self.assertRaises(ValueError, ColorFormatter,
+                          levels={'NOTALEVEL': 'Red', logging.INFO: 'Green'})
+
+
+class TestColorHandler(unittest.TestCase):
+    """Test the ColorHandler class."""
+
+    def setUp(self):
+        SwaANSI.setDefaults()
+
+    def tearDown(self):
+        SwaANSI.setWHEN('ALWAYS')
+
+    def test_stream_capability(self):
+        SwaANSI.setWHEN('AUTO')
+        formatter = ColorFormatter('%(levelname)s %(message)s',
+                                   stream=io.StringIO())
+        terminal = FakeTerminal()
+        pipe = io.StringIO()
+        for stream in (terminal, pipe):
+            handler = ColorHandler(stream)
+            handler.setFormatter(formatter)
+            handler.handle(_record('m', logging.ERROR))
+        self.assertEqual(terminal.getvalue(), '\033[38;5;9mERROR\033[0m m\n')
+        self.assertEqual(pipe.getvalue(), 'ERROR m\n')
+
+        handler = ColorHandler(io.StringIO())
+        handler.setFormatter(logging.Formatter('%(levelname)s'))
+        self.assertEqual(handler.format(_record('m')), 'INFO')
+
+    @unittest.skipIf(QueueHandler is None, 'no QueueHandler')
+    def test_queue_listener(self):
+        SwaANSI.setWHEN('ALWAYS')
+        records = queue.Queue()
+        logger = logging.getLogger('swajime.test.queue')
+        logger.propagate = False
+        logger.addHandler(QueueHandler(records))
+        stream = io.StringIO()
+        plain = io.StringIO()
+        listener = QueueListener(records, ColorHandler(stream),
+                                 logging.StreamHandler(plain))
+        listener.start()
+        try:
+            threads = [threading.Thread(target=logger.warning,
+                                        args=('thread %d', index))
+                       for index in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            listener.stop()
+            del logger.handlers[:]
+        lines = sorted(stream.getvalue().splitlines())
+        self.assertEqual(lines, ['\033[38;5;11mWARNING\033[0m:'
+                                 'swajime.test.queue:thread {}'.format(index)
+                                 for index in range(4)])
+        self.assertEqual(sorted(plain.getvalue().splitlines()),
+                         ['thread {}'.format(index) for index in range(4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+#
+
+"""Test the markup module"""
+
+import unittest
+
+from swajime import markup
+
+SwaANSI = markup.SwaANSI
+
+
+class TestMarkup(unittest.TestCase):
+    """Test compiling and rendering markup."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        SwaANSI.setColorDepth()
+        markup.clearCache()
+
+    def tearDown(self):
+        SwaANSI.setColorDepth()
+
+    def test_template(self):
+        self.assertEqual(markup.template('[Red on Yellow bold]{}[/] done'),
+                         '\033[38;5;9;48;5;11;1m{}\033[0m done')
+        self.assertEqual(markup.render('[Red on Yellow bold]{}[/] done',
+                                       'disk'),
+                         SwaANSI.wrap('disk', 'Red', 'Yellow', 'Bold') +
+                         ' done')
+        self.assertEqual(markup.template('[double underline Green]x[/]'),
+                         '\033[38;5;2;21mx\033[0m')
+        self.assertEqual(markup.template('[#ff8000]x'),
+                         '\033[38;5;208mx\033[0m')
+        SwaANSI.setColorDepth(1 << 24)
+        self.assertEqual(markup.template('[#ff8000]x[/]'),
+                         '\033[38;2;255;128;0mx\033[0m')
+
+    def test_nesting(self):
+        self.assertEqual(markup.template('[bold]a [Red]b[/] c[/] d'),
+                         '\033[1ma \033[38;5;9;1mb\033[0m\033[1m c'
+                         '\033[0m d')
+        self.assertEqual(markup.template('[Red on Blue]a[Green]b[/]c[/]'),
+                         '\033[38;5;9;48;5;12ma'
+                         '\033[38;5;2;48;5;12mb'
+                         '\033[0m\033[38;5;9;48;5;12mc\033[0m')
+
+    def test_literals(self):
+        self.assertEqual(markup.template(r'\[Red] [INFO] [{}] [/] []'),
+                         '[Red] [INFO] [{}] [/] []')
+        self.assertEqual(markup.template('[Red on]x'), '[Red on]x')
+        self.assertEqual(markup.render('[bold]{{{}}}[/]', 1),
+                         '\033[1m{1}\033[0m')
+
+    def test_strip(self):
+        text = r'[Red]{level}[/] \[x] [bold]{message}'
+        self.assertEqual(markup.strip(text), '{level} [x] {message}')
+        SwaANSI.setWHEN('NEVER')
+        self.assertEqual(markup.template(text), '{level} [x] {message}')
+        SwaANSI.setWHEN('ALWAYS')
+        self.assertEqual(markup.template(text),
+                         '\033[38;5;9m{level}\033[0m [x] \033[1m{message}'
+                         '\033[0m')
+
+    def test_cache(self):
+        text = '[Red]{}[/]'
+        self.assertIs(markup.template(text), markup.template(text))
+        instance = SwaANSI()
+        instance.setColorDepth(1 << 24)
+        self.assertEqual(markup.template('[#ff8000]x', instance),
+                         '\033[38;2;255;128;0mx\033[0m')
+        self.assertEqual(markup.template('[#ff8000]x'),
+                         '\033[38;5;208mx\033[0m')
+        saved = markup.CACHE_SIZE
+        markup.CACHE_SIZE = 2
+        try:
+            for index in range(5):
+                markup.template('[Red]{}[/]' + str(index))
+            self.assertLessEqual(len(markup._cache), 2)
+        finally:
+            markup.CACHE_SIZE = saved
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+#
+
+"""Test the progress module"""
+
+import io
+import unittest
+
+from swajime import progress
+from swajime.progress import Progress
+
+SwaANSI = progress.SwaANSI
+
+
+class FakeTerminal(io.StringIO):
+    """A StringIO that claims to be a terminal."""
+
+    def isatty(self):
+        return True
+
+
+class TestProgress(unittest.TestCase):
+    """Test the Progress class."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+
+    def test_live(self):
+        out = FakeTerminal()
+        bar = Progress(4, 'job', out, rate=0.001, bar_width=4, width=200)
+        bar.count = 2
+        bar.status = 'b'
+        self.assertTrue(bar.refresh())
+        # the next draw is not due for 1000 seconds
+        bar.count = 3
+        self.assertFalse(bar.refresh())
+        written = out.getvalue()
+        self.assertTrue(written.startswith(
+            '\r\033[1mjob\033[0m [\033[38;5;2m##\033[0m--] 2/4  50.0% '))
+        self.assertIn(' ETA ', written)
+        self.assertTrue(written.endswith(' \033[38;5;244mb\033[0m\033[K'))
+
+        bar.close()
+        bar.close()
+        final = out.getvalue()[len(written):]
+        self.assertTrue(final.startswith('\r\033[1mjob\033[0m '
+                                         '[\033[38;5;2m###\033[0m-]'))
+        self.assertTrue(final.endswith('\033[K\n'))
+        self.assertEqual(final.count('\n'), 1)
+
+    def test_plain(self):
+        # not a terminal: plain lines every interval
+        out = io.StringIO()
+        log = Progress(None, 'job', out, interval=1000)
+        log.count = 5
+        self.assertTrue(log.refresh())
+        log.count = 6
+        self.assertFalse(log.refresh())
+        self.assertTrue(log.refresh(force=True))
+        lines = out.getvalue().split('\n')
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('job 5 '))
+        self.assertTrue(lines[1].startswith('job 6 '))
+        self.assertNotIn('\033', out.getvalue())
+
+        # color disabled: plain lines on a terminal too
+        SwaANSI.setWHEN('NEVER')
+        out = FakeTerminal()
+        with Progress(2, stream=out, timer=False) as plain:
+            plain.count = 2
+        self.assertEqual(out.getvalue().count('\n'), 1)
+        self.assertTrue(out.getvalue().startswith(
+            '[' + '#' * 30 + '] 2/2 100.0% '))
+
+    def test_timer(self):
+        out = io.StringIO()
+        with Progress(10, stream=out, interval=0.01) as timed:
+            for _ in range(10):
+                timed.count += 1
+            timed._stopped.wait(0.05)
+        self.assertGreater(out.getvalue().count('\n'), 1)
+        self.assertIn('10/10 100.0%', out.getvalue().split('\n')[-2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+#
+
+"""Test the screen module"""
+
+import io
+import unittest
+
+from swajime import screen
+from swajime.screen import Screen
+
+SwaANSI = screen.SwaANSI
+
+
+class TestScreen(unittest.TestCase):
+    """Test the Screen class."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+
+    def test_render(self):
+        grid = Screen(4, 2)
+        red = grid.style('Red')
+        self.assertEqual(grid.style('RED'), red)
+        self.assertEqual(grid.style(None), 0)
+        grid.put(1, 0, 'ab', red)
+        self.assertEqual(grid.render(),
+                         '\033[1;1H\033[0m \033[0;38;5;9mab\033[0m '
+                         '\033[2;1H    ')
+        # nothing changed, nothing written
+        self.assertEqual(grid.render(), '')
+
+        grid.put(3, 1, 'z')
+        self.assertEqual(grid.render(), '\033[2;4Hz')
+        grid.put(2, 0, 'b', red)
+        self.assertEqual(grid.render(), '')
+
+        # close changes are joined, distant ones get a cursor move
+        wide = Screen(20, 1)
+        wide.render()
+        wide.put(0, 0, 'a')
+        wide.put(3, 0, 'b')
+        wide.put(19, 0, 'c')
+        self.assertEqual(wide.render(),
+                         '\033[1;1Ha  b\033[1;20Hc')
+
+        wide.invalidate()
+        self.assertEqual(len(wide.render()), len('\033[1;1H\033[0m') + 20)
+
+    def test_clip(self):
+        grid = Screen(3, 1)
+        grid.put(-1, 0, 'abcd')
+        grid.put(0, 5, 'x')
+        grid.put(5, 0, 'x')
+        self.assertEqual(grid.render(), '\033[1;1H\033[0mbcd')
+        grid.fill('-')
+        self.assertEqual(grid.render(), '\033[1;1H---')
+
+    def test_never(self):
+        SwaANSI.setWHEN('NEVER')
+        grid = Screen(2, 1)
+        grid.put(0, 0, 'ab', grid.style('Red'))
+        # no escapes other than cursor moves
+        self.assertEqual(grid.render(), '\033[1;1Hab')
+        grid.invalidate()
+        self.assertEqual(grid.render(), '\033[1;1Hab')
+
+    def test_flush(self):
+        out = io.StringIO()
+        grid = Screen(2, 1, out, fps=1)
+        self.assertTrue(grid.flush())
+        grid.put(0, 0, 'x')
+        self.assertFalse(grid.flush())
+        self.assertEqual(out.getvalue(), '\033[1;1H\033[0m  ')
+        self.assertTrue(grid.flush(force=True))
+        self.assertEqual(out.getvalue(), '\033[1;1H\033[0m  \033[1;1Hx')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+#
+
+"""Test the style module"""
+
+import pickle
+import threading
+import unittest
+
+from swajime import style
+from swajime.style import Style, using
+
+
+class TestStyle(unittest.TestCase):
+    """Test the Style class and using."""
+
+    def setUp(self):
+        self.ansi = style._ansi()
+        self.ansi.setWHEN('ALWAYS')
+        self.ansi.setDefaults()
+        self.ansi.setColorDepth()
+
+    def tearDown(self):
+        self.ansi.setColorDepth()
+
+    def test_value(self):
+        red = Style('Red', None, 'Bold')
+        self.assertEqual(red, Style('RED', None, 'bold', 'BOLD'))
+        self.assertEqual(hash(red), hash(Style('red', None, 'Bold')))
+        self.assertNotEqual(red, Style('Red'))
+        self.assertEqual(Style('#f00'), Style(background=None,
+                                              foreground=(255, 0, 0)))
+        self.assertEqual(len(set([red, Style('red', None, 'bold'),
+                                  Style('Blue')])), 2)
+        self.assertEqual(repr(red), "Style('red', None, 'bold')")
+        self.assertEqual(pickle.loads(pickle.dumps(red)), red)
+        self.assertEqual(Style('NotAColor', 'Blue', 'NotAStyle'),
+                         Style(None, 'Blue'))
+
+        with self.assertRaises(AttributeError):
+            red.foreground = 'Blue'
+        with self.assertRaises(AttributeError):
+            red.extra = 1
+        with self.assertRaises(AttributeError):
+            del red.styles
+
+    def test_combine(self):
+        base = Style('Red', 'Blue', 'Bold')
+        self.assertEqual(base + Style('Green', None, 'Underline'),
+                         Style('Green', 'Blue', 'Bold', 'Underline'))
+        self.assertEqual(base | Style(None, 'Yellow', 'Bold'),
+                         Style('Red', 'Yellow', 'Bold'))
+        with self.assertRaises(TypeError):
+            base + 'Red'
+
+    def test_wrap(self):
+        red = Style('Red', None, 'Bold')
+        self.assertEqual(red.prefix(), '\033[38;5;9;1m')
+        self.assertEqual(red.wrap('a'), '\033[38;5;9;1ma\033[0m')
+        self.assertEqual(red.template('{:>3}').format(1),
+                         '\033[38;5;9;1m  1\033[0m')
+        self.assertEqual(Style().wrap('a'), 'a')
+
+        orange = Style('#ff8000')
+        self.assertEqual(orange.prefix(1 << 24), '\033[38;2;255;128;0m')
+        self.assertEqual(orange.prefix(256), '\033[38;5;208m')
+
+        self.assertEqual(self.ansi.wrap('a', red), red.wrap('a'))
+        # background and styles given with a Style override its own
+        self.assertEqual(self.ansi.wrap('a', red, 'Blue'),
+                         '\033[38;5;9;48;5;12;1ma\033[0m')
+        self.assertEqual(self.ansi.wrap('a', red, None, 'Underline'),
+                         '\033[38;5;9;4ma\033[0m')
+        self.assertEqual(self.ansi.wrapBytes(b'a', red, 'Blue', 'Underline'),
+                         b'\033[38;5;9;48;5;12;4ma\033[0m')
+        self.assertEqual(self.ansi.wrapEach(['a', 'b'], [red, None]),
+                         [red.wrap('a'), 'b'])
+        self.ansi.setWHEN('NEVER')
+        self.assertEqual(red.wrap('a'), 'a')
+        self.assertEqual(red.template(), '{}')
+
+    def test_using(self):
+        ansi = self.ansi
+        ansi.setDefaults('Blue')
+        green = Style('Green')
+        instance = ansi('Red')
+        with using(green):
+            self.assertIs(style.current(), green)
+            self.assertEqual(ansi.wrap('a'), green.wrap('a'))
+            self.assertEqual(ansi.wrap('a', None, 'Grey0'),
+                             ansi.wrap('a', 'Green', 'Grey0'))
+            self.assertEqual(ansi.template(), green.template())
+            self.assertEqual(instance.wrap('a'), '\033[38;5;9ma\033[0m')
+
+            # other threads keep the class defaults
+            seen = []
+            thread = threading.Thread(target=lambda: seen.append(
+                ansi.wrap('a')))
+            thread.start()
+            thread.join()
+            self.assertEqual(seen, ['\033[38;5;12ma\033[0m'])
+        self.assertIsNone(style.current())
+        self.assertEqual(ansi.wrap('a'), '\033[38;5;12ma\033[0m')
+
+    def test_using_contexts(self):
+        if style.ContextVar is None:
+            self.skipTest('contextvars is not available')
+        import contextvars
+        ansi = self.ansi
+
+        # asyncio runs each task in a copy of the context, as here
+        def task(color):
+            with using(Style(color)):
+                inner = contextvars.copy_context().run(ansi.wrap, 'b')
+                return ansi.wrap('a'), inner
+
+        red = contextvars.copy_context().run(task, 'Red')
+        self.assertEqual(red, (Style('Red').wrap('a'),
+                               Style('Red').wrap('b')))
+        self.assertEqual(ansi.wrap('a'), 'a')
+
+if __name__ == '__main__':
+    unittest.main()
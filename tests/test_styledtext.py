@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+#
+
+"""Test the styledtext module"""
+
+import sys
+import unittest
+
+from swajime import Style
+from swajime import styledtext
+from swajime.styledtext import StyledText
+
+SwaANSI = sys.modules['swajime.SwaANSI'].SwaANSI
+
+
+class TestStyledText(unittest.TestCase):
+    """Test building, slicing and rendering styled text."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        SwaANSI.setColorDepth()
+        styledtext.clearCache()
+
+    def tearDown(self):
+        SwaANSI.setWHEN('AUTO')
+
+    def test_render(self):
+        text = StyledText('a ').append('b', 'Red').append('c', 'Red')
+        text.append(' d', ('Blue', None, 'Bold'))
+        self.assertEqual(text.render(),
+                         'a \033[38;5;9mbc\033[0m\033[38;5;12;1m d\033[0m')
+        self.assertEqual(str(text), text.render())
+        self.assertEqual(text.plain(), 'a bc d')
+        self.assertEqual(len(text), 6)
+        self.assertEqual(StyledText().render(), '')
+        self.assertEqual(StyledText('x', Style('Red')).render(),
+                         SwaANSI.wrap('x', 'Red'))
+        self.assertEqual(StyledText('x', ['Red', None, 'Bold']).render(),
+                         SwaANSI.wrap('x', 'Red', None, 'Bold'))
+        self.assertEqual(StyledText('x', (None, None)).render(), 'x')
+
+    def test_nesting(self):
+        text = StyledText()
+        with text.styled(('Red', None, 'Bold')):
+            text.append('one ')
+            text.append('two', 'Blue')
+            text.push((None, None, 'Underline'))
+            text.append(' three')
+            text.pop()
+            text.append(' four')
+        text.append(' five')
+        # the outer style is applied again after the inner reset
+        self.assertEqual(text.render(),
+                         '\033[38;5;9;1mone \033[0m'
+                         '\033[38;5;12;1mtwo\033[0m'
+                         '\033[38;5;9;1;4m three\033[0m'
+                         '\033[38;5;9;1m four\033[0m five')
+        self.assertRaises(IndexError, text.pop)
+
+        inner = StyledText('x').append('y', 'Blue')
+        outer = StyledText()
+        with outer.styled('Red'):
+            outer.extend(inner)
+        self.assertEqual(outer.render(),
+                         '\033[38;5;9mx\033[0m\033[38;5;12my\033[0m')
+
+    def test_slice(self):
+        text = StyledText('ab').append('cd', 'Red').append('ef', 'Blue')
+        self.assertEqual(text[1:5].render(),
+                         'b\033[38;5;9mcd\033[0m\033[38;5;12me\033[0m')
+        self.assertEqual(len(text[1:5]), 4)
+        self.assertEqual(text[-1].render(), '\033[38;5;12mf\033[0m')
+        self.assertEqual(text[:].plain(), 'abcdef')
+        self.assertEqual(text[4:2].plain(), '')
+        self.assertEqual(len(text[4:2]), 0)
+        self.assertEqual(text[2:4], StyledText('cd', 'Red'))
+        self.assertRaises(IndexError, lambda: text[6])
+        self.assertRaises(ValueError, lambda: text[::2])
+
+        joined = text[:2] + text[2:] + '!'
+        self.assertEqual(joined.plain(), 'abcdef!')
+        self.assertEqual(len(joined), 7)
+
+    def test_never(self):
+        text = StyledText('a', 'Red')
+        with text.styled('Blue'):
+            text.append('b')
+        SwaANSI.setWHEN('NEVER')
+        self.assertEqual(text.render(), 'ab')
+        self.assertEqual(str(text), 'ab')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,10 +4,9 @@
 """Test the SwaANSI module"""
 
 import os
-import shutil
 import sys
-import time
 import unittest
+import warnings
 
 # reload is needed for one of the tests
 if sys.version_info[0] == 3:
@@ -35,24 +34,119 @@ class TestSwaANSI(unittest.TestCase):
         reload(swajime)
         from swajime import SwaANSI
 
-        found_after = os.path.exists(os.path.join(home, 'dat',
-                                                  'color_data.json'))
+        SwaANSI.setWHEN('ALWAYS')
+        green_background = SwaANSI.wrap('test', None, 'GREEN')
+
+        # the bundled color table is used, nothing is downloaded
+        found_after = os.path.exists(os.path.join(home, 'dat'))
 
         if os.path.exists(os.path.join(home, 'dat-bak')):
-            if os.path.exists(os.path.join(home, 'dat')):
-                shutil.rmtree(os.path.join(home, 'dat'))
             os.rename(os.path.join(home, 'dat-bak'), os.path.join(home, 'dat'))
 
-        # fix for some random race condition
-        while not os.path.exists(os.path.join(home, 'dat', 'color_data.json')):
-            time.sleep(1)
-
         assert not found_before
-        assert found_after
+        assert not found_after
 
-        green_background = SwaANSI.wrap('test', None, 'GREEN')
         self.assertEqual(green_background, '\033[48;5;2mtest\033[0m')
 
+    def test_import_time(self):
+        if sys.version_info < (3, 7):
+            self.skipTest('python -X importtime requires Python 3.7')
+
+        import subprocess
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        process = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', '-c',
+             'import swajime; print(swajime.SwaANSI._color_table is None)'],
+            cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True)
+        out, err = process.communicate()
+        self.assertEqual(process.returncode, 0, err)
+
+        # the color table is built lazily
+        self.assertEqual(out.strip(), 'True')
+
+        cumulative = {}
+        for line in err.splitlines():
+            if not line.startswith('import time:') or '[us]' in line:
+                continue
+            fields = line.split('|')
+            cumulative[fields[2].strip()] = int(fields[1])
+
+        self.assertNotIn('requests', cumulative)
+        self.assertNotIn('json', cumulative)
+        self.assertNotIn('swajime._color_data', cumulative)
+        self.assertLess(cumulative['swajime'], 50000,
+                        'Importing swajime should take well under 50ms.')
+
+    def test_color_cache(self):
+        import json
+        import shutil
+        import tempfile
+        SwaANSI = sys.modules['swajime.SwaANSI'].SwaANSI
+
+        def color(color_id, name, r):
+            return {'colorId': color_id, 'name': name,
+                    'hexString': '#{:02x}0000'.format(r),
+                    'rgb': {'r': r, 'g': 0, 'b': 0},
+                    'hsl': {'h': 0, 's': 100, 'l': 50}}
+
+        def save(colors, mtime):
+            with open(color_path, 'w') as color_file:
+                json.dump(colors, color_file, indent=4)
+            os.utime(color_path, (mtime, mtime))
+
+        home = os.environ.get('HOME')
+        directory = tempfile.mkdtemp()
+        color_path = os.path.join(directory, 'dat', 'color_data.json')
+        cache_path = os.path.join(directory, 'dat', 'color_data.cache')
+        os.mkdir(os.path.dirname(color_path))
+        os.environ['HOME'] = directory
+        try:
+            save([color(0, 'Dark', 10), color(1, 'Grey', 20),
+                  color(2, 'Grey', 30), color(3, 'GREY', 40)], 1000000)
+            SwaANSI._loadColors()
+            self.assertTrue(os.path.exists(cache_path))
+            # duplicate names mean the first color with the name
+            self.assertEqual(SwaANSI.colors, ('Dark', 'Grey', 'GREY'))
+            self.assertEqual(SwaANSI._colors['Grey'], 1)
+            self.assertEqual(SwaANSI._colors['grey'], 1)
+            self.assertEqual(SwaANSI._colors['GREY'], 3)
+            self.assertEqual(SwaANSI._color_id_names,
+                             {0: ('Dark',), 1: ('Grey',), 3: ('GREY',)})
+            self.assertEqual(SwaANSI._color_rgbs[2], (30, 0, 0))
+
+            # the cache is used while the JSON is unchanged
+            os.utime(cache_path, (0, 0))
+            SwaANSI._loadColors()
+            self.assertEqual(os.stat(cache_path).st_mtime, 0)
+
+            # a JSON with new contents rebuilds it
+            save([color(0, 'Dark', 10), color(1, 'Light', 250)], 1000000)
+            SwaANSI._loadColors()
+            self.assertEqual(SwaANSI.colors, ('Dark', 'Light'))
+
+            # a JSON only touched keeps the tables
+            save([color(0, 'Dark', 10), color(1, 'Light', 250)], 2000000)
+            with open(cache_path, 'rb') as cache_file:
+                before = cache_file.read()
+            SwaANSI._loadColors()
+            with open(cache_path, 'rb') as cache_file:
+                self.assertNotEqual(cache_file.read(), before)
+            self.assertEqual(SwaANSI._color_id_names[1], ('Light',))
+
+            # an unreadable cache is rebuilt
+            with open(cache_path, 'wb') as cache_file:
+                cache_file.write(b'\x00garbage')
+            SwaANSI._loadColors()
+            self.assertEqual(SwaANSI.colors, ('Dark', 'Light'))
+        finally:
+            if home is None:
+                del os.environ['HOME']
+            else:
+                os.environ['HOME'] = home
+            shutil.rmtree(directory)
+            SwaANSI._loadColors()
+
     def test_class__init__(self):
         if 'swajime' in sys.modules:
             del sys.modules['swajime.SwaANSI']
@@ -157,6 +251,293 @@ class TestSwaANSI(unittest.TestCase):
         self.assertEqual(green_background.wrap(''),
                          '')
 
+    def test_prefix_cache(self):
+        if 'swajime' in sys.modules:
+            del sys.modules['swajime.SwaANSI']
+        import swajime
+        reload(swajime)
+        from swajime import SwaANSI, Style
+        from swajime.style import using
+
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        SwaANSI.clearCache()
+
+        self.assertEqual(SwaANSI.wrap('test', 'RED', None, 'UNDERLINE'),
+                         '\033[38;5;9;4mtest\033[0m')
+        self.assertEqual(SwaANSI.wrap('test', 'RED', None, 'UNDERLINE'),
+                         '\033[38;5;9;4mtest\033[0m')
+        info = SwaANSI.cacheInfo()
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['size'], 1)
+
+        # names in any case share an entry
+        SwaANSI.wrap('test', 'red', None, 'Underline')
+        info = SwaANSI.cacheInfo()
+        self.assertEqual((info['misses'], info['hits']), (1, 2))
+        self.assertEqual(info['size'], 1)
+
+        # the defaults and the Style of using() fill what is not given
+        SwaANSI.setDefaults(None, None, 'Bold')
+        self.assertEqual(SwaANSI.wrap('test', 'RED'),
+                         '\033[38;5;9;1mtest\033[0m')
+        with using(Style(None, 'Blue', 'Underline')):
+            self.assertEqual(SwaANSI.wrap('test', 'RED'),
+                             '\033[38;5;9;48;5;12;4mtest\033[0m')
+        self.assertEqual(SwaANSI.wrap('test', 'RED'),
+                         '\033[38;5;9;1mtest\033[0m')
+        SwaANSI.setDefaults()
+        self.assertEqual(SwaANSI.wrap('test', 'RED'),
+                         '\033[38;5;9mtest\033[0m')
+
+        # invalid names are cached too, and only reported once
+        SwaANSI.setErrorPolicy('ignore')
+        SwaANSI.wrap('test', 'RED', None, 'UNDERLINE')
+        SwaANSI.wrap('test', 'INVALID')
+        self.assertEqual(SwaANSI.cacheInfo()['size'], 2)
+        SwaANSI.setErrorPolicy('warn')
+        SwaANSI.clearCache()
+        SwaANSI.wrap('test', 'RED', None, 'UNDERLINE')
+
+        SwaANSI.setCacheSize(2)
+        SwaANSI.wrap('test', 'GREEN')
+        SwaANSI.wrap('test', 'BLUE')
+        info = SwaANSI.cacheInfo()
+        self.assertEqual(info['size'], 2)
+        self.assertEqual(info['evictions'], 1)
+
+        # changing WHEN invalidates the cache
+        SwaANSI.setWHEN('NEVER')
+        self.assertEqual(SwaANSI.cacheInfo()['size'], 0)
+        self.assertEqual(SwaANSI.wrap('test', 'RED'), 'test')
+
+        SwaANSI.setCacheSize(256)
+        SwaANSI.clearCache()
+        self.assertEqual(SwaANSI.cacheInfo()['hits'], 0)
+
+    def test_error_policy(self):
+        if 'swajime' in sys.modules:
+            del sys.modules['swajime.SwaANSI']
+        import swajime
+        reload(swajime)
+        from swajime import SwaANSI
+        from swajime.SwaANSI import InvalidNameWarning
+
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        SwaANSI.clearCache()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for _ in range(3):
+                self.assertEqual(SwaANSI.wrap('test', 'INVALID', None,
+                                              'BOLD'),
+                                 '\033[1mtest\033[0m')
+            SwaANSI.wrap('test', 'INVALID', 'GREEN')
+            SwaANSI('INVALID')
+        self.assertEqual([str(warning.message) for warning in caught],
+                         ['Foreground color INVALID is not available.'])
+        self.assertIs(caught[0].category, InvalidNameWarning)
+        self.assertEqual(SwaANSI.invalidLookups(), {'INVALID': 5})
+        info = SwaANSI.cacheInfo()
+        self.assertEqual((info['misses'], info['hits']), (2, 2))
+
+        SwaANSI.setErrorPolicy('RAISE')
+        self.assertEqual(SwaANSI.cacheInfo()['size'], 0)
+        with self.assertRaises(ValueError):
+            SwaANSI.wrap('test', None, None, 'NOSTYLE')
+        with self.assertRaises(ValueError):
+            SwaANSI.setBackground('INVALID')
+        with self.assertRaises(ValueError):
+            SwaANSI.wrap('test', [1, 2])
+        self.assertEqual(SwaANSI.invalidLookups(),
+                         {'INVALID': 6, 'NOSTYLE': 1, '[1, 2]': 1})
+
+        SwaANSI.setErrorPolicy('ignore')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertEqual(SwaANSI.wrap('test', 'OTHER'), 'test')
+        self.assertEqual(caught, [])
+        with self.assertRaises(ValueError):
+            SwaANSI.setErrorPolicy('loud')
+
+        SwaANSI.clearCache()
+        self.assertEqual(SwaANSI.invalidLookups(), {})
+        SwaANSI.setErrorPolicy('warn')
+
+    def test_object_compiled(self):
+        if 'swajime' in sys.modules:
+            del sys.modules['swajime.SwaANSI']
+        import swajime
+        reload(swajime)
+        from swajime import SwaANSI
+
+        SwaANSI.setWHEN('ALWAYS')
+        red_error = SwaANSI('RED', None, 'DOUBLE UNDERLINE')
+        self.assertEqual(red_error.wrap('test'),
+                         '\033[38;5;9;21mtest\033[0m')
+        self.assertEqual(red_error.template().format('test'),
+                         '\033[38;5;9;21mtest\033[0m')
+        self.assertEqual(red_error.template('{0:>6}').format('test'),
+                         '\033[38;5;9;21m  test\033[0m')
+
+        red_error.setDefaults('GREEN')
+        self.assertEqual(red_error.wrap('test'),
+                         '\033[38;5;2mtest\033[0m')
+        # overrides still take the slow path
+        self.assertEqual(red_error.wrap('test', 'RED'),
+                         '\033[38;5;9mtest\033[0m')
+
+        SwaANSI.setWHEN('NEVER')
+        self.assertEqual(red_error.wrap('test'), 'test')
+        self.assertEqual(red_error.template(), '{}')
+        SwaANSI.setWHEN('ALWAYS')
+
+    def test_wrap_bytes(self):
+        if 'swajime' in sys.modules:
+            del sys.modules['swajime.SwaANSI']
+        import swajime
+        reload(swajime)
+        from swajime import SwaANSI
+
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        self.assertEqual(SwaANSI.wrapBytes(b'test', 'RED'),
+                         b'\033[38;5;9mtest\033[0m')
+        self.assertEqual(SwaANSI.wrapBytes(bytearray(b'test'), None,
+                                           'GREEN'),
+                         b'\033[48;5;2mtest\033[0m')
+        self.assertEqual(SwaANSI.wrapBytes(memoryview(b'\xfftest')[1:],
+                                           'RED'),
+                         b'\033[38;5;9mtest\033[0m')
+        self.assertEqual(SwaANSI.wrapBytes(b''), b'')
+
+        red_error = SwaANSI('RED', None, 'DOUBLE UNDERLINE')
+        self.assertEqual(red_error.wrapBytes(b'\xff'),
+                         b'\033[38;5;9;21m\xff\033[0m')
+        self.assertEqual(red_error.wrapBytes(b'test'),
+                         red_error.wrap('test').encode('ascii'))
+
+        SwaANSI.setWHEN('NEVER')
+        data = b'test'
+        self.assertIs(red_error.wrapBytes(data), data)
+        SwaANSI.setWHEN('ALWAYS')
+
+    def test_batch_wrap(self):
+        if 'swajime' in sys.modules:
+            del sys.modules['swajime.SwaANSI']
+        import swajime
+        reload(swajime)
+        from swajime import SwaANSI
+
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        red = '\033[38;5;9m{}\033[0m'
+        green = '\033[48;5;2m{}\033[0m'
+
+        self.assertEqual(SwaANSI.wrapMany(['a', '', None, 'b'], 'RED'),
+                         [red.format('a'), '', None, red.format('b')])
+        self.assertEqual(SwaANSI.wrapMany(iter(['a'])), ['a'])
+
+        green_background = SwaANSI(None, 'GREEN')
+        self.assertEqual(
+            SwaANSI.wrapEach(['a', 'b', 'c', 'd', None],
+                             ['RED', (None, 'GREEN'), green_background,
+                              None, 'RED']),
+            [red.format('a'), green.format('b'), green.format('c'), 'd',
+             None])
+        self.assertEqual(green_background.wrapMany(['a']),
+                         [green.format('a')])
+
+        self.assertEqual(
+            list(SwaANSI.wrapColumns([['a', 'b', 'c'], ['d', '', 'f']],
+                                     ['RED', green_background])),
+            [[red.format('a'), green.format('b'), 'c'],
+             [red.format('d'), '', 'f']])
+
+        SwaANSI.setWHEN('NEVER')
+        self.assertEqual(SwaANSI.wrapMany(['a'], 'RED'), ['a'])
+        self.assertEqual(SwaANSI.wrapEach(['a'], ['RED']), ['a'])
+        self.assertEqual(list(SwaANSI.wrapColumns([('a',)], ['RED'])),
+                         [['a']])
+        SwaANSI.setWHEN('ALWAYS')
+
+    def test_rgb_colors(self):
+        if 'swajime' in sys.modules:
+            del sys.modules['swajime.SwaANSI']
+        import swajime
+        reload(swajime)
+        from swajime import SwaANSI
+        from swajime import terminal
+
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+
+        SwaANSI.setColorDepth(terminal.TRUECOLOR)
+        self.assertEqual(SwaANSI.wrap('test', '#ff8000', (1, 2, 3)),
+                         '\033[38;2;255;128;0;48;2;1;2;3mtest\033[0m')
+        self.assertEqual(SwaANSI.wrap('test', '#f80'),
+                         '\033[38;2;255;136;0mtest\033[0m')
+        # named colors keep using the 256 color table
+        self.assertEqual(SwaANSI.wrap('test', 'RED'),
+                         '\033[38;5;9mtest\033[0m')
+
+        SwaANSI.setColorDepth(256)
+        self.assertEqual(SwaANSI.wrap('test', '#ff8700'),
+                         '\033[38;5;208mtest\033[0m')
+        self.assertEqual(SwaANSI.wrap('test', None, (8, 8, 8)),
+                         '\033[48;5;232mtest\033[0m')
+
+        SwaANSI.setColorDepth(16)
+        self.assertEqual(SwaANSI.wrap('test', (250, 0, 0), (0, 0, 128)),
+                         '\033[91;44mtest\033[0m')
+
+        heat = SwaANSI((255, 0, 0))
+        self.assertEqual(heat.wrap('test'), '\033[91mtest\033[0m')
+        self.assertEqual(SwaANSI.wrapEach(['a', 'b'], [(255, 0, 0), None]),
+                         ['\033[91ma\033[0m', 'b'])
+
+        self.assertEqual(SwaANSI.wrap('test', '#ff80', (256, 0, 0)), 'test')
+        SwaANSI.setColorDepth()
+
+    def test_quantizer(self):
+        if 'swajime' in sys.modules:
+            del sys.modules['swajime.SwaANSI']
+        import swajime
+        reload(swajime)
+        from swajime import SwaANSI
+        from swajime._color_data import COLOR_DATA
+
+        def nearest(r, g, b, low, high):
+            return min((r - color[3][0]) ** 2 + (g - color[3][1]) ** 2 +
+                       (b - color[3][2]) ** 2 for color in COLOR_DATA
+                       if low <= color[0] < high)
+
+        def distance(color_id, r, g, b):
+            rgb = COLOR_DATA[color_id][3]
+            return (r - rgb[0]) ** 2 + (g - rgb[1]) ** 2 + (b - rgb[2]) ** 2
+
+        quantizer = SwaANSI.quantizer()
+        colors = [(r, g, b) for r in range(0, 256, 15)
+                  for g in range(3, 256, 21) for b in range(7, 256, 25)]
+        for (r, g, b), color_id in zip(colors, quantizer.quantizeMany(colors)):
+            self.assertEqual(distance(color_id, r, g, b),
+                             nearest(r, g, b, 16, 256))
+        for (r, g, b), color_id in zip(colors,
+                                       quantizer.quantizeMany(colors, 16)):
+            self.assertEqual(distance(color_id, r, g, b),
+                             nearest(r, g, b, 0, 16))
+        # any iterable, read once
+        for depth in (256, 16):
+            self.assertEqual(quantizer.quantizeMany(iter(colors), depth),
+                             quantizer.quantizeMany(colors, depth))
+            self.assertEqual(
+                quantizer.quantizeMany((color for color in colors), depth),
+                quantizer.quantizeMany(colors, depth))
+        self.assertEqual(quantizer.nearest256(255, 135, 0), 208)
+        self.assertEqual(quantizer.nearest16(0, 0, 0), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#
+
+"""Test the table module"""
+
+import io
+import unittest
+
+from swajime import table
+from swajime.table import Table
+
+SwaANSI = table.SwaANSI
+
+BOLD = '\033[1m{}\033[0m'
+GREEN = '\033[38;5;2m{}\033[0m'
+RED = '\033[38;5;9m{}\033[0m'
+
+
+class TestTable(unittest.TestCase):
+    """Test the Table class."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+
+    def test_plain(self):
+        SwaANSI.setWHEN('NEVER')
+        rows = [('web1', 'ok', 12.5), ('db10', 'down', 250.0), ('x', None)]
+        lines = list(Table(['host', 'status', 'ms']).lines(rows))
+        self.assertEqual(lines, ['host  status     ms',
+                                 'web1  ok       12.5',
+                                 'db10  down    250.0',
+                                 'x'])
+        lines = list(Table(['host', 'ms'], align=['>', '^'],
+                           formats=[None, '{:.0f}'], separator='|')
+                     .lines([('a', 1.0), ('bb', 2048.0)]))
+        self.assertEqual(lines, ['host| ms', '   a| 1', '  bb|2048'])
+
+    def test_colors(self):
+        rows = [('web1', 'ok'), ('db1', 'down')]
+        styled = Table(['host', 'status'], styles=[None, 'Green'],
+                       conditions=[(1, lambda value: value != 'ok', 'Red')])
+        self.assertEqual(list(styled.lines(rows)), [
+            BOLD.format('host') + '  ' + BOLD.format('status'),
+            'web1  ' + GREEN.format('ok'),
+            'db1   ' + RED.format('down')])
+
+        # widths are measured on the raw text, not the escapes
+        no_header = Table(['host', 'status'], styles=['Green', 'Green'],
+                          header=False)
+        self.assertEqual(list(no_header.lines(rows))[1],
+                         GREEN.format('db1') + '   ' + GREEN.format('down'))
+
+    def test_streaming(self):
+        SwaANSI.setWHEN('NEVER')
+        consumed = []
+
+        def rows():
+            for index in range(10):
+                consumed.append(index)
+                yield ('x' * index, index)
+
+        sampled = Table(['name', 'n'], sample=3, header=False).lines(rows())
+        self.assertEqual(next(sampled), '    0')
+        self.assertEqual(consumed, [0, 1, 2])
+        remaining = list(sampled)
+        # later rows are cut to the sampled width
+        self.assertEqual(remaining[-1], u'x…  9')
+
+        consumed[:] = []
+        declared = Table(['name', 'n'], widths=[4, 2]).lines(rows())
+        self.assertEqual(next(declared), 'name  n')
+        self.assertEqual(next(declared), '       0')
+        self.assertEqual(consumed, [0])
+
+    def test_write(self):
+        out = io.StringIO()
+        saved = table.WRITE_LINES
+        table.WRITE_LINES = 2
+        try:
+            Table(['n'], header=False).write(([index] for index in range(5)),
+                                             out)
+        finally:
+            table.WRITE_LINES = saved
+        self.assertEqual(out.getvalue(), '0\n1\n2\n3\n4\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+#
+
+"""Test the terminal module"""
+
+import io
+import unittest
+
+from swajime import terminal
+
+
+class FakeTerminal(io.StringIO):
+    """A StringIO that claims to be a terminal and counts isatty calls."""
+
+    calls = 0
+
+    def isatty(self):
+        self.calls += 1
+        return True
+
+
+class TestTerminal(unittest.TestCase):
+    """Test capability detection."""
+
+    def test_detect(self):
+        tty = FakeTerminal()
+        pipe = io.StringIO()
+
+        self.assertEqual(terminal.detect(pipe, {'TERM': 'xterm-256color'}),
+                         (False, False, terminal.NO_COLOR))
+        self.assertEqual(terminal.detect(tty, {'TERM': 'xterm'}),
+                         (True, True, terminal.COLORS_16))
+        self.assertEqual(terminal.detect(tty, {'TERM': 'xterm-256color'}),
+                         (True, True, terminal.COLORS_256))
+        self.assertEqual(terminal.detect(tty, {'TERM': 'xterm-256color',
+                                               'COLORTERM': 'truecolor'}),
+                         (True, True, terminal.TRUECOLOR))
+        self.assertEqual(terminal.detect(tty, {'TERM': 'dumb'}),
+                         (True, False, terminal.NO_COLOR))
+        self.assertEqual(terminal.detect(tty, {'TERM': 'xterm',
+                                               'NO_COLOR': '1'}),
+                         (True, False, terminal.NO_COLOR))
+        self.assertEqual(terminal.detect(tty, {'TERM': 'xterm',
+                                               'NO_COLOR': ''}),
+                         (True, True, terminal.COLORS_16))
+
+        self.assertEqual(terminal.detect(pipe, {'FORCE_COLOR': '2'}),
+                         (False, True, terminal.COLORS_256))
+        self.assertEqual(terminal.detect(pipe, {'FORCE_COLOR': '1',
+                                                'NO_COLOR': '1',
+                                                'COLORTERM': '24bit'}),
+                         (False, True, terminal.TRUECOLOR))
+        self.assertEqual(terminal.detect(tty, {'FORCE_COLOR': '0'}),
+                         (True, False, terminal.NO_COLOR))
+
+    def test_probe_cache(self):
+        tty = FakeTerminal()
+        first = terminal.probe(tty)
+        self.assertIs(terminal.probe(tty), first)
+        self.assertEqual(tty.calls, 1)
+
+        terminal.invalidate(tty)
+        terminal.probe(tty)
+        self.assertEqual(tty.calls, 2)
+
+        terminal.invalidate()
+        terminal.probe(tty)
+        self.assertEqual(tty.calls, 3)
+
+    def test_swaansi_auto(self):
+        from swajime import SwaANSI
+        tty = FakeTerminal()
+        red = SwaANSI('RED')
+
+        SwaANSI.setWHEN('AUTO')
+        red.setStream(io.StringIO())
+        self.assertEqual(red.wrap('test'), 'test')
+        red.setStream(tty)
+        expected = 'test' if not terminal.probe(tty).color else \
+            '\033[38;5;9mtest\033[0m'
+        self.assertEqual(red.wrap('test'), expected)
+        red.wrap('test')
+        self.assertEqual(tty.calls, 1)
+        SwaANSI.setWHEN('ALWAYS')
+
+
+if __name__ == '__main__':
+    unittest.main()
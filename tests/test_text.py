@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+
+"""Test the text module"""
+
+import unittest
+
+from swajime import text
+
+RED = '\033[38;5;9m{}\033[0m'
+
+
+class TestText(unittest.TestCase):
+    """Test measuring and aligning text with escape sequences."""
+
+    def test_strip(self):
+        plain = 'no escapes'
+        self.assertIs(text.stripANSI(plain), plain)
+        self.assertEqual(text.stripANSI(RED.format('red') + ' and ' +
+                                        '\033[1;4mbold\033[0m'),
+                         'red and bold')
+        self.assertEqual(text.stripANSI('\033]0;title\007x\033[2Ky\033Mz'),
+                         'xyz')
+
+    def test_visible_len(self):
+        self.assertEqual(text.visibleLen(''), 0)
+        self.assertEqual(text.visibleLen('abc'), 3)
+        self.assertEqual(text.visibleLen(RED.format('abc')), 3)
+        self.assertEqual(text.visibleLen(u'日本語'), 6)
+        self.assertEqual(text.visibleLen(RED.format(u'ｶﾀｶﾅ é')), 6)
+
+    def test_justify(self):
+        red = RED.format('ab')
+        self.assertEqual(text.ljust(red, 5), red + '   ')
+        self.assertEqual(text.rjust(red, 5, '.'), '...' + red)
+        self.assertEqual(text.center(red, 5), ' ' + red + '  ')
+        self.assertEqual(text.ljust(u'日本', 5), u'日本 ')
+        self.assertEqual(text.ljust(red, 1), red)
+
+    def test_slice(self):
+        self.assertEqual(text.visibleSlice('abcdef', 1, 3), 'bc')
+        self.assertEqual(text.visibleSlice('a' + RED.format('bcd') + 'e', 2),
+                         '\033[38;5;9mcd\033[0me\033[0m')
+        self.assertEqual(text.visibleSlice(RED.format('abc') + 'def', 0, 2),
+                         '\033[38;5;9mab\033[0m')
+        # wide characters cut by a boundary are left out
+        self.assertEqual(text.visibleSlice(u'日本語', 1, 5), u'本')
+
+    def test_truncate(self):
+        self.assertEqual(text.truncate('short', 5), 'short')
+        self.assertEqual(text.truncate('too long', 5), u'too …')
+        self.assertEqual(text.truncate('too long', 5, ''), 'too l')
+        self.assertEqual(text.truncate(RED.format('too long'), 5, '...'),
+                         '\033[38;5;9mto...\033[0m')
+        self.assertEqual(text.truncate(u'日本語', 5), u'日本…')
+        self.assertEqual(text.truncate('abc', 2, '...'), '..')
+
+
+if __name__ == '__main__':
+    unittest.main()
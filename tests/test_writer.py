@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+#
+
+"""Test the writer module"""
+
+import io
+import os
+import tempfile
+import unittest
+
+from swajime import writer
+from swajime.writer import StyledWriter, VectoredWriter
+
+SwaANSI = writer.SwaANSI
+
+
+class TestStyledWriter(unittest.TestCase):
+    """Test the StyledWriter class."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+
+    def test_transitions(self):
+        out = io.StringIO()
+        with StyledWriter(out) as styled:
+            styled.write('a', 'RED')
+            styled.write('b', 'RED')
+            styled.write('c', ('RED', None, 'BOLD'))
+            styled.write('d', ('GREEN', None, 'BOLD'))
+            styled.write('e', 'GREEN')
+            styled.write('f')
+            styled.write('', 'BLUE')
+        self.assertEqual(out.getvalue(),
+                         '\033[38;5;9mab'
+                         '\033[1mc'
+                         '\033[38;5;2md'
+                         '\033[0;38;5;2me'
+                         '\033[0mf')
+
+        naive = ''.join([SwaANSI.wrap('a', 'RED'), SwaANSI.wrap('b', 'RED'),
+                         SwaANSI.wrap('c', 'RED', None, 'BOLD'),
+                         SwaANSI.wrap('d', 'GREEN', None, 'BOLD'),
+                         SwaANSI.wrap('e', 'GREEN'), 'f'])
+        self.assertEqual(styled.bytesSaved(),
+                         len(naive) - len(out.getvalue()))
+        self.assertGreater(styled.bytesSaved(), 0)
+
+    def test_background_off(self):
+        out = io.StringIO()
+        with StyledWriter(out) as styled:
+            styled.write('a', ('RED', 'BLUE'))
+            styled.write('b', 'RED')
+        self.assertEqual(out.getvalue(),
+                         '\033[38;5;9;48;5;12ma\033[49mb\033[0m')
+
+    def test_buffering(self):
+        out = io.StringIO()
+        styled = StyledWriter(out, buffer_size=1000)
+        styled.write('a', 'RED')
+        self.assertEqual(out.getvalue(), '')
+        styled.write('b' * 1000, 'RED')
+        self.assertEqual(out.getvalue(), '\033[38;5;9ma' + 'b' * 1000)
+        styled.close()
+        self.assertTrue(out.getvalue().endswith('\033[0m'))
+
+    def test_never(self):
+        SwaANSI.setWHEN('NEVER')
+        out = io.StringIO()
+        with StyledWriter(out) as styled:
+            styled.write('a', 'RED')
+            styled.write('b', 'GREEN')
+        self.assertEqual(out.getvalue(), 'ab')
+        self.assertEqual(styled.bytesSaved(), 0)
+        SwaANSI.setWHEN('ALWAYS')
+
+
+class TestVectoredWriter(unittest.TestCase):
+    """Test the VectoredWriter class."""
+
+    def setUp(self):
+        SwaANSI.setWHEN('ALWAYS')
+        SwaANSI.setDefaults()
+        self.file = tempfile.TemporaryFile()
+
+    def tearDown(self):
+        self.file.close()
+
+    def output(self):
+        self.file.seek(0)
+        return self.file.read()
+
+    def test_write(self):
+        data = bytearray(b'b')
+        with VectoredWriter(self.file) as out:
+            out.write(b'a', 'RED')
+            out.write(data, (None, 'GREEN'))
+            out.write(memoryview(b'xcx')[1:2])
+            out.write(b'', 'BLUE')
+            out.write(b'\xff', SwaANSI('RED', None, 'BOLD'))
+        self.assertEqual(self.output(),
+                         b'\033[38;5;9ma\033[0m'
+                         b'\033[48;5;2mb\033[0m'
+                         b'c'
+                         b'\033[38;5;9;1m\xff\033[0m')
+
+    def test_buffering(self):
+        out = VectoredWriter(self.file.fileno(), buffer_size=4)
+        out.write(b'abc')
+        self.assertEqual(self.output(), b'')
+        out.write(b'def')
+        self.assertEqual(self.output(), b'abcdef')
+        out.write(b'g')
+        out.close()
+        self.assertEqual(self.output(), b'abcdefg')
+
+    def test_partial_writes(self):
+        read_end, write_end = os.pipe()
+        try:
+            out = VectoredWriter(write_end)
+            written = []
+
+            def writev(fd, buffers):
+                # one byte at a time, as a full pipe could
+                written.append(bytes(buffers[0][:1]))
+                return 1
+            out._writev = writev
+            out.write(b'ab', 'RED')
+            out.write(b'cd')
+            out.flush()
+        finally:
+            os.close(read_end)
+            os.close(write_end)
+        self.assertEqual(b''.join(written), b'\033[38;5;9mab\033[0mcd')
+
+    def test_never(self):
+        SwaANSI.setWHEN('NEVER')
+        with VectoredWriter(self.file) as out:
+            out.write(b'a', 'RED')
+            out.write(b'b', 'GREEN')
+        self.assertEqual(self.output(), b'ab')
+        SwaANSI.setWHEN('ALWAYS')
+
+    def test_auto(self):
+        SwaANSI.setWHEN('AUTO')
+        with VectoredWriter(self.file.fileno()) as out:
+            out.write(b'a', 'RED')
+        # a regular file is not a terminal
+        self.assertEqual(self.output(), b'a')
+        SwaANSI.setWHEN('ALWAYS')
+
+
+if __name__ == '__main__':
+    unittest.main()